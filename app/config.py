@@ -36,6 +36,23 @@ class Settings(BaseSettings):
     # --- Redis ---
     REDIS_ENABLED: bool = Field(default=True)
     REDIS_URL: Optional[str] = None  # e.g. redis://:password@host:port/0
+    REDIS_POOL_MAX_CONNECTIONS: int = Field(default=32)  # per process, sync and async pools each
+    REDIS_POOL_TIMEOUT_S: float = Field(default=1.0)      # wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT_S: float = Field(default=0.5)
+    REDIS_CONNECT_TIMEOUT_S: float = Field(default=0.5)
+    REDIS_HEALTH_CHECK_INTERVAL_S: int = Field(default=30)  # PING idle connections before reuse
+    REDIS_BREAKER_THRESHOLD: int = Field(default=3)       # consecutive failures before the memory fallback
+    REDIS_BREAKER_COOLDOWN_S: float = Field(default=10.0)  # then one PING probe to reattach
+    # In-memory fallback when Redis is off
+    MEMORY_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+    MEMORY_CACHE_MAX_MB: float = Field(default=64.0)
+    MEMORY_CACHE_SWEEP_S: float = Field(default=30.0)  # expired keys are removed this often; 0 = only on read
+    MEMORY_CACHE_STRIPES: int = Field(default=16)      # independently locked shards
+    # Per-process L1 in front of Redis: key prefix -> L1 TTL (s); {} = off
+    CACHE_L1_PREFIXES: dict[str, float] = Field(default={"usage:summary": 5.0, "summary:": 60.0})
+    CACHE_L1_MAX_ENTRIES: int = Field(default=1024)
+    CACHE_L1_MAX_MB: float = Field(default=8.0)
+    CACHE_L1_CHANNEL: str = Field(default="cache:l1:invalidate")  # pub/sub channel for cross-worker invalidation
 
     # --- JWT / Auth ---
     JWT_SECRET_KEY: Optional[str] = Field(default=None)
@@ -47,6 +64,9 @@ class Settings(BaseSettings):
     # --- AI Integrations ---
     OPENAI_API_KEY: Optional[str] = Field(default=None)
     HF_TOKEN: Optional[str] = Field(default=None)
+    SUMMARY_CACHE_TTL_S: int = Field(default=3600)
+    SUMMARY_LOCK_TTL_S: int = Field(default=60)       # cross-worker single-flight lock; longest expected OpenAI call
+    SUMMARY_LOCK_POLL_S: float = Field(default=0.2)   # how often waiting workers look for the leader's result
 
     # --- Payments ---
     STRIPE_SECRET_KEY: Optional[str] = Field(default=None)
@@ -58,6 +78,10 @@ class Settings(BaseSettings):
     # --- File Storage ---
     UPLOAD_FOLDER: str = Field(default=os.path.join(os.getcwd(), "uploads"))
     STORAGE_DIR: str = Field(default=os.path.join(os.getcwd(), "transcripts"))
+    # Max upload size per plan (MB); unknown or missing plans get "free". 0 = unlimited.
+    upload_limits_mb: dict[str, int] = Field(
+        default={"free": 200, "edu": 1024, "pro": 2048, "premium": 4096}
+    )
 
     # --- Logging / Exports ---
     LOG_DIR: str = Field(default=os.path.join(os.getcwd(), "logs"))
@@ -70,6 +94,56 @@ class Settings(BaseSettings):
     whisper_model_size: str = Field(default="small")
     whisper_device: str = Field(default="cpu")      # cpu | cuda
     whisper_compute: str = Field(default="int8")    # int8 | float16 | float32
+    whisper_model_budget_mb: int = Field(default=0)  # 0 = unlimited; idle models LRU-evicted past this
+    asr_job_workers: int = Field(default=1)          # background threads draining /api/v1/transcribe jobs
+    asr_job_max_queued: int = Field(default=100)     # 429 on /api/v1/transcribe past this backlog; 0 = unbounded
+    asr_executor_workers: int = Field(default=2)     # threads for blocking ASR work from async handlers
+    asr_executor_max_queue: int = Field(default=16)  # 429 + Retry-After once this many calls wait
+    asr_batching_enabled: bool = Field(default=False)  # route decodes through the micro-batch scheduler
+    asr_batch_size: int = Field(default=8)           # flush when this many clips are pending (throughput)
+    asr_batch_max_wait_ms: float = Field(default=50.0)  # ...or when the oldest clip waited this long (latency)
+    asr_long_audio_workers: int = Field(default=0)   # processes for chunked long-audio mode; 0 = off
+    asr_long_audio_threshold_s: float = Field(default=600.0)  # recordings longer than this use it
+    asr_long_audio_chunk_s: float = Field(default=120.0)      # max chunk length, cut at VAD silences
+    asr_stream_mux_enabled: bool = Field(default=True)        # live streams share one batched decoder
+    asr_stream_tick_ms: float = Field(default=200.0)          # decode every queued window once per tick
+    asr_stream_max_batch: int = Field(default=16)
+    asr_stream_latency_slo_ms: float = Field(default=1500.0)  # refuse new streams (1013) past this
+    asr_stream_max_streams: int = Field(default=64)
+    asr_result_cache_enabled: bool = Field(default=True)      # reuse results for byte-identical uploads
+    asr_result_cache_dir: str = Field(default=os.path.join(os.getcwd(), "cache", "asr_results"))
+    asr_result_cache_max_mb: float = Field(default=256.0)     # LRU-evicted past this
+    asr_result_cache_ttl_s: float = Field(default=30 * 24 * 3600.0)
+    asr_diarize_workers: int = Field(default=1)   # threads running diarization alongside ASR
+    asr_diarizer: str = Field(default="auto")     # auto (pyannote if installed, else fast) | pyannote | fast | off
+    asr_diarizer_speakers: int = Field(default=0)  # default speaker-count hint; 0 = estimate
+    asr_preload: bool = Field(default=True)       # load + warm models in the background at startup; /readyz waits
+    asr_preload_models: list[str] = Field(default=[])  # extra model sizes to preload besides the default (opt-in)
+    asr_warmup_audio: str = Field(default="test.mp3")  # bundled sample used for the warm-up decode
+    asr_warmup_seconds: float = Field(default=5.0)
+    asr_warmup_retry_s: float = Field(default=5.0)        # first retry after a failed warm-up, doubling
+    asr_warmup_retry_max_s: float = Field(default=300.0)
+    asr_tuned_profile: str = Field(default=os.path.join(os.getcwd(), "cache", "asr_tuned.json"))  # from calibrate_asr.py
+    asr_default_profile: str = Field(default="balanced")  # fast | balanced | accurate, capped per plan
+    asr_profile_models: dict[str, str] = Field(
+        default={"fast": "base", "balanced": "", "accurate": "medium"}  # "" = whisper_model_size
+    )
+    asr_plan_profiles: dict[str, list[str]] = Field(
+        default={
+            "free": ["fast"],
+            "edu": ["fast", "balanced"],
+            "pro": ["fast", "balanced", "accurate"],
+            "premium": ["fast", "balanced", "accurate"],
+        }
+    )
+    asr_vad_prepass: bool = Field(default=True)         # speech map first: skip silent files, trim, cut at silences
+    asr_vad_backend: str = Field(default="silero")      # silero | webrtc | energy
+    asr_vad_min_speech_s: float = Field(default=0.3)    # less speech than this = silent, no model is loaded
+    asr_vad_cache_dir: str = Field(default=os.path.join(os.getcwd(), "cache", "asr_vad"))  # cached speech maps
+    asr_vad_cache_max_mb: float = Field(default=64.0)   # LRU-evicted past this (~10 KB per hour of audio)
+    asr_pcm_cache_enabled: bool = Field(default=True)   # keep decoded PCM per upload hash; repeat tasks skip ffmpeg
+    asr_pcm_cache_dir: str = Field(default=os.path.join(os.getcwd(), "cache", "asr_pcm"))
+    asr_pcm_cache_max_mb: float = Field(default=2048.0)  # LRU-evicted past this (~230 MB per hour of audio)
 
     # --- Config ---
     model_config = SettingsConfigDict(extra="ignore")
@@ -3,5 +3,6 @@ from .base import Base
 from .subscription import Subscription, SubscriptionStatus
 from .user import User
 from .transcript import Transcript
+from .transcript_segment import TranscriptSegment
 
-__all__ = ["Base", "User", "Subscription", "SubscriptionStatus", "Transcript"]
+__all__ = ["Base", "User", "Subscription", "SubscriptionStatus", "Transcript", "TranscriptSegment"]
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, Text
+from .base import Base
+
+
+class TranscriptSegment(Base):
+    """
+    One timed ASR segment of a transcript (times in milliseconds).
+    Keyed by (transcript_id, seq) so rows stay small and come back in order.
+    """
+
+    __tablename__ = "transcript_segments"
+
+    transcript_id = Column(
+        Integer,
+        ForeignKey("transcripts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    speaker = Column(String(32), nullable=True)
+    avg_logprob = Column(Float, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TranscriptSegment transcript_id={self.transcript_id!r} seq={self.seq!r} "
+            f"start_ms={self.start_ms!r} end_ms={self.end_ms!r}>"
+        )
@@ -7,10 +7,18 @@ Mount this router ONCE with NO prefix in app/main.py:
 
 It exposes BOTH '/api/*' and bare '/*' paths.
 """
+import logging
 from typing import Optional
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, Response, RedirectResponse
 
+from app.services.asr_executor import run_asr
+from app.services.decode_profiles import resolve_profile
+from app.utils.uploads import spool_upload
+
+log = logging.getLogger(__name__)
+
 # No prefix here; we declare full paths in each route
 router = APIRouter(tags=["compat"])
 
@@ -27,79 +35,115 @@ async def bare_signin_alias():
 # ---------- Helpers (shared impls) ----------
 async def _transcribe_impl(file: UploadFile, language: Optional[str] = "en"):
     """
-    Transcription endpoint that integrates with asgi_dev.py if available,
+    Transcription endpoint backed by the shared Whisper model registry,
     otherwise provides informative placeholder response.
     """
-    import sys
-    from pathlib import Path
+    # Spool to a scratch file (size/hash computed on the way, 413 past the limit)
+    upload = await spool_upload(file)
+    temp_path = upload.path
+    file_size_mb = upload.size_mb
     
-    data = await file.read()
-    file_size_mb = len(data) / (1024 * 1024)
-    
-    # Try to use real transcription from asgi_dev if available
+    # Try to use real transcription via the shared model registry
     try:
-        # Save uploaded file temporarily
-        import tempfile
-        import uuid
-        ext = Path(file.filename).suffix.lower() or ".bin"
-        temp_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}{ext}"
+        from app.services.batching import batching_enabled, get_batch_scheduler
+        from app.services.model_registry import get_model_registry
+        from app.services.result_cache import entry_from_segments, entry_text, get_result_cache, profile_key
+        from app.services.pcm_cache import decode_cached
+        from app.services.vad import run_prepass
         
-        with temp_path.open("wb") as f:
-            f.write(data)
+        # Anonymous endpoint: decode with the free plan's default profile
+        profile = resolve_profile(None, None)
+        model_key = profile.model_key()
+        cache = get_result_cache()
+        cache_key = profile_key(upload.sha256, language, profile)
+        # Result-cache reads and writes are disk I/O; keep them off the event loop.
+        entry = await run_in_threadpool(cache.get, cache_key) if cache is not None else None
+        if entry is not None:
+            return JSONResponse({
+                "transcript": entry_text(entry),
+                "summary": None,
+                "sentiment": None,
+                "language": language or entry["language"],
+                "filename": file.filename,
+                "file_size_mb": round(file_size_mb, 2),
+                "segments": entry["segments"],
+                "status": "completed"
+            })
         
-        # Try importing the transcription function from asgi_dev
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-        try:
-            from asgi_dev import _transcribe_file, WHISPER
-            if WHISPER is not None:
-                # Real transcription available - get segments directly from Whisper
-                segments_raw, info = WHISPER.transcribe(
-                    str(temp_path),
-                    beam_size=5,
-                    best_of=1,
-                    vad_filter=True,
+        def _decode():
+            # VAD pre-pass: silent uploads need no model, and the speech clips
+            # let the batched pipeline decode audio longer than one window.
+            prep = run_prepass(temp_path, sha256=upload.sha256)
+            if prep is not None and prep.silent:
+                return entry_from_segments([], language)
+            if batching_enabled():
+                if prep is not None:
+                    audio, clips = prep.samples, prep.clips
+                else:
+                    audio, clips = decode_cached(temp_path, upload.sha256).samples, None
+                # Join the shared micro-batch instead of decoding alone (the scheduler leases the model)
+                result = get_batch_scheduler(model_key).transcribe(
+                    audio,
                     language=language,
-                    temperature=0.0,
-                    condition_on_previous_text=True,
+                    clips=clips,
+                    **profile.options(vad=False),
                 )
-                
-                # Extract segments with timing information
-                segments = []
-                full_text_parts = []
-                for seg in segments_raw:
-                    text = getattr(seg, "text", "").strip()
-                    if text:
-                        segments.append({
-                            "start": getattr(seg, "start", 0.0),
-                            "end": getattr(seg, "end", 0.0),
-                            "text": text
-                        })
-                        full_text_parts.append(text)
-                
-                transcript_text = " ".join(full_text_parts).strip() or "(empty transcript)"
-                
-                # Return with segments for subtitle export
-                # TODO: Add summary and sentiment generation using AI
-                return JSONResponse({
-                    "transcript": transcript_text,
-                    "summary": None,
-                    "sentiment": None,
-                    "language": language or info.language,
-                    "filename": file.filename,
-                    "file_size_mb": round(file_size_mb, 2),
-                    "segments": segments,
-                    "status": "completed"
-                })
-        except Exception as e:
-            # Whisper not available or error occurred
-            print(f"Whisper transcription not available: {e}")
-        finally:
-            # Clean up temp file
-            if temp_path.exists():
-                temp_path.unlink()
-            sys.path.pop(0)
+                entry = entry_from_segments(result.segments, result.language)
+            else:
+                with get_model_registry().lease(model_key) as model:
+                    # Real transcription available - get segments directly from Whisper
+                    if prep is not None:
+                        segments_raw, info = model.transcribe(
+                            prep.samples,
+                            language=language,
+                            clip_timestamps=prep.clip_seconds(),
+                            **profile.options(vad=False),
+                        )
+                    else:
+                        segments_raw, info = model.transcribe(
+                            str(temp_path),
+                            language=language,
+                            **profile.options(),
+                        )
+                    # Extract segments with timing information (decodes the lazy generator)
+                    entry = entry_from_segments(segments_raw, info.language)
+            if prep is not None and prep.start:
+                # Back onto the file's timeline from the trimmed audio
+                for item in entry["segments"]:
+                    item["start"] = round(item["start"] + prep.offset, 3)
+                    item["end"] = round(item["end"] + prep.offset, 3)
+            return entry
+        
+        # Blocking decode runs on the bounded ASR executor (429 when saturated)
+        entry = await run_asr(_decode)
+        segments = entry["segments"]
+        transcript_text = entry_text(entry)
+        if cache is not None:
+            try:
+                await run_in_threadpool(cache.put, cache_key, entry)
+            except OSError as e:
+                log.warning("Could not write result cache entry: %s", e)
+        
+        # Return with segments for subtitle export
+        # TODO: Add summary and sentiment generation using AI
+        return JSONResponse({
+            "transcript": transcript_text,
+            "summary": None,
+            "sentiment": None,
+            "language": language or entry["language"],
+            "filename": file.filename,
+            "file_size_mb": round(file_size_mb, 2),
+            "segments": segments,
+            "status": "completed"
+        })
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in transcription: {e}")
+        # Whisper not available or error occurred
+        print(f"Whisper transcription not available: {e}")
+    finally:
+        # Clean up temp file
+        upload.cleanup()
     
     # Fallback: Return placeholder response with clear messaging
     placeholder_transcript = f"""[PLACEHOLDER TRANSCRIPTION]
@@ -142,129 +186,82 @@ async def _video_task_impl(
     if file is None:
         return JSONResponse({"error": "No file provided"}, status_code=400)
     
-    import sys
-    import tempfile
-    import uuid
-    from pathlib import Path
+    # Stream the video to a scratch file instead of reading it into memory
+    upload = await spool_upload(file, default_ext=".mp4")
+    temp_video_path = upload.path
+    file_size_mb = upload.size_mb
     
-    # Read file data
-    data = await file.read()
-    file_size_mb = len(data) / (1024 * 1024)
+    # For translation: if language is "en" for transcription, translate to English
+    # For subtitles: use the selected language
+    task = "transcribe"
+    source_lang = language if language != "auto" else None
     
-    # Save video temporarily
-    ext = Path(file.filename).suffix.lower() or ".mp4"
-    temp_video_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}{ext}"
-    temp_audio_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}.wav"
+    if task_type == "transcription" and language == "en":
+        task = "translate"
+        source_lang = None
     
-    try:
-        # Save uploaded video
-        with temp_video_path.open("wb") as f:
-            f.write(data)
+    # Anonymous endpoint: decode with the free plan's default profile
+    profile = resolve_profile(None, None)
+    
+    def _process():
+        from app.services.model_registry import get_model_registry
+        from app.services.pcm_cache import decode_cached
+        from app.services.segment_table import SegmentTable
         
-        # Extract audio using ffmpeg
+        # Decode the audio track straight into memory (no intermediate WAV),
+        # or map it from the PCM cache when the same media was processed before
         try:
-            import ffmpeg
-            (
-                ffmpeg
-                .input(str(temp_video_path))
-                .output(str(temp_audio_path), ac=1, ar=16000, format="wav")
-                .overwrite_output()
-                .run(quiet=True, capture_stdout=True, capture_stderr=True)
-            )
+            audio_input = decode_cached(temp_video_path, upload.sha256).samples
         except Exception as e:
             print(f"FFmpeg audio extraction failed: {e}")
             # If ffmpeg fails, try to process video directly
-            temp_audio_path = temp_video_path
+            audio_input = str(temp_video_path)
         
-        # Try importing the transcription function from asgi_dev
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-        try:
-            from asgi_dev import WHISPER
-            if WHISPER is not None:
-                # Real transcription available
-                # For translation: if language is "en" for transcription, translate to English
-                # For subtitles: use the selected language
-                task = "transcribe"
-                source_lang = language if language != "auto" else None
-                
-                if task_type == "transcription" and language == "en":
-                    task = "translate"
-                    source_lang = None
-                
-                segments_raw, info = WHISPER.transcribe(
-                    str(temp_audio_path),
-                    beam_size=5,
-                    best_of=1,
-                    vad_filter=True,
-                    language=source_lang,
-                    task=task,
-                    temperature=0.0,
-                    condition_on_previous_text=True,
-                )
-                
-                # Extract segments with timing information
-                segments = []
-                full_text_parts = []
-                for seg in segments_raw:
-                    text = getattr(seg, "text", "").strip()
-                    if text:
-                        segments.append({
-                            "start": getattr(seg, "start", 0.0),
-                            "end": getattr(seg, "end", 0.0),
-                            "text": text
-                        })
-                        full_text_parts.append(text)
-                
-                transcript_text = " ".join(full_text_parts).strip() or "(empty transcript)"
-                
-                # Return based on task type
-                if task_type == "subtitles":
-                    # Generate SRT format subtitles
-                    srt_lines = []
-                    for i, seg in enumerate(segments, 1):
-                        start_time = _format_timestamp(seg["start"])
-                        end_time = _format_timestamp(seg["end"])
-                        srt_lines.append(f"{i}\n{start_time} --> {end_time}\n{seg['text']}\n")
-                    
-                    subtitles = "\n".join(srt_lines)
-                    return JSONResponse({
-                        "subtitles": subtitles,
-                        "language": language or info.language,
-                        "format": "srt",
-                        "filename": file.filename,
-                        "status": "completed"
-                    })
-                else:
-                    # Return transcription
-                    return JSONResponse({
-                        "transcript": transcript_text,
-                        "summary": None,
-                        "sentiment": None,
-                        "language": language or info.language,
-                        "filename": file.filename,
-                        "file_size_mb": round(file_size_mb, 2),
-                        "segments": segments,
-                        "status": "completed"
-                    })
-        except Exception as e:
-            print(f"Whisper transcription not available: {e}")
-        finally:
-            sys.path.pop(0)
+        with get_model_registry().lease(profile.model_key()) as model:
+            segments_raw, info = model.transcribe(
+                audio_input,
+                language=source_lang,
+                task=task,
+                **profile.options(),
+            )
+            # Pack segments into flat arrays as the generator decodes them
+            return SegmentTable.from_segments(segments_raw), info.language
     
+    try:
+        # ffmpeg + Whisper run on the bounded ASR executor (429 when saturated)
+        table, detected_language = await run_asr(_process)
+        
+        transcript_text = table.full_text() or "(empty transcript)"
+        
+        # Return based on task type
+        if task_type == "subtitles":
+            subtitles = table.to_srt()
+            return JSONResponse({
+                "subtitles": subtitles,
+                "language": language or detected_language,
+                "format": "srt",
+                "filename": file.filename,
+                "status": "completed"
+            })
+        else:
+            # Return transcription
+            return JSONResponse({
+                "transcript": transcript_text,
+                "summary": None,
+                "sentiment": None,
+                "language": language or detected_language,
+                "filename": file.filename,
+                "file_size_mb": round(file_size_mb, 2),
+                "segments": table.to_dicts(),
+                "status": "completed"
+            })
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error processing video: {e}")
+        print(f"Whisper transcription not available: {e}")
     finally:
         # Clean up temp files
-        try:
-            if temp_video_path.exists():
-                temp_video_path.unlink()
-        except:
-            pass
-        try:
-            if temp_audio_path.exists() and temp_audio_path != temp_video_path:
-                temp_audio_path.unlink()
-        except:
-            pass
+        upload.cleanup()
     
     # Fallback: Return placeholder response
     placeholder_transcript = f"""[PLACEHOLDER TRANSCRIPTION]
@@ -309,16 +306,9 @@ For now, this shows how the video transcription flow works end-to-end."""
             "status": "completed"
         })
 
-def _format_timestamp(seconds: float) -> str:
-    """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
 async def _subtitles_impl(file: UploadFile):
-    _ = await file.read()
+    with await spool_upload(file):
+        pass
     vtt = "WEBVTT\n\n00:00.000 --> 00:01.500\n(Stub) EchoScript subtitles ready\n"
     return Response(content=vtt, media_type="text/vtt")
 
@@ -383,7 +373,7 @@ async def _submit_transcript_impl(payload: dict):
     """
     import json
     import uuid
-    from app.utils.redis_client import cache
+    from app.utils.redis_client import async_cache
     
     key = f"transcript:{uuid.uuid4().hex}"
     
@@ -411,7 +401,7 @@ async def _submit_transcript_impl(payload: dict):
             "submitted_at": datetime.utcnow().isoformat()
         }
         
-        cache.set(key, json.dumps(item), ex=3600)
+        await async_cache.set(key, json.dumps(item), ex=3600)
         return JSONResponse({"ok": True, "id": key, "message": "Transcript submitted successfully"})
     except Exception as e:
         return JSONResponse(
@@ -47,4 +47,5 @@ def healthz():
         "status": status,
         "time": datetime.utcnow().isoformat() + "Z",
         "checks": checks,
+        "cache": redis_client.stats(),
     }
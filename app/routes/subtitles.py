@@ -6,6 +6,8 @@ import uuid
 from fastapi import APIRouter, File, UploadFile
 from fastapi.responses import FileResponse
 
+from app.utils.uploads import spool_upload
+
 router = APIRouter(prefix="/api/v1", tags=["subtitles"])
 
 
@@ -28,9 +30,8 @@ def to_webvtt(segments):
 @router.post("/subtitles")
 async def make_subtitles(file: UploadFile = File(...)):
     tmpdir = pathlib.Path(tempfile.mkdtemp())
-    inpath = tmpdir / f"in_{uuid.uuid4().hex}_{file.filename}"
-    with inpath.open("wb") as f:
-        f.write(await file.read())
+    inpath = tmpdir / f"in_{uuid.uuid4().hex}{pathlib.Path(file.filename or '').suffix}"
+    await spool_upload(file, dest=inpath)
 
     # TODO: replace with real transcription that returns segments with timestamps
     segments = [
@@ -3,12 +3,19 @@ import sys
 from pathlib import Path
 from uuid import uuid4
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, UploadFile, File, Query, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_current_user, get_db
 from app.models import User, Transcript
 from app.config import config
+from app.services.asr_executor import run_asr
+from app.services.decode_profiles import resolve_profile
+from app.services.result_cache import entry_text
+from app.services.segment_store import store_segments
+from app.utils.uploads import plan_for_user_id, spool_upload
 
 router = APIRouter(prefix="/transcribe", tags=["transcribe"])
 
@@ -17,6 +24,7 @@ router = APIRouter(prefix="/transcribe", tags=["transcribe"])
 async def transcribe(
     file: UploadFile = File(...),
     language: str = Query("en"),
+    profile: Optional[str] = Query(None, description="fast|balanced|accurate (capped by plan)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -27,7 +35,7 @@ async def transcribe(
     try:
         # Import transcription logic from asgi_dev
         sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-        from asgi_dev import _transcribe_file, STORAGE_DIR
+        from asgi_dev import _transcribe_entry, STORAGE_DIR
         
         # Generate unique ID for this file
         job_id = str(uuid4())
@@ -36,17 +44,17 @@ async def transcribe(
         file_path = STORAGE_DIR / storage_filename
         
         # Save the uploaded file
-        file_size = 0
-        with file_path.open("wb") as out:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                out.write(chunk)
-                file_size += len(chunk)
+        # Database work is blocking too; keep it off the event loop.
+        plan = await run_in_threadpool(plan_for_user_id, db, current_user.id)
+        decode_profile = resolve_profile(profile, plan)
+        upload = await spool_upload(file, plan=plan, dest=file_path)
+        file_size = upload.size
         
-        # Perform transcription
-        transcript_text = _transcribe_file(file_path, language=language)
+        # Perform transcription (repeat uploads are served from the result cache)
+        entry = await run_asr(
+            _transcribe_entry, file_path, language=language, sha256=upload.sha256, profile=decode_profile
+        )
+        transcript_text = entry_text(entry)
         
         # Create transcript record in database
         db_transcript = Transcript(
@@ -61,9 +69,15 @@ async def transcribe(
             status="completed"
         )
         
-        db.add(db_transcript)
-        db.commit()
-        db.refresh(db_transcript)
+        def save() -> None:
+            db.add(db_transcript)
+            db.commit()
+            db.refresh(db_transcript)
+            # Keep the timed segments so subtitles/exports never need to re-run ASR;
+            # committed separately so a segment failure never loses the transcript.
+            store_segments(db, db_transcript.id, entry["segments"])
+
+        await run_in_threadpool(save)
         
         # Return the transcript data
         return {
@@ -76,6 +90,8 @@ async def transcribe(
             "message": "Transcript saved to your account"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
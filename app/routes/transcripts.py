@@ -6,6 +6,7 @@ import os
 
 from app.dependencies import get_current_user, get_db
 from app.models import Transcript, User
+from app.services.segment_store import delete_segments, load_segments
 from app.utils.file_helpers import list_transcripts, load_transcript_file, save_transcript_file
 from app.config import config
 
@@ -115,6 +116,40 @@ async def get_transcript(
     )
 
 
+class SegmentResponse(BaseModel):
+    start: float
+    end: float
+    text: str
+    speaker: Optional[str] = None
+    avg_logprob: Optional[float] = None
+
+
+@router.get(
+    "/{transcript_id}/segments",
+    response_model=list[SegmentResponse],
+    summary="Get the timed segments of a transcript",
+)
+async def get_transcript_segments(
+    transcript_id: int,
+    from_ms: Optional[int] = None,
+    to_ms: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> list[SegmentResponse]:
+    """
+    Stored ASR segments, optionally only those overlapping [from_ms, to_ms).
+    """
+    owned = db.query(Transcript.id).filter(
+        Transcript.id == transcript_id,
+        Transcript.user_id == current_user.id
+    ).first()
+    
+    if not owned:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    
+    return [SegmentResponse(**seg) for seg in load_segments(db, transcript_id, from_ms, to_ms)]
+
+
 @router.post(
     "/",
     response_model=TranscriptResponse,
@@ -243,6 +278,8 @@ async def delete_transcript(
     except Exception as e:
         print(f"Failed to delete file: {e}")
     
+    # SQLite only honours ON DELETE CASCADE with foreign_keys enabled
+    delete_segments(db, transcript.id)
     db.delete(transcript)
     db.commit()
     
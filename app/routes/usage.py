@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Any, Dict, Optional
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
@@ -11,7 +15,7 @@ from pydantic import BaseModel
 from app.config import get_settings, Settings
 import json
 import uuid
-from app.utils.redis_client import cache  # safe, lazy, memory-fallback cache facade
+from app.utils.redis_client import async_cache as cache  # lazy, memory-fallback, non-blocking cache facade
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/usage")
@@ -63,13 +67,13 @@ async def usage_summary(
     Replace the placeholder 'computed' block with real DB aggregation if available.
     """
     try:
-        raw_summary = cache.get("usage:summary")
+        raw_summary = await cache.get("usage:summary")
         if raw_summary:
             summary = json.loads(raw_summary)
             return UsageSummaryOut(cached=True, summary=summary)
         # Placeholder compute (replace with your real logic)
         computed = {"users": 0, "minutes": 0, "items": 0}
-        cache.set("usage:summary", computed, ex=300)  # cache for 5 minutes
+        await cache.set("usage:summary", computed, ex=300)  # cache for 5 minutes
         return UsageSummaryOut(cached=False, summary=computed)
     except Exception:
         log.exception("Could not compute usage summary")
@@ -116,7 +120,7 @@ async def submit_transcript(
     try:
         user = payload.user_id or "anon"
         item = {"user_id": user, "transcript": payload.transcript, "meta": payload.meta or {}}
-        cache.set(key, json.dumps(item), ex=3600)  # 1h TTL
+        await cache.set(key, json.dumps(item), ex=3600)  # 1h TTL
         return SubmitTranscriptOut(ok=True, id=key)
     except Exception:
         log.exception("Could not submit transcript")
@@ -127,8 +131,58 @@ async def submit_transcript(
     raise HTTPException(status_code=400, detail="Invalid payload: transcript required")
 
 
+_SUMMARY_MODEL = "gpt-3.5-turbo"
+
+_TONES = {
+    "default": "smart and concise",
+    "friendly": "friendly and conversational",
+    "formal": "formal and professional",
+    "bullet": "bullet points format",
+    "action": "action-oriented with clear next steps",
+}
+
+_LENGTHS = {
+    "short": "2-3 sentences",
+    "medium": "1-2 paragraphs",
+    "long": "3-4 paragraphs with detailed analysis",
+}
+
+
+def _normalise_transcript(text: str) -> str:
+    """
+    For the cache key only: Unicode form, line breaks and repeated whitespace
+    do not change the key. OpenAI still gets the transcript as submitted.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _summary_options(tone: str, length: str) -> tuple[str, str]:
+    """Case-insensitive; unknown values get the default prompt, as before."""
+    tone = (tone or "").strip().lower()
+    length = (length or "").strip().lower()
+    return (tone if tone in _TONES else "default", length if length in _LENGTHS else "short")
+
+
+def _summary_key(transcript: str, tone: str, length: str) -> str:
+    """
+    Cache key for a summary. BLAKE2 over the normalised request, so every
+    worker computes the same key (the built-in ``hash`` of a str is salted
+    per process). The model is part of the key; bump ``person`` when the
+    prompt changes so stale summaries stop matching.
+    """
+    h = hashlib.blake2b(digest_size=16, person=b"summary-v1")
+    for part in (_SUMMARY_MODEL, tone, length, transcript):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return f"summary:{h.hexdigest()}"
+
+
+def _as_text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
 def _generate_summary_with_openai(transcript: str, tone: str, length: str) -> str:
-    """Generate summary using OpenAI API."""
+    """Generate summary using OpenAI API (blocking; call it off the event loop)."""
     try:
         from openai import OpenAI
         
@@ -138,23 +192,8 @@ def _generate_summary_with_openai(transcript: str, tone: str, length: str) -> st
         
         client = OpenAI(api_key=api_key)
         
-        # Build the prompt based on tone and length
-        tone_map = {
-            "default": "smart and concise",
-            "friendly": "friendly and conversational",
-            "formal": "formal and professional",
-            "bullet": "bullet points format",
-            "action": "action-oriented with clear next steps"
-        }
-        
-        length_map = {
-            "short": "2-3 sentences",
-            "medium": "1-2 paragraphs",
-            "long": "3-4 paragraphs with detailed analysis"
-        }
-        
-        tone_desc = tone_map.get(tone, "smart and concise")
-        length_desc = length_map.get(length, "2-3 sentences")
+        tone_desc = _TONES.get(tone, _TONES["default"])
+        length_desc = _LENGTHS.get(length, _LENGTHS["short"])
         
         prompt = f"""You are a professional summarization assistant. Summarize the following transcript in a {tone_desc} tone. 
 The summary should be approximately {length_desc} long.
@@ -165,7 +204,7 @@ Transcript:
 Summary:"""
         
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=_SUMMARY_MODEL,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that creates clear, structured summaries."},
                 {"role": "user", "content": prompt}
@@ -180,6 +219,59 @@ Summary:"""
         raise
 
 
+# cache key -> task generating that summary in this worker
+_inflight: Dict[str, "asyncio.Task[tuple[str, bool]]"] = {}
+
+
+async def _single_flight(key: str, produce: Callable[[], Awaitable[tuple[str, bool]]]) -> tuple[str, bool]:
+    """
+    Concurrent callers with the same key in this worker await one ``produce()``.
+    It runs as its own task, so a caller that disconnects does not cancel it
+    for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(produce())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _summarise_once(
+    cache_key: str, transcript: str, tone: str, length: str, settings: Settings
+) -> tuple[str, bool]:
+    """
+    Generate and cache one summary across all workers. The first worker to
+    SET NX ``lock:<cache_key>`` calls OpenAI; the others poll the cache for
+    its result. If the holder dies its lock expires (SUMMARY_LOCK_TTL_S) and
+    a waiter takes over. Returns (summary, served_from_cache).
+    """
+    lock_key = f"lock:{cache_key}"
+    token: Optional[str] = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.SUMMARY_LOCK_TTL_S
+    while not await cache.set(lock_key, token, ex=settings.SUMMARY_LOCK_TTL_S, nx=True):
+        await asyncio.sleep(settings.SUMMARY_LOCK_POLL_S)
+        cached = await cache.get(cache_key)
+        if cached:
+            return _as_text(cached), True
+        if time.monotonic() >= deadline:
+            log.warning("Summary lock %s still held after %ss; generating anyway", lock_key, settings.SUMMARY_LOCK_TTL_S)
+            token = None
+            break
+    try:
+        cached = await cache.get(cache_key)  # the previous holder may have just finished
+        if cached:
+            return _as_text(cached), True
+        log.info(f"Generating new summary with tone={tone}, length={length}")
+        summary_text = await asyncio.to_thread(_generate_summary_with_openai, transcript, tone, length)
+        await cache.set(cache_key, summary_text, ex=settings.SUMMARY_CACHE_TTL_S)
+        return summary_text, False
+    finally:
+        if token is not None:
+            # Atomic: if our lock expired mid-call and another worker took it, leave theirs alone.
+            await cache.delete_if_equals(lock_key, token)
+
+
 @router.post("/summary", response_model=GenerateSummaryOut)
 async def generate_summary(
     payload: GenerateSummaryIn,
@@ -188,7 +280,8 @@ async def generate_summary(
     """
     Generate an AI-powered summary of a transcript.
     Uses OpenAI GPT to create summaries based on tone and length preferences.
-    Results are cached for 1 hour.
+    Results are cached (SUMMARY_CACHE_TTL_S); identical requests arriving
+    together share one OpenAI call.
     """
     if not payload.transcript or not payload.transcript.strip():
         raise HTTPException(
@@ -196,29 +289,21 @@ async def generate_summary(
             detail="Transcript cannot be empty"
         )
     
-    # Create cache key based on transcript, tone, and length
-    cache_key = f"summary:{hash(f'{payload.transcript}:{payload.tone}:{payload.length}')}"
+    tone, length = _summary_options(payload.tone, payload.length)
+    cache_key = _summary_key(_normalise_transcript(payload.transcript), tone, length)
+    transcript = payload.transcript  # sent as-is: line breaks and speaker layout help the model
     
     try:
         # Check cache first
-        cached_summary = cache.get(cache_key)
+        cached_summary = await cache.get(cache_key)
         if cached_summary:
-            summary_text = cached_summary.decode("utf-8") if isinstance(cached_summary, bytes) else str(cached_summary)
             log.info(f"Returning cached summary for key: {cache_key}")
-            return GenerateSummaryOut(summary=summary_text, cached=True)
+            return GenerateSummaryOut(summary=_as_text(cached_summary), cached=True)
         
-        # Generate new summary
-        log.info(f"Generating new summary with tone={payload.tone}, length={payload.length}")
-        summary_text = _generate_summary_with_openai(
-            payload.transcript,
-            payload.tone,
-            payload.length
+        summary_text, cached = await _single_flight(
+            cache_key, lambda: _summarise_once(cache_key, transcript, tone, length, settings)
         )
-        
-        # Cache the result for 1 hour
-        cache.set(cache_key, summary_text, ex=3600)
-        
-        return GenerateSummaryOut(summary=summary_text, cached=False)
+        return GenerateSummaryOut(summary=summary_text, cached=cached)
         
     except Exception as e:
         log.exception("Failed to generate summary")
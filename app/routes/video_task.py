@@ -1,21 +1,31 @@
 import os
-import tempfile
 from typing import Optional, Union
 
-import ffmpeg
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 
 from app.config import config
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_db
 from app.schemas.subtitle import SubtitleOut
 from app.schemas.transcription import TranscriptionOut
+from app.services.asr_executor import run_asr
+from app.services.audio import AudioDecodeError
+from app.services.decode_profiles import resolve_profile
+from app.services.pcm_cache import decode_cached
+from app.services.segment_table import SegmentTable
 from app.services.transcription import FasterWhisperTranscriber
 from app.utils.logger import logger
+from app.utils.uploads import plan_for_user_id, spool_upload
 
 # change prefix to match frontend: /api/video-task
 router = APIRouter(prefix="/video-task", tags=["Video Tasks"])
 
-_TRANSCRIBER = FasterWhisperTranscriber(model_name=os.getenv("ASR_MODEL", "base"))
+# Default to the same size asgi_dev uses so both paths share one registry entry.
+_TRANSCRIBER = FasterWhisperTranscriber(
+    model_name=os.getenv("ASR_MODEL") or os.getenv("WHISPER_MODEL_SIZE") or config.whisper_model_size
+)
+
 
 @router.post("/", response_model=Union[TranscriptionOut, SubtitleOut])
 @router.post("/process", response_model=Union[TranscriptionOut, SubtitleOut])
@@ -24,33 +34,44 @@ async def process_video(
     task_type: str = Form("transcription", description="transcription|subtitles"),
     language: Optional[str] = Form("en"),
     translate_output: bool = Form(False),
+    speakers: bool = Form(False, description="label subtitle cues with diarized speakers"),
+    profile: Optional[str] = Form(None, description="fast|balanced|accurate (capped by plan)"),
     current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     if task_type not in {"transcription", "subtitles"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid task_type")
 
-    suffix = os.path.splitext(file.filename or "upload.bin")[-1]
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    plan = await run_in_threadpool(plan_for_user_id, db, current_user.id)
+    decode_profile = resolve_profile(profile, plan)
+    upload = await spool_upload(file, plan=plan)
 
     try:
-        wav_path = tmp_path + ".wav"
-        (
-            ffmpeg.input(tmp_path)
-            .output(wav_path, ac=1, ar=config.WHISPER_SAMPLE_RATE or 16000, format="wav")
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        # Decode once into memory (or map it from the PCM cache for media seen before);
+        # Whisper takes the PCM buffer directly.
+        try:
+            audio = await run_asr(decode_cached, upload.path, upload.sha256)
+        except AudioDecodeError as e:
+            logger.warning(f"Could not decode upload {file.filename!r}: {e}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Could not decode audio")
 
+        source_lang = None if language in (None, "", "auto") else language
+        if speakers:
+            # Diarization runs alongside Whisper on the same decoded buffer
+            lang, segments = await run_asr(
+                _TRANSCRIBER.transcribe_with_speakers, audio, language=source_lang, profile=decode_profile
+            )
+            table = SegmentTable.from_segments(segments)
+        else:
+            lang, table = await run_asr(
+                _TRANSCRIBER.transcribe_table, audio, language=source_lang, profile=decode_profile
+            )
         if task_type == "transcription":
-            text = _TRANSCRIBER.transcribe_file(wav_path, language=language or "en")
             return TranscriptionOut(
-                transcript=text, summary=None, sentiment=None, keywords=None, subtitles=None
+                transcript=table.full_text(), summary=None, sentiment=None, keywords=None, subtitles=None
             )
         else:
-            srt = _TRANSCRIBER.transcribe_to_srt(wav_path, language=language or "en")
-            return SubtitleOut(subtitles=srt, language=language or "en", format="srt")
+            return SubtitleOut(subtitles=table.to_srt(speakers=speakers), language=language or lang, format="srt")
 
     except HTTPException:
         raise
@@ -58,7 +79,4 @@ async def process_video(
         logger.error(f"Video processing error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Processing failed")
     finally:
-        try: os.remove(tmp_path)
-        except Exception: pass
-        try: os.remove(wav_path)
-        except Exception: pass
+        upload.cleanup()
@@ -0,0 +1,123 @@
+# app/services/asr_executor.py
+"""
+Dedicated executor for blocking transcription work.
+
+Async route handlers must not run Whisper, ffmpeg or other CPU-bound calls on
+the event loop; doing so stalls health checks and every other request on the
+worker. They ``await run_asr(fn, ...)`` instead, which runs ``fn`` on a
+fixed-size thread pool kept separate from Starlette's default threadpool, so
+a burst of uploads cannot starve ordinary sync endpoints either.
+
+When ASR_EXECUTOR_MAX_QUEUE calls are already waiting, new ones are refused
+with 429 and a ``Retry-After`` estimated from the queue depth and the recent
+mean run time. ``stats()`` exposes queue depth and wait/run time gauges.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+from app.services.job_queue import QueueFullError, retry_after_s
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ALPHA = 0.2
+
+
+class AsrExecutor:
+    def __init__(self, workers: int = 1, max_queue: int = 16, name: str = "asr-exec") -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max_queue  # 0 = unbounded
+        self.name = name
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.rejected = 0
+        self.wait_ewma = 0.0
+        self.run_ewma = 0.0
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(
+                    self.name, retry_after_s(self._queued, self.workers, self.run_ewma)
+                )
+            self._queued += 1
+        return self._pool.submit(self._timed, time.monotonic(), fn, args, kwargs)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _timed(self, enqueued: float, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self.wait_ewma += _ALPHA * ((started - enqueued) - self.wait_ewma)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.run_ewma += _ALPHA * ((time.monotonic() - started) - self.run_ewma)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "wait_ms": round(self.wait_ewma * 1000.0, 1),
+                "run_ms": round(self.run_ewma * 1000.0, 1),
+            }
+
+
+def busy_response(e: QueueFullError) -> HTTPException:
+    """429 for a full ASR queue, with a Retry-After hint."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="asr_busy",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+_executor: AsrExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_asr_executor() -> AsrExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor = AsrExecutor(
+                workers=settings.asr_executor_workers,
+                max_queue=settings.asr_executor_max_queue,
+            )
+        return _executor
+
+
+async def run_asr(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking ASR work off the event loop; 429 when the executor is saturated."""
+    try:
+        return await get_asr_executor().run(functools.partial(fn, *args, **kwargs))
+    except QueueFullError as e:
+        raise busy_response(e) from None
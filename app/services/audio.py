@@ -0,0 +1,81 @@
+# app/services/audio.py
+"""
+Audio ingestion: decode an upload once into 16 kHz mono float32 PCM.
+
+ffmpeg writes raw ``f32le`` samples to a pipe and they land directly in a
+NumPy buffer, so there is no intermediate WAV on disk for Whisper to decode a
+second time. The resulting :class:`DecodedAudio` is what the ASR, diarization
+and waveform stages take as input, so a file is decoded exactly once per
+request.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+class AudioDecodeError(RuntimeError):
+    """ffmpeg could not decode the input (missing binary, corrupt or no audio stream)."""
+
+
+@dataclass(frozen=True)
+class DecodedAudio:
+    # Read-only view over ffmpeg's output; copy before modifying in place.
+    samples: np.ndarray
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self.samples.shape[0] / self.sample_rate
+
+    def pyannote_input(self) -> dict[str, Any]:
+        """In-memory input for a pyannote pipeline (skips its own file decode)."""
+        import torch
+
+        return {
+            "waveform": torch.from_numpy(np.array(self.samples, copy=True)).unsqueeze(0),
+            "sample_rate": self.sample_rate,
+        }
+
+    def peaks(self, buckets: int = 1000) -> np.ndarray:
+        """Max absolute amplitude per bucket, for drawing a waveform."""
+        n = self.samples.shape[0]
+        if n == 0 or buckets <= 0:
+            return np.zeros(0, dtype=np.float32)
+        buckets = min(buckets, n)
+        edges = np.linspace(0, n, buckets + 1, dtype=np.int64)
+        return np.maximum.reduceat(np.abs(self.samples), edges[:-1]).astype(np.float32)
+
+
+def decode_audio(
+    path: str | os.PathLike[str], sample_rate: int = SAMPLE_RATE, max_seconds: float | None = None
+) -> DecodedAudio:
+    """
+    Decode any ffmpeg-readable file (audio or video) to mono float32 at
+    ``sample_rate``; only the first ``max_seconds`` when given.
+    """
+    import ffmpeg
+
+    input_args = {"t": max_seconds} if max_seconds else {}
+    try:
+        out, _err = (
+            ffmpeg.input(os.fspath(path), **input_args)
+            .output("pipe:", format="f32le", acodec="pcm_f32le", ac=1, ar=sample_rate)
+            .global_args("-nostdin", "-hide_banner", "-loglevel", "error")
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        detail = (e.stderr or b"").decode("utf-8", "replace").strip()
+        raise AudioDecodeError(detail or "ffmpeg failed") from e
+    except FileNotFoundError as e:  # ffmpeg binary not on PATH
+        raise AudioDecodeError("ffmpeg not found") from e
+    return DecodedAudio(np.frombuffer(out, dtype=np.float32), sample_rate)
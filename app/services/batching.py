@@ -0,0 +1,320 @@
+# app/services/batching.py
+"""
+Micro-batching scheduler in front of the shared Whisper model.
+
+Short clips (<= one 30 s Whisper window) submitted by concurrent requests are
+queued and decoded together in a single batched forward pass through
+faster-whisper's BatchedInferencePipeline. A batch is flushed as soon as it
+holds ``max_batch_size`` clips or the oldest clip has waited ``max_wait_ms``.
+
+Longer recordings are split on VAD boundaries by the same pipeline and their
+chunks are decoded ``max_batch_size`` at a time. Callers that already ran the
+VAD pre-pass (app/services/vad.py) pass its chunks as ``clips`` so the
+pipeline does not run Silero a second time.
+
+Knobs (app/config.Settings): ASR_BATCHING_ENABLED, ASR_BATCH_SIZE,
+ASR_BATCH_MAX_WAIT_MS.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import logging
+import threading
+import time
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.model_registry import ModelKey, ModelRegistry, get_model_registry
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+
+    _HAS_BATCHED = True
+except Exception:  # faster-whisper < 1.1
+    BatchedInferencePipeline = None  # type: ignore
+    _HAS_BATCHED = False
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30
+_WINDOW_SAMPLES = SAMPLE_RATE * WINDOW_SECONDS
+
+
+class BatchResult(NamedTuple):
+    segments: list[Any]
+    language: str | None
+    duration: float
+
+
+@dataclasses.dataclass
+class _Pending:
+    audio: np.ndarray
+    language: str | None
+    task: str
+    options: dict[str, Any]
+    future: concurrent.futures.Future
+    enqueued: float
+
+
+def _freeze(options: dict[str, Any]) -> Hashable:
+    return tuple(
+        sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in options.items())
+    )
+
+
+def _shift(seg: Any, offset: float) -> Any:
+    """Move a faster-whisper Segment (and its words) back by ``offset`` seconds."""
+    if not offset:
+        return seg
+    changes: dict[str, Any] = {
+        "start": round(seg.start - offset, 3),
+        "end": round(seg.end - offset, 3),
+    }
+    words = getattr(seg, "words", None)
+    if words:
+        changes["words"] = [
+            dataclasses.replace(w, start=round(w.start - offset, 3), end=round(w.end - offset, 3))
+            if dataclasses.is_dataclass(w)
+            else w._replace(start=round(w.start - offset, 3), end=round(w.end - offset, 3))
+            for w in words
+        ]
+    if dataclasses.is_dataclass(seg):
+        return dataclasses.replace(seg, **changes)
+    return seg._replace(**changes)
+
+
+class BatchScheduler:
+    """Collects pending decode requests for one model and runs them in batches."""
+
+    def __init__(
+        self,
+        key: ModelKey,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 50.0,
+        registry: ModelRegistry | None = None,
+    ) -> None:
+        self.key = key
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._registry = registry or get_model_registry()
+        self._pending: list[_Pending] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self.batches = 0
+        self.clips = 0
+
+    # ---- public API ----
+    def submit(
+        self,
+        audio: np.ndarray,
+        language: str | None = None,
+        task: str = "transcribe",
+        **options: Any,
+    ) -> concurrent.futures.Future:
+        """Queue one clip (16 kHz mono float32, <= 30 s); resolves to a BatchResult."""
+        if audio.shape[0] > _WINDOW_SAMPLES:
+            raise ValueError("submit() takes clips of at most 30 s; use transcribe()")
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            self._ensure_thread()
+            self._pending.append(
+                _Pending(audio, language, task, options, fut, time.monotonic())
+            )
+            self._cond.notify()
+        return fut
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: str | None = None,
+        task: str = "transcribe",
+        clips: list[tuple[int, int]] | None = None,
+        **options: Any,
+    ) -> BatchResult:
+        """
+        Blocking helper: short clips join the shared batch, long ones batch their
+        own chunks. ``clips`` are (start, end) sample ranges of at most 30 s to
+        decode instead of running VAD over the whole recording.
+        """
+        if audio.shape[0] <= _WINDOW_SAMPLES:
+            return self.submit(audio, language, task, **options).result()
+        return self._transcribe_long(audio, language, task, options, clips)
+
+    def decode_many(
+        self,
+        audios: list[np.ndarray],
+        languages: list[str | None],
+        task: str = "transcribe",
+        **options: Any,
+    ) -> list[BatchResult]:
+        """Decode clips together right away, for callers that do their own scheduling."""
+        now = time.monotonic()
+        batch = [
+            _Pending(audio, language, task, options, concurrent.futures.Future(), now)
+            for audio, language in zip(audios, languages)
+        ]
+        self._decode(batch)
+        return [p.future.result() for p in batch]
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            queued = len(self._pending)
+        return {
+            "queued": queued,
+            "batches": self.batches,
+            "clips": self.clips,
+            "avg_batch": round(self.clips / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    # ---- scheduler loop ----
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f"asr-batch-{self.key.model_size}", daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self) -> list[_Pending]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._pending[0].enqueued + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._decode(batch)
+            except Exception as e:
+                log.exception("Batched decode failed")
+                for p in batch:
+                    if not p.future.done():
+                        p.future.set_exception(e)
+
+    def _decode(self, batch: list[_Pending]) -> None:
+        with self._registry.lease(self.key) as model:
+            # Requests without a language are grouped by what Whisper detects.
+            multilingual = getattr(getattr(model, "model", None), "is_multilingual", True)
+            for p in batch:
+                if p.language is None and p.audio.size:
+                    p.language = model.detect_language(audio=p.audio)[0] if multilingual else "en"
+            groups: dict[Hashable, list[_Pending]] = {}
+            for p in batch:
+                groups.setdefault((p.language, p.task, _freeze(p.options)), []).append(p)
+            for items in groups.values():
+                self._decode_group(model, items)
+        self.batches += 1
+        self.clips += len(batch)
+
+    def _decode_group(self, model: Any, items: list[_Pending]) -> None:
+        first = items[0]
+        live = [p for p in items if p.audio.size]
+        for p in items:
+            if not p.audio.size:
+                p.future.set_result(BatchResult([], p.language, 0.0))
+        if not live:
+            return
+
+        if not _HAS_BATCHED:
+            for p in live:
+                segs, info = model.transcribe(
+                    p.audio, language=p.language, task=p.task, **p.options
+                )
+                p.future.set_result(BatchResult(list(segs), info.language, info.duration))
+            return
+
+        # Lay the clips out one Whisper window apart so each becomes exactly one
+        # chunk of the batch and its segments can be mapped back by offset.
+        joined = np.zeros(len(live) * _WINDOW_SAMPLES, dtype=np.float32)
+        clips = []
+        for i, p in enumerate(live):
+            start = i * _WINDOW_SAMPLES
+            joined[start : start + p.audio.shape[0]] = p.audio
+            clips.append({"start": start, "end": start + p.audio.shape[0]})
+
+        pipeline = BatchedInferencePipeline(model)
+        segments, _info = pipeline.transcribe(
+            joined,
+            language=first.language,
+            task=first.task,
+            clip_timestamps=clips,
+            batch_size=len(live),
+            **first.options,
+        )
+        per_clip: list[list[Any]] = [[] for _ in live]
+        for seg in segments:
+            idx = min(int(seg.start // WINDOW_SECONDS), len(live) - 1)
+            per_clip[idx].append(_shift(seg, idx * WINDOW_SECONDS))
+        for p, segs in zip(live, per_clip):
+            p.future.set_result(
+                BatchResult(segs, p.language, p.audio.shape[0] / SAMPLE_RATE)
+            )
+
+    def _transcribe_long(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        task: str,
+        options: dict[str, Any],
+        clips: list[tuple[int, int]] | None = None,
+    ) -> BatchResult:
+        with self._registry.lease(self.key) as model:
+            if _HAS_BATCHED:
+                if not clips and not options.get("vad_filter"):
+                    # The batched pipeline needs VAD or clips past one window;
+                    # fall back to back-to-back windows rather than failing.
+                    n = audio.shape[0]
+                    clips = [(s, min(s + _WINDOW_SAMPLES, n)) for s in range(0, n, _WINDOW_SAMPLES)]
+                if clips:
+                    options = {k: v for k, v in options.items() if not k.startswith("vad_")}
+                    options["clip_timestamps"] = [{"start": s, "end": e} for s, e in clips]
+                pipeline = BatchedInferencePipeline(model)
+                segments, info = pipeline.transcribe(
+                    audio,
+                    language=language,
+                    task=task,
+                    batch_size=self.max_batch_size,
+                    **options,
+                )
+            else:
+                segments, info = model.transcribe(audio, language=language, task=task, **options)
+            return BatchResult(list(segments), info.language, info.duration)
+
+
+_schedulers: dict[ModelKey, BatchScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_batch_scheduler(key: ModelKey) -> BatchScheduler:
+    """One scheduler per model key, sized from Settings."""
+    with _schedulers_lock:
+        sched = _schedulers.get(key)
+        if sched is None:
+            settings = get_settings()
+            sched = BatchScheduler(
+                key,
+                max_batch_size=settings.asr_batch_size,
+                max_wait_ms=settings.asr_batch_max_wait_ms,
+            )
+            _schedulers[key] = sched
+        return sched
+
+
+def batching_enabled() -> bool:
+    return bool(get_settings().asr_batching_enabled)
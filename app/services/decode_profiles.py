@@ -0,0 +1,118 @@
+# app/services/decode_profiles.py
+"""
+Named speed/quality profiles for transcription requests.
+
+A profile bundles everything that trades CPU for accuracy: model size, beam
+size, the temperature fallback ladder, VAD and word timestamps. Clients pick
+one per request (``profile=fast|balanced|accurate``), and each plan caps
+which ones it may use (ASR_PLAN_PROFILES). Free traffic runs greedy decoding
+on a small model, which costs several times less CPU than beam search on a
+large one.
+
+Without an explicit choice a request gets ASR_DEFAULT_PROFILE if its plan
+allows it, otherwise the most capable profile the plan does allow. Asking
+for an unknown profile is a 400, asking for one above the plan a 403.
+
+Model sizes per profile come from ASR_PROFILE_MODELS ("" = the configured
+default model). Beam search width defaults to the tuned profile's value
+for "balanced" (see app/services/tuning.py).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+from app.services.model_registry import ModelKey, default_model_key
+from app.services.tuning import default_beam_size
+from app.utils.uploads import DEFAULT_PLAN, normalize_plan
+
+# Cheapest first; used to pick the best profile a plan allows.
+PROFILE_ORDER = ("fast", "balanced", "accurate")
+
+
+@dataclasses.dataclass(frozen=True)
+class DecodeProfile:
+    name: str
+    model_size: str | None  # None = WHISPER_MODEL_SIZE
+    beam_size: int
+    best_of: int
+    temperature: tuple[float, ...]  # fallback ladder, tried in order
+    vad_filter: bool
+    min_silence_ms: int
+    word_timestamps: bool
+    condition_on_previous_text: bool
+
+    def model_key(self) -> ModelKey:
+        return default_model_key(self.model_size)
+
+    def options(self, vad: bool = True) -> dict[str, Any]:
+        """``WhisperModel.transcribe`` keyword arguments; ``vad=False`` drops the VAD pre-pass."""
+        opts: dict[str, Any] = {
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "temperature": list(self.temperature) if len(self.temperature) > 1 else self.temperature[0],
+            "condition_on_previous_text": self.condition_on_previous_text,
+            "word_timestamps": self.word_timestamps,
+        }
+        if vad and self.vad_filter:
+            opts["vad_filter"] = True
+            opts["vad_parameters"] = {"min_silence_duration_ms": self.min_silence_ms}
+        return opts
+
+
+def _builtin(name: str) -> DecodeProfile:
+    model = get_settings().asr_profile_models.get(name) or None
+    if name == "fast":
+        return DecodeProfile(
+            name, model, beam_size=1, best_of=1, temperature=(0.0,),
+            vad_filter=True, min_silence_ms=500, word_timestamps=False,
+            condition_on_previous_text=False,
+        )
+    if name == "balanced":
+        return DecodeProfile(
+            name, model, beam_size=default_beam_size(), best_of=1, temperature=(0.0, 0.2, 0.4),
+            vad_filter=True, min_silence_ms=500, word_timestamps=False,
+            condition_on_previous_text=True,
+        )
+    if name == "accurate":
+        return DecodeProfile(
+            name, model, beam_size=5, best_of=5, temperature=(0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+            vad_filter=True, min_silence_ms=300, word_timestamps=True,
+            condition_on_previous_text=True,
+        )
+    raise KeyError(name)
+
+
+def get_profile(name: str) -> DecodeProfile:
+    """Profile by name; KeyError for unknown names."""
+    return _builtin(name.lower())
+
+
+def allowed_profiles(plan: str | None) -> list[str]:
+    caps = get_settings().asr_plan_profiles
+    names = caps.get(normalize_plan(plan)) or caps.get(DEFAULT_PLAN) or ["fast"]
+    return [p for p in PROFILE_ORDER if p in names]
+
+
+def resolve_profile(requested: str | None, plan: str | None) -> DecodeProfile:
+    """The profile a request runs with, enforcing the plan cap (400 unknown, 403 not allowed)."""
+    allowed = allowed_profiles(plan)
+    if requested:
+        name = requested.strip().lower()
+        if name not in PROFILE_ORDER:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"unknown_profile: choose one of {', '.join(PROFILE_ORDER)}",
+            )
+        if name not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"profile_not_in_plan: allowed {', '.join(allowed)}",
+            )
+        return get_profile(name)
+    default = get_settings().asr_default_profile
+    return get_profile(default if default in allowed else allowed[-1])
@@ -0,0 +1,255 @@
+# app/services/fast_diarizer.py
+"""
+Lightweight CPU speaker diarization.
+
+pyannote gives the best turns but is slower than real time on CPU-only
+boxes, and without it ``diarize`` used to return nothing at all. This is the
+cheap alternative:
+
+1. speech regions from the Silero VAD bundled with faster-whisper;
+2. one log-mel / MFCC pass over the whole recording (librosa);
+3. a sliding window (1.5 s, hop 0.75 s) inside each region, embedded as the
+   mean and standard deviation of its MFCC frames. Both come from cumulative
+   sums, so every window is computed in one vectorized step;
+4. average-linkage agglomerative clustering on cosine similarity, down to
+   ``num_speakers`` when a hint is given, otherwise until no pair of clusters
+   is more similar than ``threshold``;
+5. adjacent windows with the same label are merged into turns.
+
+Long recordings are clustered on an evenly strided subset of at most
+``max_points`` windows. Every window is then assigned to the nearest
+centroid, which keeps the O(k^2) similarity matrix small.
+
+Select it with ASR_DIARIZER=fast (or "auto" without pyannote installed);
+ASR_DIARIZER_SPEAKERS is the default speaker-count hint.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+
+import numpy as np
+
+from app.services.audio import SAMPLE_RATE, DecodedAudio
+
+log = logging.getLogger(__name__)
+
+try:
+    import librosa
+
+    _HAS_LIBROSA = True
+except Exception:
+    librosa = None  # type: ignore
+    _HAS_LIBROSA = False
+
+Turn = tuple[float, float, str]
+
+# (samples) -> speech regions as sample offsets
+SpeechFn = Callable[[np.ndarray], "list[tuple[int, int]]"]
+
+_HOP = 160  # 10 ms frames at 16 kHz
+
+
+def available() -> bool:
+    return _HAS_LIBROSA
+
+
+def _vad_spans(samples: np.ndarray) -> list[tuple[int, int]]:
+    from app.services.long_audio import speech_spans
+
+    return speech_spans(samples)
+
+
+# ---------- clustering ----------
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-9)
+
+
+def agglomerate(
+    emb: np.ndarray,
+    num_clusters: int | None = None,
+    threshold: float = 0.3,
+    max_clusters: int = 8,
+) -> np.ndarray:
+    """Average-linkage clustering on cosine similarity; labels 0..K-1 in order of first row."""
+    n = emb.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    x = _normalize(emb.astype(np.float64, copy=False))
+    sim = x @ x.T
+    np.fill_diagonal(sim, -np.inf)
+    sizes = np.ones(n)
+    owner = np.arange(n)
+    k = n
+    while k > 1:
+        flat = int(np.argmax(sim))
+        i, j = divmod(flat, n)
+        if num_clusters:
+            if k <= num_clusters:
+                break
+        elif sim[i, j] < threshold and k <= max_clusters:
+            break
+        # Lance-Williams update for average linkage: merge j into i.
+        row = (sizes[i] * sim[i] + sizes[j] * sim[j]) / (sizes[i] + sizes[j])
+        sim[i, :] = row
+        sim[:, i] = row
+        sim[i, i] = -np.inf
+        sim[j, :] = -np.inf
+        sim[:, j] = -np.inf
+        sizes[i] += sizes[j]
+        owner[owner == j] = i
+        k -= 1
+    _, first, labels = np.unique(owner, return_index=True, return_inverse=True)
+    # np.unique orders by cluster id; renumber by first appearance instead.
+    rank = np.argsort(np.argsort(first))
+    return rank[labels]
+
+
+def cluster_windows(
+    emb: np.ndarray,
+    num_speakers: int | None = None,
+    threshold: float = 0.3,
+    max_speakers: int = 8,
+    max_points: int = 600,
+) -> np.ndarray:
+    """Cluster window embeddings, subsampling above ``max_points`` and assigning the rest by centroid."""
+    n = emb.shape[0]
+    if n <= max_points:
+        return agglomerate(emb, num_speakers, threshold, max_speakers)
+    pick = np.linspace(0, n - 1, max_points).round().astype(np.int64)
+    sub = agglomerate(emb[pick], num_speakers, threshold, max_speakers)
+    x = _normalize(emb.astype(np.float64, copy=False))
+    k = int(sub.max()) + 1
+    centroids = np.zeros((k, x.shape[1]))
+    np.add.at(centroids, sub, x[pick])
+    labels = np.argmax(x @ _normalize(centroids).T, axis=1)
+    # Renumber by first appearance in time, as agglomerate() does.
+    order = {}
+    for lab in labels.tolist():
+        order.setdefault(lab, len(order))
+    return np.array([order[lab] for lab in labels.tolist()], dtype=np.int64)
+
+
+# ---------- windows / turns ----------
+def plan_windows(
+    spans: list[tuple[float, float]],
+    win_s: float,
+    hop_s: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Analysis windows inside speech spans (seconds).
+
+    Returns (win_start, win_end, own_start, own_end): the audio each window
+    looks at, and the disjoint slice of the span it is responsible for when
+    turns are built (split halfway between neighbouring window centres).
+    """
+    ws, we, os_, oe = [], [], [], []
+    for s, e in spans:
+        if e - s <= win_s:
+            starts = np.array([s])
+        else:
+            starts = np.arange(s, e - win_s, hop_s)
+            starts = np.append(starts, e - win_s)
+        ends = np.minimum(starts + win_s, e)
+        centres = (starts + ends) / 2
+        cuts = (centres[1:] + centres[:-1]) / 2
+        ws.append(starts)
+        we.append(ends)
+        os_.append(np.concatenate(([s], cuts)))
+        oe.append(np.concatenate((cuts, [e])))
+    if not ws:
+        empty = np.zeros(0)
+        return empty, empty, empty, empty
+    return np.concatenate(ws), np.concatenate(we), np.concatenate(os_), np.concatenate(oe)
+
+
+def windows_to_turns(own_start: np.ndarray, own_end: np.ndarray, labels: np.ndarray) -> list[Turn]:
+    """Merge adjacent windows with the same label; a one-window blip between equal labels is smoothed away."""
+    labels = labels.copy()
+    if labels.size >= 3:
+        contiguous = own_end[:-1] == own_start[1:]
+        blip = (
+            (labels[:-2] == labels[2:])
+            & (labels[1:-1] != labels[:-2])
+            & contiguous[:-1]
+            & contiguous[1:]
+        )
+        labels[1:-1][blip] = labels[:-2][blip]
+    turns: list[Turn] = []
+    for s, e, lab in zip(own_start.tolist(), own_end.tolist(), labels.tolist()):
+        name = f"SPEAKER_{lab:02d}"
+        if turns and turns[-1][2] == name and turns[-1][1] == s:
+            turns[-1] = (turns[-1][0], e, name)
+        else:
+            turns.append((s, e, name))
+    return turns
+
+
+# ---------- features ----------
+def window_embeddings(
+    samples: np.ndarray,
+    win_start: np.ndarray,
+    win_end: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    n_mfcc: int = 20,
+) -> np.ndarray:
+    """Mean + std of MFCCs (c0 dropped, CMVN over the recording) for each window."""
+    mel = librosa.feature.melspectrogram(
+        y=samples, sr=sample_rate, n_fft=512, hop_length=_HOP, n_mels=40
+    )
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=n_mfcc + 1)[1:].T  # (frames, n_mfcc)
+    mfcc = (mfcc - mfcc.mean(axis=0)) / (mfcc.std(axis=0) + 1e-9)
+    frames = mfcc.shape[0]
+    a = np.clip((win_start * sample_rate / _HOP).astype(np.int64), 0, frames - 1)
+    b = np.clip((win_end * sample_rate / _HOP).astype(np.int64), a + 1, frames)
+    zero = np.zeros((1, mfcc.shape[1]))
+    c1 = np.concatenate((zero, np.cumsum(mfcc, axis=0)))
+    c2 = np.concatenate((zero, np.cumsum(mfcc * mfcc, axis=0)))
+    count = (b - a)[:, None]
+    mean = (c1[b] - c1[a]) / count
+    std = np.sqrt(np.maximum((c2[b] - c2[a]) / count - mean * mean, 0.0))
+    return np.hstack((mean, std))
+
+
+class FastDiarizer:
+    def __init__(
+        self,
+        win_s: float = 1.5,
+        hop_s: float = 0.75,
+        threshold: float = 0.3,
+        max_speakers: int = 8,
+        max_points: int = 600,
+        speech: SpeechFn | None = None,
+    ) -> None:
+        self.win_s = win_s
+        self.hop_s = hop_s
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.max_points = max_points
+        self._speech = speech or _vad_spans
+
+    def __call__(self, audio: DecodedAudio, num_speakers: int | None = None) -> list[Turn]:
+        if not _HAS_LIBROSA:
+            raise RuntimeError("librosa is required for the fast diarizer")
+        sr = audio.sample_rate
+        spans = [(a / sr, b / sr) for a, b in self._speech(audio.samples)]
+        ws, we, own_s, own_e = plan_windows(spans, self.win_s, self.hop_s)
+        if ws.size == 0:
+            return []
+        emb = window_embeddings(audio.samples, ws, we, sr)
+        labels = cluster_windows(emb, num_speakers, self.threshold, self.max_speakers, self.max_points)
+        return windows_to_turns(own_s, own_e, labels)
+
+
+_diarizer: FastDiarizer | None = None
+_diarizer_lock = threading.Lock()
+
+
+def get_fast_diarizer() -> FastDiarizer:
+    global _diarizer
+    with _diarizer_lock:
+        if _diarizer is None:
+            _diarizer = FastDiarizer()
+        return _diarizer
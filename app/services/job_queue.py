@@ -0,0 +1,144 @@
+# app/services/job_queue.py
+"""
+Bounded background worker pool for long-running transcription jobs.
+
+Request handlers enqueue a callable and return immediately; a fixed number of
+daemon threads drain the queue, so ASR runs at a controlled concurrency no
+matter how fast uploads arrive. Job state itself lives in the database
+(``jobs.status``), this module only schedules the work. The queue is in
+memory, so jobs still queued or running when the process exits are marked
+failed by the app at the next startup. Each job row records the
+:func:`worker_id` whose queue holds it; only jobs whose worker is gone
+(:func:`worker_gone`) are failed, so sibling workers keep theirs.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import queue
+import socket
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Exponential moving average weight for the wait/run time gauges.
+_ALPHA = 0.2
+
+
+def worker_id() -> str:
+    """``host:pid`` of this process; stored on the jobs it queues."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_gone(owner: str) -> bool:
+    """
+    True when the process that queued a job has certainly exited. Owners
+    on other hosts cannot be checked from here and count as alive; an
+    owner with our own pid is a previous process, since ours just started.
+    """
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # exists, owned by another user
+    return False
+
+
+class QueueFullError(RuntimeError):
+    """The queue is at capacity; ``retry_after`` is a hint in whole seconds."""
+
+    def __init__(self, name: str, retry_after: int) -> None:
+        super().__init__(f"{name} queue is full")
+        self.retry_after = retry_after
+
+
+def retry_after_s(depth: int, workers: int, run_s: float) -> int:
+    """Seconds until roughly one slot frees up, from queue depth and mean job time."""
+    return max(1, min(600, math.ceil((depth / max(1, workers) + 1) * max(run_s, 1.0))))
+
+
+class JobQueue:
+    def __init__(self, workers: int = 1, name: str = "asr-job", max_queued: int = 0) -> None:
+        self.workers = max(1, workers)
+        self.name = name
+        self.max_queued = max_queued  # 0 = unbounded
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self.wait_ewma = 0.0  # seconds from submit to start
+        self.run_ewma = 0.0  # seconds per job
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        log.info("Started %d %s worker(s)", self.workers, self.name)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Enqueue ``fn``; raises QueueFullError once ``max_queued`` jobs are waiting."""
+        self.start()
+        # Check and put under one lock so concurrent submits cannot overshoot max_queued.
+        with self._lock:
+            depth = self._queue.qsize()
+            if self.max_queued and depth >= self.max_queued:
+                raise QueueFullError(self.name, retry_after_s(depth, self.workers, self.run_ewma))
+            self._queue.put((fn, args, kwargs, time.monotonic()))
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for t in threads:
+            t.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "active": self._active,
+            "max_queued": self.max_queued,
+            "wait_ms": round(self.wait_ewma * 1000.0, 1),
+            "run_ms": round(self.run_ewma * 1000.0, 1),
+        }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                fn, args, kwargs, enqueued = item
+                started = time.monotonic()
+                with self._lock:
+                    self._active += 1
+                    self.wait_ewma += _ALPHA * ((started - enqueued) - self.wait_ewma)
+                try:
+                    fn(*args, **kwargs)
+                except Exception:
+                    # The job callable records its own failure state; keep the worker alive.
+                    log.exception("%s job failed", self.name)
+                finally:
+                    with self._lock:
+                        self._active -= 1
+                        self.run_ewma += _ALPHA * ((time.monotonic() - started) - self.run_ewma)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,226 @@
+# app/services/long_audio.py
+"""
+Parallel transcription of long recordings.
+
+The audio is split at silences found by VAD into chunks of bounded length,
+the chunks are transcribed concurrently in a process pool (each process owns
+its own CTranslate2 model with ``cpu_threads`` = cores / workers), and the
+per-chunk segments are stitched back together on the global timeline with
+repeated words at chunk borders removed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# (start, end, text) on the global timeline; plain tuples pickle cheaply.
+RawSegment = tuple[float, float, str]
+
+
+# ---------- chunk planning ----------
+def speech_spans(audio: np.ndarray) -> list[tuple[int, int]]:
+    """Speech regions (sample offsets) from faster-whisper's bundled Silero VAD."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    spans = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    return [(int(s["start"]), int(s["end"])) for s in spans]
+
+
+def plan_chunks(
+    spans: list[tuple[int, int]],
+    total: int,
+    max_chunk_s: float,
+    overlap_s: float = 1.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[tuple[int, int]]:
+    """
+    Group speech spans into chunks no longer than ``max_chunk_s``.
+
+    Chunks are cut in the silence between two spans. A single span longer
+    than the limit is hard-split with ``overlap_s`` of overlap so words on the
+    cut are seen by both sides (and de-duplicated afterwards).
+    """
+    limit = int(max_chunk_s * sample_rate)
+    overlap = int(overlap_s * sample_rate)
+    if not spans:
+        return []
+
+    pieces: list[tuple[int, int]] = []
+    for start, end in spans:
+        while end - start > limit:
+            pieces.append((start, start + limit))
+            start += limit - overlap
+        pieces.append((start, end))
+
+    chunks: list[tuple[int, int]] = []
+    cur_start, cur_end = pieces[0]
+    for start, end in pieces[1:]:
+        if end - cur_start <= limit:
+            cur_end = end
+            continue
+        if start > cur_end:
+            # Cut in the middle of the silence, never past either chunk's limit;
+            # whatever silence is left between the two chunks is simply skipped.
+            mid = (cur_end + start) // 2
+            chunks.append((cur_start, min(mid, cur_start + limit)))
+            cur_start = max(mid, end - limit)
+        else:
+            chunks.append((cur_start, cur_end))
+            cur_start = start
+        cur_end = end
+    chunks.append((cur_start, min(total, cur_end)))
+    return chunks
+
+
+# ---------- stitching ----------
+_WORD = re.compile(r"[\w']+")
+
+
+def _norm_words(text: str) -> list[str]:
+    return [w.lower() for w in _WORD.findall(text)]
+
+
+def _overlap_len(prev: list[str], nxt: list[str], max_words: int = 12) -> int:
+    """Length of the longest suffix of ``prev`` that is a prefix of ``nxt``."""
+    for n in range(min(len(prev), len(nxt), max_words), 0, -1):
+        if prev[-n:] == nxt[:n]:
+            return n
+    return 0
+
+
+def _drop_leading_words(text: str, n: int) -> str:
+    matches = list(_WORD.finditer(text))
+    if n >= len(matches):
+        return ""
+    return text[matches[n].start():].strip()
+
+
+def stitch(chunks: list[list[RawSegment]]) -> list[RawSegment]:
+    """Concatenate per-chunk segments, dropping overlap and repeated border words."""
+    out: list[RawSegment] = []
+    for segs in chunks:
+        segs = [s for s in segs if s[2].strip()]
+        if out:
+            last_end = out[-1][1]
+            # Segments entirely inside the already-covered region are repeats.
+            segs = [s for s in segs if s[1] > last_end + 0.01]
+            if segs:
+                start, end, text = segs[0]
+                n = _overlap_len(_norm_words(out[-1][2]), _norm_words(text))
+                if n:
+                    text = _drop_leading_words(text, n)
+                segs[0] = (max(start, last_end), end, text)
+                segs = [s for s in segs if s[2].strip()]
+        out.extend(segs)
+    return out
+
+
+# ---------- process pool ----------
+_WORKER_MODEL: Any = None
+
+
+def _init_worker(model_size: str, compute_type: str, cpu_threads: int) -> None:
+    global _WORKER_MODEL
+    os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+    from faster_whisper import WhisperModel
+
+    _WORKER_MODEL = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+    )
+
+
+def _detect_language(audio: np.ndarray) -> str:
+    return _WORKER_MODEL.detect_language(audio=audio)[0]
+
+
+def _transcribe_chunk(
+    audio: np.ndarray, offset: float, language: str | None, task: str, options: dict[str, Any]
+) -> list[RawSegment]:
+    segments, _info = _WORKER_MODEL.transcribe(audio, language=language, task=task, **options)
+    return [(s.start + offset, s.end + offset, s.text) for s in segments]
+
+
+_pools: dict[tuple[str, str, int], ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(model_size: str, compute_type: str, workers: int) -> ProcessPoolExecutor:
+    key = (model_size, compute_type, workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+            log.info(
+                "Starting long-audio pool: %d x %s/%s, cpu_threads=%d",
+                workers, model_size, compute_type, cpu_threads,
+            )
+            # spawn: never fork a process that already runs threads (uvicorn, job queue)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_size, compute_type, cpu_threads),
+            )
+            _pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def transcribe_parallel(
+    audio: np.ndarray,
+    model_size: str,
+    compute_type: str = "int8",
+    workers: int = 2,
+    max_chunk_s: float = 120.0,
+    language: str | None = None,
+    task: str = "transcribe",
+    spans: list[tuple[int, int]] | None = None,
+    **options: Any,
+) -> tuple[str, list[RawSegment]]:
+    """
+    Transcribe 16 kHz mono ``audio`` in parallel chunks; returns (language, segments).
+    ``spans`` are speech regions from the VAD pre-pass, found here when omitted.
+    """
+    if spans is None:
+        spans = speech_spans(audio)
+    chunks = plan_chunks(spans, audio.shape[0], max_chunk_s)
+    if not chunks:
+        return language or "unknown", []
+
+    pool = _get_pool(model_size, compute_type, workers)
+    if language is None:
+        # Detect once so every chunk decodes with the same language.
+        first = audio[chunks[0][0] : chunks[0][0] + 30 * SAMPLE_RATE]
+        language = pool.submit(_detect_language, first).result()
+
+    futures = [
+        pool.submit(
+            _transcribe_chunk, audio[start:end], start / SAMPLE_RATE, language, task, options
+        )
+        for start, end in chunks
+    ]
+    return language, stitch([f.result() for f in futures])
@@ -0,0 +1,258 @@
+# app/services/model_registry.py
+"""
+Process-wide registry of loaded Whisper models.
+
+Every transcription path (asgi_dev, the compat endpoints and
+FasterWhisperTranscriber) borrows its model from here, so a worker keeps at
+most one copy of each (model size, device, compute type) combination.
+
+- Models load lazily on first use; concurrent callers of the same key wait
+  for a single load instead of racing to build duplicates.
+- Callers hold a reference while decoding (``lease()``); idle models are
+  evicted least-recently-used first when a new load would exceed the memory
+  budget (WHISPER_MODEL_BUDGET_MB, 0 = unlimited).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from app.config import get_settings
+from app.services import tuning
+
+log = logging.getLogger(__name__)
+
+
+class ModelKey(NamedTuple):
+    model_size: str
+    device: str
+    compute_type: str
+
+
+# Approximate resident size (MB) of CTranslate2 Whisper weights at int8.
+_INT8_FOOTPRINT_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 480,
+    "medium": 1500,
+    "large": 3100,
+    "distil": 1600,
+    "turbo": 1700,
+}
+_COMPUTE_SCALE = {
+    "int8": 1.0,
+    "int8_float16": 1.0,
+    "int8_float32": 1.0,
+    "int8_bfloat16": 1.0,
+    "int16": 2.0,
+    "float16": 2.0,
+    "bfloat16": 2.0,
+    "float32": 4.0,
+}
+
+
+def estimate_model_mb(key: ModelKey) -> int:
+    """Best-effort estimate of how much memory a model will occupy."""
+    name = os.path.basename(key.model_size.rstrip("/\\")).lower()
+    base = next(
+        (mb for prefix, mb in _INT8_FOOTPRINT_MB.items() if prefix in name),
+        _INT8_FOOTPRINT_MB["small"],
+    )
+    return int(base * _COMPUTE_SCALE.get(key.compute_type, 2.0))
+
+
+def cpu_compute_type() -> str:
+    """CPU compute type: WHISPER_COMPUTE, else the tuned profile's, else int8."""
+    return os.getenv("WHISPER_COMPUTE") or tuning.default_compute_type() or "int8"
+
+
+def pick_device_and_compute() -> tuple[str, str]:
+    """Resolve device/compute type from WHISPER_DEVICE/WHISPER_COMPUTE or the hardware."""
+    env_device = os.getenv("WHISPER_DEVICE")
+    env_compute = os.getenv("WHISPER_COMPUTE")
+    if env_device:
+        return env_device, (env_compute or ("float16" if env_device == "cuda" else "int8"))
+    try:
+        import ctranslate2 as ct2
+
+        if getattr(ct2, "get_cuda_device_count", lambda: 0)() > 0:
+            return "cuda", env_compute or "float16"
+    except Exception:
+        pass
+    return "cpu", cpu_compute_type()
+
+
+def default_model_key(model_size: str | None = None) -> ModelKey:
+    """Key for the configured default model (optionally overriding the size)."""
+    device, compute = pick_device_and_compute()
+    size = model_size or os.getenv("WHISPER_MODEL_SIZE") or get_settings().whisper_model_size
+    return ModelKey(size, device, compute)
+
+
+def _load_whisper(key: ModelKey) -> Any:
+    try:
+        from faster_whisper import WhisperModel
+    except Exception as e:
+        raise RuntimeError(
+            "Whisper not installed or import failed. "
+            "Install faster-whisper and its dependencies.\n"
+            f"Original error: {e}"
+        )
+    return WhisperModel(
+        key.model_size,
+        device=key.device,
+        compute_type=key.compute_type,
+        **tuning.model_kwargs(key.device),
+    )
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_mb: int
+    load_seconds: float
+    refcount: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelRegistry:
+    """Thread-safe, reference-counted LRU cache of loaded models."""
+
+    def __init__(
+        self,
+        budget_mb: int = 0,
+        loader: Callable[[ModelKey], Any] = _load_whisper,
+        estimator: Callable[[ModelKey], int] = estimate_model_mb,
+    ) -> None:
+        self.budget_mb = budget_mb
+        self._loader = loader
+        self._estimator = estimator
+        self._entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._loading: dict[ModelKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    # ---- public API ----
+    def acquire(self, key: ModelKey) -> Any:
+        """Return the model for ``key``, loading it if needed. Pair with ``release``."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    return entry.model
+                pending = self._loading.get(key)
+                if pending is None:
+                    self._loading[key] = threading.Event()
+                    break
+            # Another thread is loading this key; wait and re-check.
+            pending.wait()
+
+        try:
+            size_mb = self._estimator(key)
+            with self._lock:
+                self._make_room(size_mb)
+            started = time.perf_counter()
+            model = self._loader(key)
+            elapsed = time.perf_counter() - started
+            log.info("Loaded Whisper model %s in %.1fs (~%d MB)", key, elapsed, size_mb)
+            with self._lock:
+                self._entries[key] = _Entry(
+                    model=model, size_mb=size_mb, load_seconds=elapsed, refcount=1
+                )
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def release(self, key: ModelKey) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount <= 0:
+                raise RuntimeError(f"release() without matching acquire() for {key}")
+            entry.refcount -= 1
+            entry.last_used = time.monotonic()
+
+    @contextmanager
+    def lease(self, key: ModelKey) -> Iterator[Any]:
+        """Borrow a model for the duration of a ``with`` block."""
+        model = self.acquire(key)
+        try:
+            yield model
+        finally:
+            self.release(key)
+
+    def peek(self, key: ModelKey) -> Any | None:
+        """Return the model if it is already resident, without loading or pinning it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.model if entry is not None else None
+
+    def evict_idle(self) -> list[ModelKey]:
+        """Drop every model nobody is currently using."""
+        with self._lock:
+            idle = [k for k, e in self._entries.items() if e.refcount == 0]
+            for k in idle:
+                del self._entries[k]
+        return idle
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "budget_mb": self.budget_mb,
+                "resident_mb": self._resident_mb(),
+                "models": [
+                    {
+                        "model_size": k.model_size,
+                        "device": k.device,
+                        "compute_type": k.compute_type,
+                        "size_mb": e.size_mb,
+                        "refcount": e.refcount,
+                        "load_seconds": round(e.load_seconds, 3),
+                    }
+                    for k, e in self._entries.items()
+                ],
+            }
+
+    # ---- internals (call with self._lock held) ----
+    def _resident_mb(self) -> int:
+        return sum(e.size_mb for e in self._entries.values())
+
+    def _make_room(self, size_mb: int) -> None:
+        if not self.budget_mb:
+            return
+        # OrderedDict iterates oldest-first, which is the LRU order.
+        for k in [k for k, e in self._entries.items() if e.refcount == 0]:
+            if self._resident_mb() + size_mb <= self.budget_mb:
+                return
+            log.info("Evicting idle Whisper model %s to stay within budget", k)
+            del self._entries[k]
+        if self._resident_mb() + size_mb > self.budget_mb:
+            # Soft budget: never fail a request because other models are busy.
+            log.warning(
+                "Whisper model budget exceeded (%d MB resident + %d MB new > %d MB)",
+                self._resident_mb(),
+                size_mb,
+                self.budget_mb,
+            )
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(budget_mb=get_settings().whisper_model_budget_mb)
+        return _registry
@@ -0,0 +1,170 @@
+# app/services/pcm_cache.py
+"""
+Content-addressed cache of decoded audio.
+
+Users often run several tasks on the same media (transcription, then
+subtitles, then translation), uploading the file again each time. The
+upload's SHA-256 is known once it is spooled, so the 16 kHz mono float32 PCM
+that ffmpeg produced the first time is kept as ``<sha256>.npy`` under
+ASR_PCM_CACHE_DIR. Later requests for the same bytes map that file with
+``numpy.load(mmap_mode="r")`` instead of running ffmpeg: pages are read on
+demand and shared between workers through the page cache.
+
+Like the result cache, reads refresh the file's mtime, which makes mtime
+the LRU clock. Once the directory grows past ASR_PCM_CACHE_MAX_MB the least
+recently used recordings are removed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.audio import SAMPLE_RATE, DecodedAudio, decode_audio
+
+log = logging.getLogger(__name__)
+
+# Rescan a cache directory at least this often, to count other workers' writes.
+_RESCAN_S = 60.0
+
+
+class PcmCache:
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._budget = LruBudget(self.root, "*/*.npy")
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> DecodedAudio | None:
+        path = self._path(key)
+        try:
+            samples = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Dropping unreadable PCM cache entry %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+        if samples.dtype != np.float32 or samples.ndim != 1:
+            log.warning("Dropping PCM cache entry %s with layout %s%s", path.name, samples.dtype, samples.shape)
+            del samples
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)  # LRU touch
+        except OSError:
+            pass
+        return DecodedAudio(samples)
+
+    def put(self, key: str, samples: np.ndarray) -> DecodedAudio:
+        """Store ``samples`` and return them mapped from the cache file."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp.open("wb") as f:
+            np.save(f, np.ascontiguousarray(samples, dtype=np.float32))
+        os.replace(tmp, path)
+        self._budget.add(path.stat().st_size, self.max_bytes)
+        return DecodedAudio(np.load(path, mmap_mode="r"))
+
+
+def evict_lru(root: Path, pattern: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used (oldest mtime) files under ``root`` until
+    they fit in ``max_bytes``; returns the bytes left.
+    """
+    entries = []
+    total = 0
+    for p in root.glob(pattern):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+    if total <= max_bytes:
+        return total
+    entries.sort()
+    # Keep the newest entry even when it alone is over the limit.
+    for _mtime, size, p in entries[:-1]:
+        if total <= max_bytes:
+            break
+        p.unlink(missing_ok=True)  # open memmaps stay valid until closed
+        total -= size
+    return total
+
+
+class LruBudget:
+    """
+    Running size of the files under ``root`` matching ``pattern``, so writers
+    only pay for :func:`evict_lru`'s directory scan once the budget is
+    exceeded (or every ``rescan_s``, to count other workers' writes) instead
+    of on every write.
+    """
+
+    def __init__(self, root: str | Path, pattern: str, rescan_s: float = _RESCAN_S) -> None:
+        self.root = Path(root)
+        self.pattern = pattern
+        self.rescan_s = rescan_s
+        self._lock = threading.Lock()
+        self._total: int | None = None  # unknown until the first scan
+        self._scanned = 0.0
+
+    def add(self, nbytes: int, max_bytes: int) -> None:
+        """Account for a file of ``nbytes`` just written; evict if that puts us over ``max_bytes``."""
+        if not max_bytes:
+            return
+        with self._lock:
+            if self._total is not None and time.monotonic() - self._scanned < self.rescan_s:
+                self._total += nbytes
+                if self._total <= max_bytes:
+                    return
+            self._total = evict_lru(self.root, self.pattern, max_bytes)
+            self._scanned = time.monotonic()
+
+
+_cache: PcmCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_pcm_cache() -> PcmCache | None:
+    """The configured cache, or None when ASR_PCM_CACHE_ENABLED is off."""
+    global _cache
+    settings = get_settings()
+    if not settings.asr_pcm_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = PcmCache(
+                settings.asr_pcm_cache_dir,
+                max_bytes=int(settings.asr_pcm_cache_max_mb * 1024 * 1024),
+            )
+        return _cache
+
+
+def decode_cached(path: str | os.PathLike[str], sha256: str | None = None) -> DecodedAudio:
+    """
+    ``decode_audio`` with the PCM cache in front. ``sha256`` is the upload's
+    content hash; without it (or with the cache off) the file is decoded as usual.
+    """
+    cache = get_pcm_cache() if sha256 else None
+    if cache is None:
+        return decode_audio(path)
+    key = f"{sha256}-{SAMPLE_RATE}"
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    audio = decode_audio(path)
+    try:
+        return cache.put(key, audio.samples)
+    except OSError as e:
+        log.warning("Could not write PCM cache entry: %s", e)
+        return audio
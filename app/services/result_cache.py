@@ -0,0 +1,139 @@
+# app/services/result_cache.py
+"""
+Content-addressed cache of finished transcriptions.
+
+Entries are keyed by the SHA-256 of the uploaded bytes plus every setting that
+changes the output (model, compute type, language, task, VAD), so re-uploading
+the same file returns the stored segments instead of running Whisper again.
+
+Entries are small JSON files under ASR_RESULT_CACHE_DIR. Reads refresh the
+file's mtime, which makes mtime the LRU clock: when the directory grows past
+ASR_RESULT_CACHE_MAX_MB the least recently used files go first, and anything
+older than ASR_RESULT_CACHE_TTL_S is treated as a miss and removed.
+Every upload path keys its decodes with :func:`profile_key`, so they share
+entries.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.config import get_settings
+from app.services.pcm_cache import LruBudget
+
+if TYPE_CHECKING:
+    from app.services.decode_profiles import DecodeProfile
+
+log = logging.getLogger(__name__)
+
+
+def make_key(
+    sha256: str,
+    model: str,
+    compute_type: str,
+    language: str | None,
+    task: str = "transcribe",
+    vad: bool = False,
+) -> str:
+    raw = "|".join([sha256, model, compute_type, language or "auto", task, "vad" if vad else "novad"])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _has_onnxruntime() -> bool:
+    # faster-whisper's vad_filter needs it; without it the profile decodes without VAD.
+    return importlib.util.find_spec("onnxruntime") is not None
+
+
+def profile_key(sha256: str, language: str | None, profile: DecodeProfile) -> str:
+    """Key for decoding the upload ``sha256`` with ``profile``."""
+    key = profile.model_key()
+    vad = get_settings().asr_vad_prepass or (profile.vad_filter and _has_onnxruntime())
+    return make_key(sha256, key.model_size, key.compute_type, language, f"transcribe:{profile.name}", vad)
+
+
+def entry_from_segments(segments: Any, language: str | None) -> dict[str, Any]:
+    """Cache payload for decoded Whisper segments (anything with start/end/text)."""
+    out = []
+    for seg in segments:
+        text = getattr(seg, "text", "").strip()
+        if text:
+            item = {"start": getattr(seg, "start", 0.0), "end": getattr(seg, "end", 0.0), "text": text}
+            logprob = getattr(seg, "avg_logprob", None)
+            if logprob is not None:
+                item["avg_logprob"] = round(float(logprob), 4)
+            out.append(item)
+    return {"language": language, "segments": out}
+
+
+def entry_text(entry: dict[str, Any]) -> str:
+    return " ".join(s["text"] for s in entry.get("segments", [])).strip() or "(empty transcript)"
+
+
+class ResultCache:
+    def __init__(self, root: str | Path, max_bytes: int, ttl_s: float) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._budget = LruBudget(self.root, "*/*.json")
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Dropping unreadable result cache entry %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+        if self.ttl_s and time.time() - entry.get("created", 0) > self.ttl_s:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)  # LRU touch
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._budget.add(path.stat().st_size, self.max_bytes)
+
+
+_cache: ResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache | None:
+    """The configured cache, or None when ASR_RESULT_CACHE_ENABLED is off."""
+    global _cache
+    settings = get_settings()
+    if not settings.asr_result_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(
+                settings.asr_result_cache_dir,
+                max_bytes=int(settings.asr_result_cache_max_mb * 1024 * 1024),
+                ttl_s=settings.asr_result_cache_ttl_s,
+            )
+        return _cache
@@ -0,0 +1,115 @@
+# app/services/segment_store.py
+"""
+Timed segments of saved transcripts.
+
+When a transcription finishes its segments are written to
+``transcript_segments`` with one executemany insert. Subtitles, time-range
+search and re-exports then read them back instead of decoding again.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import TranscriptSegment
+
+log = logging.getLogger(__name__)
+
+
+def _field(seg: Any, name: str, default: Any = None) -> Any:
+    if isinstance(seg, dict):
+        return seg.get(name, default)
+    return getattr(seg, name, default)
+
+
+def segment_rows(transcript_id: int, segments: Iterable[Any]) -> list[dict[str, Any]]:
+    """Rows for ``segments`` (dicts or objects with start/end in seconds); blank text is skipped."""
+    rows = []
+    for seg in segments:
+        text = (_field(seg, "text") or "").strip()
+        if not text:
+            continue
+        rows.append(
+            {
+                "transcript_id": transcript_id,
+                "seq": len(rows),
+                "start_ms": int(round(float(_field(seg, "start", 0.0)) * 1000)),
+                "end_ms": int(round(float(_field(seg, "end", 0.0)) * 1000)),
+                "text": text,
+                "speaker": _field(seg, "speaker"),
+                "avg_logprob": _field(seg, "avg_logprob"),
+            }
+        )
+    return rows
+
+
+def save_segments(db: Session, transcript_id: int, segments: Iterable[Any]) -> int:
+    """Replace the transcript's segments in one bulk insert; the caller commits."""
+    rows = segment_rows(transcript_id, segments)
+    db.execute(delete(TranscriptSegment).where(TranscriptSegment.transcript_id == transcript_id))
+    if rows:
+        db.execute(insert(TranscriptSegment), rows)
+    return len(rows)
+
+
+def store_segments(db: Session, transcript_id: int, segments: Iterable[Any]) -> bool:
+    """
+    Save and commit the segments of an already committed transcript.
+
+    A failure (e.g. a database created before ``transcript_segments``
+    existed) is logged and rolled back, so the transcript itself is kept.
+    """
+    try:
+        save_segments(db, transcript_id, segments)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        log.warning("Transcript %s saved without timed segments: %s", transcript_id, e)
+        return False
+    return True
+
+
+def delete_segments(db: Session, transcript_id: int) -> None:
+    """Delete the transcript's segments; the caller commits. A missing table is not an error."""
+    try:
+        db.execute(delete(TranscriptSegment).where(TranscriptSegment.transcript_id == transcript_id))
+    except SQLAlchemyError as e:
+        db.rollback()
+        log.warning("Could not delete segments of transcript %s: %s", transcript_id, e)
+
+
+def load_segments(
+    db: Session,
+    transcript_id: int,
+    from_ms: int | None = None,
+    to_ms: int | None = None,
+) -> list[dict[str, Any]]:
+    """Segments in order, optionally only those overlapping [from_ms, to_ms)."""
+    stmt = select(
+        TranscriptSegment.start_ms,
+        TranscriptSegment.end_ms,
+        TranscriptSegment.text,
+        TranscriptSegment.speaker,
+        TranscriptSegment.avg_logprob,
+    ).where(TranscriptSegment.transcript_id == transcript_id)
+    if from_ms is not None:
+        stmt = stmt.where(TranscriptSegment.end_ms > from_ms)
+    if to_ms is not None:
+        stmt = stmt.where(TranscriptSegment.start_ms < to_ms)
+    stmt = stmt.order_by(TranscriptSegment.seq)
+    return [
+        {
+            "start": row.start_ms / 1000.0,
+            "end": row.end_ms / 1000.0,
+            "text": row.text,
+            "speaker": row.speaker,
+            "avg_logprob": row.avg_logprob,
+        }
+        for row in db.execute(stmt)
+    ]
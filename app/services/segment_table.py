@@ -0,0 +1,265 @@
+# app/services/segment_table.py
+"""
+Column-oriented storage for long transcripts.
+
+A 10-hour recording produces tens of thousands of segments; as Python
+objects (a dataclass or dict per segment, plus a str and floats each) that is
+a few hundred bytes of heap per segment and a lot of GC work. SegmentTable
+keeps the same data in a handful of flat buffers:
+
+* ``starts`` / ``ends``: float64 NumPy arrays (seconds)
+* ``speakers``: int16 codes into an interned ``speaker_names`` list (-1 = none)
+* text: one UTF-8 buffer plus an int64 offsets array (n + 1 entries)
+
+Slicing returns a new table over views of the same buffers (no copy),
+iteration yields small ``SegmentView`` objects that decode their text on
+access, and JSON / SRT / plain text are produced straight from the columns.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any, overload
+
+import numpy as np
+
+_NO_SPEAKER = -1
+
+
+class SegmentView:
+    """Read-only view of one row; nothing is copied until a field is read."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: SegmentTable, i: int) -> None:
+        self._table = table
+        self._i = i
+
+    @property
+    def start(self) -> float:
+        return float(self._table.starts[self._i])
+
+    @property
+    def end(self) -> float:
+        return float(self._table.ends[self._i])
+
+    @property
+    def text(self) -> str:
+        return self._table.text_at(self._i)
+
+    @property
+    def speaker(self) -> str | None:
+        return self._table.speaker_at(self._i)
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"start": self.start, "end": self.end, "text": self.text}
+        speaker = self.speaker
+        if speaker is not None:
+            out["speaker"] = speaker
+        return out
+
+    def __repr__(self) -> str:
+        return f"SegmentView(start={self.start!r}, end={self.end!r}, text={self.text!r}, speaker={self.speaker!r})"
+
+
+class SegmentTableBuilder:
+    """
+    Append rows one at a time (e.g. straight from a faster-whisper generator).
+
+    Rows go straight into typed arrays and one text buffer, so no per-segment
+    objects are kept. ``build()`` hands those buffers to the table without
+    copying and starts the builder afresh.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._starts = array("d")
+        self._ends = array("d")
+        self._speakers = array("h")
+        self._text = bytearray()
+        self._offsets = array("q", [0])
+        self._speaker_codes: dict[str, int] = {}
+        self._speaker_names: list[str] = []
+
+    def append(self, start: float, end: float, text: str, speaker: str | None = None) -> None:
+        self._starts.append(start)
+        self._ends.append(end)
+        self._text += text.strip().encode("utf-8")
+        self._offsets.append(len(self._text))
+        if speaker is None:
+            self._speakers.append(_NO_SPEAKER)
+        else:
+            code = self._speaker_codes.get(speaker)
+            if code is None:
+                code = self._speaker_codes[speaker] = len(self._speaker_names)
+                self._speaker_names.append(speaker)
+            self._speakers.append(code)
+
+    def build(self) -> SegmentTable:
+        table = SegmentTable(
+            np.frombuffer(self._starts, dtype=np.float64),
+            np.frombuffer(self._ends, dtype=np.float64),
+            memoryview(self._text),
+            np.frombuffer(self._offsets, dtype=np.int64),
+            np.frombuffer(self._speakers, dtype=np.int16),
+            tuple(self._speaker_names),
+        )
+        self._reset()  # the table now owns (and pins) the buffers
+        return table
+
+
+class SegmentTable:
+    __slots__ = ("starts", "ends", "_text", "_offsets", "speakers", "speaker_names")
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        text: bytes | memoryview,
+        offsets: np.ndarray,
+        speakers: np.ndarray,
+        speaker_names: tuple[str, ...] = (),
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self._text = memoryview(text)
+        self._offsets = offsets  # absolute byte offsets into _text, len(self) + 1 of them
+        self.speakers = speakers
+        self.speaker_names = speaker_names
+
+    # ---- construction ----
+    @classmethod
+    def from_segments(cls, segments: Iterable[Any]) -> SegmentTable:
+        """From Segment-like objects or dicts with start/end/text[/speaker]; blank text is skipped."""
+        b = SegmentTableBuilder()
+        for seg in segments:
+            get = seg.get if isinstance(seg, dict) else lambda k, d=None, s=seg: getattr(s, k, d)
+            text = get("text") or ""
+            if text.strip():
+                b.append(float(get("start", 0.0)), float(get("end", 0.0)), text, get("speaker"))
+        return b.build()
+
+    @classmethod
+    def empty(cls) -> SegmentTable:
+        return SegmentTableBuilder().build()
+
+    # ---- sequence protocol ----
+    def __len__(self) -> int:
+        return self.starts.shape[0]
+
+    @overload
+    def __getitem__(self, key: int) -> SegmentView: ...
+    @overload
+    def __getitem__(self, key: slice) -> SegmentTable: ...
+
+    def __getitem__(self, key: int | slice) -> SegmentView | SegmentTable:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("SegmentTable slices must be contiguous")
+            stop = max(start, stop)
+            return SegmentTable(
+                self.starts[start:stop],
+                self.ends[start:stop],
+                self._text,
+                self._offsets[start : stop + 1],
+                self.speakers[start:stop],
+                self.speaker_names,
+            )
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("segment index out of range")
+        return SegmentView(self, key)
+
+    def __iter__(self) -> Iterator[SegmentView]:
+        for i in range(len(self)):
+            yield SegmentView(self, i)
+
+    def between(self, t0: float, t1: float) -> SegmentTable:
+        """Rows overlapping [t0, t1), as a zero-copy slice (starts are sorted)."""
+        lo = int(np.searchsorted(self.ends, t0, side="right"))
+        hi = int(np.searchsorted(self.starts, t1, side="left"))
+        return self[lo:max(lo, hi)]
+
+    # ---- field access ----
+    def text_at(self, i: int) -> str:
+        return str(self._text[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+    def speaker_at(self, i: int) -> str | None:
+        code = int(self.speakers[i])
+        return None if code == _NO_SPEAKER else self.speaker_names[code]
+
+    def texts(self) -> list[str]:
+        offs = self._offsets.tolist()
+        buf = self._text
+        return [str(buf[a:b], "utf-8") for a, b in zip(offs, offs[1:])]
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.starts.nbytes
+            + self.ends.nbytes
+            + self.speakers.nbytes
+            + self._offsets.nbytes
+            + int(self._offsets[-1] - self._offsets[0] if len(self._offsets) else 0)
+        )
+
+    # ---- serialization ----
+    def full_text(self) -> str:
+        return " ".join(t for t in self.texts() if t)
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Plain dicts (the shape compact_endpoints returns); for small responses."""
+        return [seg.to_dict() for seg in self]
+
+    def to_json(self) -> str:
+        """JSON array of {start, end, text[, speaker]} built directly from the columns (NaN/inf -> null)."""
+        dumps = json.dumps
+        names = [dumps(n, ensure_ascii=False) for n in self.speaker_names]
+        parts = []
+        for s, e, t, c in zip(self.starts.tolist(), self.ends.tolist(), self.texts(), self.speakers.tolist()):
+            item = f'{{"start":{_json_number(s)},"end":{_json_number(e)},"text":{dumps(t, ensure_ascii=False)}'
+            if c != _NO_SPEAKER:
+                item += f',"speaker":{names[c]}'
+            parts.append(item + "}")
+        return "[" + ",".join(parts) + "]"
+
+    def to_srt(self, speakers: bool = False) -> str:
+        """SRT cues; with ``speakers`` each labelled cue is prefixed with ``[SPEAKER] ``."""
+        starts = _srt_stamps(self.starts)
+        ends = _srt_stamps(self.ends)
+        texts = self.texts()
+        if speakers:
+            prefixes = [f"[{n}] " for n in self.speaker_names]
+            texts = [
+                prefixes[c] + t if c != _NO_SPEAKER else t
+                for c, t in zip(self.speakers.tolist(), texts)
+            ]
+        blocks = [
+            f"{i}\n{a} --> {b}\n{t}\n"
+            for i, (a, b, t) in enumerate(zip(starts, ends, texts), 1)
+        ]
+        return "\n".join(blocks)
+
+
+def _json_number(x: float) -> str:
+    # float.__repr__ is what json.dumps emits for finite floats; NaN/inf are not valid JSON.
+    return float.__repr__(x) if math.isfinite(x) else "null"
+
+
+def _srt_stamps(seconds: np.ndarray) -> list[str]:
+    ms = np.rint(seconds * 1000.0).astype(np.int64)
+    h, ms = np.divmod(ms, 3_600_000)
+    m, ms = np.divmod(ms, 60_000)
+    s, ms = np.divmod(ms, 1000)
+    return [
+        f"{hh:02d}:{mm:02d}:{ss:02d},{xx:03d}"
+        for hh, mm, ss, xx in zip(h.tolist(), m.tolist(), s.tolist(), ms.tolist())
+    ]
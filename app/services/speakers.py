@@ -0,0 +1,159 @@
+# app/services/speakers.py
+"""
+Speaker labels for ASR segments from diarization turns.
+
+Each segment gets the label of the turn it overlaps the most. Ties go to the
+turn listed first, and a segment with no positive overlap gets ``None``.
+This is the rule the original nested loop in
+``FasterWhisperTranscriber.assign_speakers`` applied, in O(N x M) Python calls.
+
+Here the turns are indexed once, bucketed by length: every turn in a bucket
+is between half and all of the bucket's longest turn, ``span``. Within a
+bucket, sorted by start, the turns that can overlap a segment [s, e) form
+one contiguous range:
+
+* ``lo`` = first turn whose start is >= s - span (nothing earlier can reach s)
+* ``hi`` = first turn whose start is >= e
+
+Both bounds are binary searches. Turns in a bucket that start within ``span``
+of each other all overlap, so a range never holds many turns that miss the
+segment. One long turn, such as a background label over the whole file,
+therefore costs a single extra candidate per segment and does not drag in
+every later turn. Labelling is O((N + M) log M) plus roughly the overlap
+depth times the number of buckets per segment. Large inputs go through a
+vectorized NumPy path that expands the (segment, candidate) pairs in bounded
+chunks, computes the overlaps in one pass and picks the winner per segment
+with a lexsort.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections.abc import Sequence
+
+import numpy as np
+
+Turn = tuple[float, float, str]
+
+# Below this many segments + turns the pure-Python path is faster than NumPy setup.
+NUMPY_MIN_ITEMS = 512
+# Upper bound on (segment, candidate) pairs the NumPy path expands at once.
+MAX_PAIRS = 1 << 20
+
+
+class _TurnIndex:
+    __slots__ = ("order", "starts", "ends", "labels", "buckets")
+
+    def __init__(self, turns: Sequence[Turn]) -> None:
+        # Turns of zero or negative length can never have a positive overlap.
+        by_bucket: dict[int, list[int]] = {}
+        for i, (start, end, _) in enumerate(turns):
+            if end > start:
+                by_bucket.setdefault(math.frexp(end - start)[1], []).append(i)
+        self.order: list[int] = []  # original index, i.e. the tie-break rank
+        self.buckets: list[tuple[int, int, float]] = []  # (first, stop, span) into the flat lists
+        for key in sorted(by_bucket):
+            members = sorted(by_bucket[key], key=lambda i: turns[i][0])
+            span = max(turns[i][1] - turns[i][0] for i in members)
+            # A little slack so rounding in ``s - span`` cannot skip a turn that touches s.
+            span += span * 1e-9 + 1e-9
+            self.buckets.append((len(self.order), len(self.order) + len(members), span))
+            self.order += members
+        self.starts = [turns[i][0] for i in self.order]
+        self.ends = [turns[i][1] for i in self.order]
+        self.labels = [turns[i][2] for i in self.order]
+
+    def ranges(self, start: float, end: float) -> list[tuple[int, int]]:
+        starts = self.starts
+        return [
+            (bisect_left(starts, start - span, first, stop), bisect_left(starts, end, first, stop))
+            for first, stop, span in self.buckets
+        ]
+
+
+def _labels_python(spans: Sequence[tuple[float, float]], idx: _TurnIndex) -> list[str | None]:
+    out: list[str | None] = []
+    order, starts, ends, labels = idx.order, idx.starts, idx.ends, idx.labels
+    for s, e in spans:
+        best = None
+        best_overlap = 0.0
+        best_rank = -1
+        for lo, hi in idx.ranges(s, e):
+            for j in range(lo, hi):
+                ov = min(e, ends[j]) - max(s, starts[j])
+                if ov > best_overlap or (ov == best_overlap and best is not None and order[j] < best_rank):
+                    best_overlap = ov
+                    best = labels[j]
+                    best_rank = order[j]
+        out.append(best)
+    return out
+
+
+def _labels_numpy(spans: Sequence[tuple[float, float]], idx: _TurnIndex) -> list[str | None]:
+    n = len(spans)
+    out: list[str | None] = [None] * n
+    if not idx.buckets:
+        return out
+    seg = np.asarray(spans, dtype=np.float64).reshape(n, 2)
+    t_start = np.asarray(idx.starts, dtype=np.float64)
+    t_end = np.asarray(idx.ends, dtype=np.float64)
+    rank = np.asarray(idx.order, dtype=np.int64)
+    # One (lo, hi) column per bucket; rows are segments.
+    lo = np.empty((n, len(idx.buckets)), dtype=np.int64)
+    hi = np.empty_like(lo)
+    for c, (first, stop, span) in enumerate(idx.buckets):
+        starts = t_start[first:stop]
+        lo[:, c] = np.searchsorted(starts, seg[:, 0] - span, side="left") + first
+        hi[:, c] = np.searchsorted(starts, seg[:, 1], side="left") + first
+    counts = np.maximum(hi - lo, 0)
+    done = np.cumsum(counts.sum(axis=1))
+
+    a = 0
+    while a < n:
+        # Segments [a, b) expand to at most MAX_PAIRS pairs (or one segment if it alone is more).
+        base = done[a - 1] if a else 0
+        b = max(int(np.searchsorted(done, base + MAX_PAIRS, side="right")), a + 1)
+        _pick(seg, t_start, t_end, rank, idx.labels, a, len(idx.buckets), lo[a:b].ravel(), counts[a:b].ravel(), out)
+        a = b
+    return out
+
+
+def _pick(seg, t_start, t_end, rank, labels, first_seg, n_buckets, lo, counts, out) -> None:
+    """Label the segments behind flattened (segment, bucket) candidate ranges."""
+    total = int(counts.sum())
+    if total == 0:
+        return
+    # Expand to one row per (segment, candidate turn) pair.
+    pair_row = np.repeat(np.arange(counts.size), counts)
+    first = np.cumsum(counts) - counts
+    pair_turn = np.arange(total) - np.repeat(first, counts) + np.repeat(lo, counts)
+    pair_seg = pair_row // n_buckets + first_seg
+    ov = np.minimum(seg[pair_seg, 1], t_end[pair_turn]) - np.maximum(seg[pair_seg, 0], t_start[pair_turn])
+
+    keep = ov > 0.0
+    pair_seg, pair_turn, ov = pair_seg[keep], pair_turn[keep], ov[keep]
+    if pair_seg.size == 0:
+        return
+    # Per segment: largest overlap first, then the earliest turn in the input list.
+    sel = np.lexsort((rank[pair_turn], -ov, pair_seg))
+    pair_seg, pair_turn = pair_seg[sel], pair_turn[sel]
+    head = np.ones(pair_seg.size, dtype=bool)
+    head[1:] = pair_seg[1:] != pair_seg[:-1]
+    for i, j in zip(pair_seg[head].tolist(), pair_turn[head].tolist()):
+        out[i] = labels[j]
+
+
+def speaker_labels(
+    spans: Sequence[tuple[float, float]],
+    turns: Sequence[Turn],
+    *,
+    use_numpy: bool | None = None,
+) -> list[str | None]:
+    """Label of the most-overlapping turn for each (start, end) span, or None."""
+    if not turns or not spans:
+        return [None] * len(spans)
+    idx = _TurnIndex(turns)
+    if use_numpy is None:
+        use_numpy = len(spans) + len(turns) >= NUMPY_MIN_ITEMS
+    return _labels_numpy(spans, idx) if use_numpy else _labels_python(spans, idx)
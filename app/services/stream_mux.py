@@ -0,0 +1,244 @@
+# app/services/stream_mux.py
+"""
+Shared batched decoder for concurrent live streams.
+
+Instead of every WebSocket session calling the model on its own, each
+session's :class:`~app.services.streaming.StreamingRecognizer` hands its
+decode window to the multiplexer and waits for the result. A single
+scheduler thread wakes every ``tick_ms`` and decodes all windows queued
+since the previous tick in batches of up to ``max_batch``. The results go
+back through per-window futures, so each hypothesis reaches the recognizer,
+and from there the socket, that asked for it.
+
+Admission control keeps live captions within the latency SLO. A new stream
+is refused (and the socket closed with 1013 "try again later") when the
+measured submit-to-result latency already exceeds ``latency_slo_ms``, when
+the projected latency with one more stream would, or when ``max_streams``
+sessions are active. The latency gauges only gate admission while they are
+fresh: once no stream is active or nothing has been decoded for
+``_STALE_S`` seconds they are reset, so one slow decode (a lazy model load,
+say) cannot keep refusing streams on an idle server.
+
+Knobs (app/config.Settings): ASR_STREAM_MUX_ENABLED, ASR_STREAM_TICK_MS,
+ASR_STREAM_MAX_BATCH, ASR_STREAM_LATENCY_SLO_MS, ASR_STREAM_MAX_STREAMS.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.batching import BatchResult, get_batch_scheduler
+from app.services.model_registry import ModelKey, default_model_key
+from app.services.streaming import DecodeFn, Word
+
+log = logging.getLogger(__name__)
+
+# (audios, languages) -> one BatchResult per audio, decoded together
+BatchDecodeFn = Callable[[list[np.ndarray], "list[str | None]"], "list[BatchResult]"]
+
+# Exponential moving average weight for the latency and batch-time gauges.
+_ALPHA = 0.2
+# Gauges older than this no longer describe the current load.
+_STALE_S = 10.0
+
+
+@dataclasses.dataclass
+class _Window:
+    audio: np.ndarray
+    language: str | None
+    future: concurrent.futures.Future
+    enqueued: float
+
+
+def _whisper_batch_decoder(key: ModelKey) -> BatchDecodeFn:
+    def decode(audios: list[np.ndarray], languages: list[str | None]) -> list[BatchResult]:
+        return get_batch_scheduler(key).decode_many(
+            audios,
+            languages,
+            beam_size=1,
+            temperature=0.0,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+        )
+
+    return decode
+
+
+class StreamSession:
+    """One admitted stream; ``decode`` plugs into StreamingRecognizer."""
+
+    def __init__(self, mux: StreamMultiplexer) -> None:
+        self._mux = mux
+        self._closed = False
+
+    def decode(self, audio: np.ndarray, language: str | None, prompt: str) -> tuple[str | None, list[Word]]:
+        # Per-stream prompts would split every batch, so they are not sent.
+        result = self._mux.submit(audio, language).result()
+        words = [
+            Word(w.start, w.end, w.word)
+            for seg in result.segments
+            for w in (getattr(seg, "words", None) or [])
+        ]
+        return result.language, words
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._mux._leave()
+
+    def __enter__(self) -> StreamSession:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class StreamMultiplexer:
+    def __init__(
+        self,
+        key: ModelKey | None = None,
+        tick_ms: float = 200.0,
+        max_batch: int = 16,
+        latency_slo_ms: float = 1500.0,
+        max_streams: int = 64,
+        step_s: float = 1.0,
+        decode_batch: BatchDecodeFn | None = None,
+    ) -> None:
+        self.tick = max(1.0, tick_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.latency_slo = latency_slo_ms / 1000.0
+        self.max_streams = max_streams
+        self.step_s = step_s
+        self._decode_batch = decode_batch or _whisper_batch_decoder(key or default_model_key())
+        self._lock = threading.Lock()
+        self._queue: list[_Window] = []
+        self._thread: threading.Thread | None = None
+        self._active = 0
+        self.rejected = 0
+        self.ticks = 0
+        self.windows = 0
+        self.latency_ewma = 0.0  # submit -> result, seconds
+        self.batch_ewma = 0.0  # wall time of one batched decode, seconds
+        self._last_sample = 0.0  # monotonic time the gauges were last updated
+
+    # ---- sessions / admission control ----
+    def projected_latency(self, streams: int) -> float:
+        """Expected window latency with ``streams`` active: half a tick plus the batches ahead."""
+        per_tick = streams * self.tick / self.step_s
+        return self.tick / 2 + self.batch_ewma * max(1, math.ceil(per_tick / self.max_batch))
+
+    def admit(self) -> StreamSession | None:
+        with self._lock:
+            idle = not self._queue and (
+                self._active == 0 or time.monotonic() - self._last_sample > _STALE_S
+            )
+            if idle:
+                # Nothing in flight to refresh the gauges: start from a clean slate.
+                self.latency_ewma = self.batch_ewma = 0.0
+            over = (
+                self._active >= self.max_streams
+                or self.latency_ewma > self.latency_slo
+                or (self.batch_ewma and self.projected_latency(self._active + 1) > self.latency_slo)
+            )
+            if over:
+                self.rejected += 1
+                return None
+            self._active += 1
+        return StreamSession(self)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._active = max(0, self._active - 1)
+
+    # ---- decode path ----
+    def submit(self, audio: np.ndarray, language: str | None) -> concurrent.futures.Future:
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            self._ensure_thread()
+            # Copy: the caller's ring buffer may be compacted while we wait for the tick.
+            self._queue.append(_Window(np.array(audio, copy=True), language, fut, time.monotonic()))
+        return fut
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="asr-stream-mux", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while True:
+            next_tick += self.tick
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()  # fell behind; don't try to catch up
+            with self._lock:
+                windows, self._queue = self._queue, []
+            if windows:
+                self._run_tick(windows)
+
+    def _run_tick(self, windows: list[_Window]) -> None:
+        self.ticks += 1
+        for i in range(0, len(windows), self.max_batch):
+            batch = windows[i : i + self.max_batch]
+            started = time.monotonic()
+            try:
+                results = self._decode_batch([w.audio for w in batch], [w.language for w in batch])
+            except Exception as e:
+                log.exception("Stream batch decode failed")
+                for w in batch:
+                    w.future.set_exception(e)
+                continue
+            done = time.monotonic()
+            self.batch_ewma += _ALPHA * ((done - started) - self.batch_ewma)
+            for w, res in zip(batch, results):
+                self.latency_ewma += _ALPHA * ((done - w.enqueued) - self.latency_ewma)
+                w.future.set_result(res)
+            self._last_sample = done
+            self.windows += len(batch)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            active, queued = self._active, len(self._queue)
+        return {
+            "active_streams": active,
+            "queued_windows": queued,
+            "rejected": self.rejected,
+            "ticks": self.ticks,
+            "windows": self.windows,
+            "latency_ms": round(self.latency_ewma * 1000.0, 1),
+            "batch_ms": round(self.batch_ewma * 1000.0, 1),
+            "slo_ms": self.latency_slo * 1000.0,
+        }
+
+
+_mux: StreamMultiplexer | None = None
+_mux_lock = threading.Lock()
+
+
+def get_stream_mux() -> StreamMultiplexer | None:
+    """Process-wide multiplexer, or None when ASR_STREAM_MUX_ENABLED is off."""
+    global _mux
+    settings = get_settings()
+    if not settings.asr_stream_mux_enabled:
+        return None
+    with _mux_lock:
+        if _mux is None:
+            _mux = StreamMultiplexer(
+                tick_ms=settings.asr_stream_tick_ms,
+                max_batch=settings.asr_stream_max_batch,
+                latency_slo_ms=settings.asr_stream_latency_slo_ms,
+                max_streams=settings.asr_stream_max_streams,
+            )
+        return _mux
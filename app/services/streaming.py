@@ -0,0 +1,337 @@
+# app/services/streaming.py
+"""
+Incremental speech recognizer for live WebSocket streams.
+
+Each connection owns a :class:`StreamingRecognizer` holding its audio in a
+bounded PCM ring buffer. Every ``step_s`` of new audio the buffer is checked
+with VAD; when it contains speech the unconfirmed window is decoded again.
+Words are committed with local agreement: only the prefix on which two
+consecutive decodes agree becomes stable and is sent as a partial. A final
+segment is emitted when the speaker pauses, a sentence ends, or the window
+reaches ``window_s``, and its audio is dropped from the buffer. That keeps
+every decode (and so CPU per stream) bounded by the window length. VAD only
+runs over the audio that arrived since the last step (plus a short
+context); the speech spans found so far are kept in stream time.
+
+The recognizer keeps the ``feed(bytes)`` / ``flush()`` coroutine interface of
+the old placeholder streamer. Each call returns segment dicts
+(``id, text, start, end, final``). The sync core runs on a dedicated pool with
+one thread per admissible stream (ASR_STREAM_MAX_STREAMS), not on the event
+loop's default executor. A step waiting for its multiplexed decode then never
+queues behind other streams outside what the mux's admission control measures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.model_registry import ModelKey, default_model_key, get_model_registry
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Audio before the new samples that VAD sees again, so speech across a step boundary is not split.
+VAD_CONTEXT_S = 0.5
+# Spans closer than this are one span (silero_vad's min_silence_duration_ms).
+VAD_MERGE_GAP_S = 0.3
+
+
+class Word(NamedTuple):
+    start: float
+    end: float
+    text: str
+
+
+# (audio, language, prompt) -> (language, words with buffer-relative times)
+DecodeFn = Callable[[np.ndarray, "str | None", str], "tuple[str | None, list[Word]]"]
+# audio -> speech spans as sample offsets
+VadFn = Callable[[np.ndarray], "list[tuple[int, int]]"]
+
+
+class PcmRing:
+    """Fixed-capacity float32 buffer; appending past capacity drops the oldest samples."""
+
+    def __init__(self, capacity: int) -> None:
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        return self._buf.shape[0]
+
+    def append(self, samples: np.ndarray) -> int:
+        """Add samples; returns how many old samples were dropped to make room."""
+        cap = self.capacity
+        n = samples.shape[0]
+        if n >= cap:
+            dropped = len(self) + n - cap
+            self._buf[:] = samples[-cap:]
+            self._start, self._end = 0, cap
+            return dropped
+        dropped = max(0, len(self) + n - cap)
+        self._start += dropped
+        if self._end + n > cap:
+            live = len(self)
+            self._buf[:live] = self._buf[self._start : self._end]
+            self._start, self._end = 0, live
+        self._buf[self._end : self._end + n] = samples
+        self._end += n
+        return dropped
+
+    def view(self) -> np.ndarray:
+        return self._buf[self._start : self._end]
+
+    def drop(self, n: int) -> None:
+        self._start += max(0, min(n, len(self)))
+        if self._start == self._end:
+            self._start = self._end = 0
+
+
+def whisper_decoder(key: ModelKey | None = None) -> DecodeFn:
+    """Greedy word-timestamped decode through the shared model registry."""
+    key = key or default_model_key()
+
+    def decode(audio: np.ndarray, language: str | None, prompt: str) -> tuple[str | None, list[Word]]:
+        with get_model_registry().lease(key) as model:
+            segments, info = model.transcribe(
+                audio,
+                language=language,
+                beam_size=1,
+                temperature=0.0,
+                word_timestamps=True,
+                condition_on_previous_text=False,
+                initial_prompt=prompt or None,
+                vad_filter=False,
+            )
+            words = [Word(w.start, w.end, w.word) for s in segments for w in (s.words or [])]
+        return info.language, words
+
+    return decode
+
+
+def silero_vad(audio: np.ndarray) -> list[tuple[int, int]]:
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    spans = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=300))
+    return [(int(s["start"]), int(s["end"])) for s in spans]
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _stream_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, get_settings().asr_stream_max_streams),
+                thread_name_prefix="asr-stream",
+            )
+        return _executor
+
+
+_NORM = re.compile(r"[^\w']+")
+_SENTENCE_END = re.compile(r"[.?!…。？！]\s*$")
+
+
+def _norm(text: str) -> str:
+    return _NORM.sub("", text.lower())
+
+
+def _agreed(prev: list[Word], cur: list[Word]) -> int:
+    """Length of the common prefix of two hypotheses (compared by normalised text)."""
+    n = 0
+    for a, b in zip(prev, cur):
+        if _norm(a.text) != _norm(b.text):
+            break
+        n += 1
+    return n
+
+
+def _join(words: list[Word]) -> str:
+    return "".join(w.text for w in words).strip()
+
+
+class StreamingRecognizer:
+    def __init__(
+        self,
+        language: str | None = None,
+        *,
+        decode: DecodeFn | None = None,
+        vad: VadFn | None = None,
+        sample_rate: int = SAMPLE_RATE,
+        step_s: float = 1.0,
+        window_s: float = 20.0,
+        end_silence_s: float = 0.6,
+        prompt_chars: int = 200,
+    ) -> None:
+        self.language = language
+        self.sample_rate = sample_rate
+        self.window_s = window_s
+        self.end_silence_s = end_silence_s
+        self.prompt_chars = prompt_chars
+        self._decode = decode or whisper_decoder()
+        self._vad = vad or silero_vad
+        self._step = int(step_s * sample_rate)
+        # A little headroom over the window so a forced commit never loses audio.
+        self._ring = PcmRing(int((window_s + 2 * step_s) * sample_rate))
+        self._offset = 0.0  # stream time (s) of the first sample in the ring
+        self._total = 0  # samples received so far
+        self._vad_done = 0  # VAD has seen samples [.., _vad_done)
+        self._speech: list[tuple[int, int]] = []  # speech spans in stream samples
+        self._since_decode = 0
+        self._odd_byte = b""
+        self._committed: list[Word] = []  # agreed, not yet finalised
+        self._tail: list[Word] = []  # latest unconfirmed hypothesis
+        self._history = ""  # finalised text, used as the decoder prompt
+        self._utt_id = str(uuid.uuid4())
+        self.decodes = 0
+
+    # ---- async interface used by the WebSocket handlers ----
+    async def feed(self, pcm_bytes: bytes) -> list[dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(_stream_executor(), self.feed_sync, pcm_bytes)
+
+    async def flush(self) -> list[dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(_stream_executor(), self.flush_sync)
+
+    # ---- sync core ----
+    def feed_sync(self, pcm_bytes: bytes) -> list[dict[str, Any]]:
+        """Append 16-bit little-endian mono PCM; decodes at most once per ``step_s``."""
+        data = self._odd_byte + pcm_bytes
+        if len(data) % 2:
+            data, self._odd_byte = data[:-1], data[-1:]
+        else:
+            self._odd_byte = b""
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        return self.feed_samples(samples)
+
+    def feed_samples(self, samples: np.ndarray) -> list[dict[str, Any]]:
+        dropped = self._ring.append(samples)
+        self._total += samples.shape[0]
+        if dropped:
+            self._offset += dropped / self.sample_rate
+        self._since_decode += samples.shape[0]
+        if self._since_decode < self._step:
+            return []
+        self._since_decode = 0
+        return self._process(final=False)
+
+    def flush_sync(self) -> list[dict[str, Any]]:
+        """Decode whatever is buffered and finalise it (end of stream)."""
+        self._since_decode = 0
+        if not len(self._ring):
+            return self._finalize(len(self._committed) + len(self._tail))
+        return self._process(final=True)
+
+    # ---- internals ----
+    @property
+    def _committed_end(self) -> float:
+        return self._committed[-1].end if self._committed else self._offset
+
+    def _run_decode(self, audio: np.ndarray) -> list[Word]:
+        language, words = self._decode(audio, self.language, self._history[-self.prompt_chars :])
+        self.decodes += 1
+        if self.language is None and language:
+            self.language = language  # lock in the detected language for later windows
+        shifted = [Word(w.start + self._offset, w.end + self._offset, w.text) for w in words]
+        # Words already committed are decoded again; keep only what follows them.
+        cut = self._committed_end
+        return [w for w in shifted if (w.start + w.end) / 2 > cut + 1e-3]
+
+    def _speech_spans(self, audio: np.ndarray) -> list[tuple[int, int]]:
+        """Speech in the ring (offsets into ``audio``), running VAD on the new samples only."""
+        ring_start = self._total - audio.shape[0]
+        frm = max(ring_start, self._vad_done - int(VAD_CONTEXT_S * self.sample_rate))
+        found = [(s + frm, e + frm) for s, e in self._vad(audio[frm - ring_start :])]
+        # Earlier results stand up to where this pass starts; it decides the rest.
+        spans = [(s, min(e, frm)) for s, e in self._speech if s < frm and e > ring_start]
+        gap = int(VAD_MERGE_GAP_S * self.sample_rate)
+        for s, e in found:
+            if spans and s - spans[-1][1] < gap:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], e))
+            else:
+                spans.append((s, e))
+        self._speech = spans
+        self._vad_done = self._total
+        return [(max(s, ring_start) - ring_start, e - ring_start) for s, e in spans]
+
+    def _process(self, final: bool) -> list[dict[str, Any]]:
+        audio = self._ring.view()
+        spans = self._speech_spans(audio)
+        if not spans:
+            # Silence only: close any open utterance and keep just the last step.
+            keep_from = self._offset + max(0, len(audio) - self._step) / self.sample_rate
+            out = self._finalize(len(self._committed) + len(self._tail))
+            self._drop_until(keep_from)
+            return out
+
+        words = self._run_decode(audio)
+        trailing_silence = (len(audio) - spans[-1][1]) / self.sample_rate
+        if final or trailing_silence >= self.end_silence_s:
+            # Pause (or end of stream): the whole hypothesis becomes final.
+            speech_end = self._offset + spans[-1][1] / self.sample_rate
+            self._tail = words
+            out = self._finalize(len(self._committed) + len(self._tail))
+            self._drop_until(speech_end)
+            return out
+
+        n = _agreed(self._tail, words)
+        self._committed.extend(words[:n])
+        self._tail = words[n:]
+
+        out: list[dict[str, Any]] = []
+        sentence_ends = [i for i, w in enumerate(self._committed) if _SENTENCE_END.search(w.text)]
+        if sentence_ends:
+            out += self._finalize(sentence_ends[-1] + 1)
+        elif len(audio) / self.sample_rate >= self.window_s:
+            # Window full without a pause: commit what we have to bound the decode cost.
+            out += self._finalize(len(self._committed) or len(self._tail))
+        if n and self._committed:
+            out.append(self._segment(self._committed, final=False))
+        return out
+
+    def _finalize(self, n: int) -> list[dict[str, Any]]:
+        """Emit the first ``n`` pending words (committed, then tail) as a final segment."""
+        pending = self._committed + self._tail
+        words, rest = pending[:n], pending[n:]
+        keep_committed = max(0, len(self._committed) - n)
+        self._committed, self._tail = rest[:keep_committed], rest[keep_committed:]
+        if not words:
+            return []
+        seg = self._segment(words, final=True)
+        self._history = (self._history + " " + seg["text"]).strip()
+        self._utt_id = str(uuid.uuid4())
+        self._drop_until(words[-1].end)
+        return [seg]
+
+    def _segment(self, words: list[Word], final: bool) -> dict[str, Any]:
+        return {
+            "id": self._utt_id,
+            "text": _join(words),
+            "start": round(words[0].start, 3),
+            "end": round(words[-1].end, 3) if final else None,
+            "final": final,
+        }
+
+    def _drop_until(self, t: float) -> None:
+        self._drop_samples(int(round((t - self._offset) * self.sample_rate)))
+
+    def _drop_samples(self, n: int) -> None:
+        n = max(0, min(n, len(self._ring)))
+        self._ring.drop(n)
+        self._offset += n / self.sample_rate
@@ -1,8 +1,23 @@
 # app/services/transcription.py
 from __future__ import annotations
 
+import concurrent.futures
 import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+from app.services import fast_diarizer
+from app.services.audio import DecodedAudio, decode_audio
+from app.services.decode_profiles import DecodeProfile
+from app.services.model_registry import ModelKey, cpu_compute_type, get_model_registry
+from app.services.segment_table import SegmentTable, SegmentTableBuilder
+from app.services.speakers import speaker_labels
+from app.services.tuning import default_beam_size
+from app.services.vad import run_prepass
 
 # (optional) repeat guards here in case this module is imported first by tests
 os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
@@ -16,8 +31,26 @@ except Exception:
     PyannotePipeline = None  # type: ignore
     _HAS_PYANNOTE = False
 
+# (start, end, text) for each decoded segment
+RowSink = Callable[[float, float, str], None]
+
+_diarize_pool: concurrent.futures.ThreadPoolExecutor | None = None
+_diarize_pool_lock = threading.Lock()
+
+
+def _get_diarize_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Threads for diarization, kept apart from the ASR executor so the two overlap."""
+    global _diarize_pool
+    with _diarize_pool_lock:
+        if _diarize_pool is None:
+            _diarize_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, get_settings().asr_diarize_workers),
+                thread_name_prefix="diarize",
+            )
+        return _diarize_pool
 
-@dataclass
+
+@dataclass(slots=True)
 class Segment:
     start: float
     end: float
@@ -28,32 +61,40 @@ class Segment:
 class FasterWhisperTranscriber:
     """
     Transcription via faster-whisper (CTranslate2).
-    Optional diarization via pyannote.audio when available.
+    Optional diarization via pyannote.audio, or the librosa-based fast
+    diarizer (app/services/fast_diarizer.py); see ASR_DIARIZER.
     """
 
     def __init__(
         self, model_name: str = "base", compute_type: str | None = None
     ) -> None:
         self.model_name = model_name
-        # Safe CPU defaults on Windows. If you ever add a GPU, change device="cuda".
-        self.compute_type = compute_type or "int8"
-        self._model = None
+        self._compute_type = compute_type
         self._dia = None
+        self._dia_lock = threading.Lock()
 
-    def _ensure_model(self):
-        if self._model is None:
-            from faster_whisper import WhisperModel  # lazy import
+    @property
+    def compute_type(self) -> str:
+        # Resolved per call, like the app's default key, so both share one registry entry
+        # and a tuned profile saved after startup is picked up.
+        return self._compute_type or cpu_compute_type()
 
-            # 🔒 Explicit CPU to avoid any CUDA/cudnn DLL loading
-            self._model = WhisperModel(
-                self.model_name, device="cpu", compute_type=self.compute_type
-            )
-        return self._model
+    def _model_key(self, model_name: str | None = None) -> ModelKey:
+        # 🔒 Explicit CPU to avoid any CUDA/cudnn DLL loading
+        return ModelKey(model_name or self.model_name, "cpu", self.compute_type)
+
+    @contextmanager
+    def _ensure_model(self, model_name: str | None = None) -> Iterator[Any]:
+        """Borrow the shared model (or a profile's ``model_name``) from the process-wide registry."""
+        with get_model_registry().lease(self._model_key(model_name)) as model:
+            yield model
 
     def _ensure_diarizer(self):
         if not _HAS_PYANNOTE:
             return None
-        if self._dia is None:
+        with self._dia_lock:
+            if self._dia is not None:
+                return self._dia
             checkpoint = os.getenv(
                 "PYANNOTE_PIPELINE", "pyannote/speaker-diarization-3.1"
             )
@@ -64,48 +105,201 @@ class FasterWhisperTranscriber:
 
     def transcribe(
         self,
-        audio_path: str,
+        audio: str | DecodedAudio,
         language: str | None = None,
         vad: bool = False,
+        long_audio: bool | None = None,
+        profile: DecodeProfile | None = None,
     ) -> tuple[str, list[Segment]]:
-        model = self._ensure_model()
-        segments_it, info = model.transcribe(
-            audio=audio_path,
-            language=language,
-            vad_filter=vad,
-            vad_parameters={"min_silence_duration_ms": 500},
-        )
-        lang = info.language or (language or "unknown")
-        segments = [Segment(start=s.start, end=s.end, text=s.text) for s in segments_it]
-        return lang, segments
-
-    def diarize(self, audio_path: str) -> list[tuple[float, float, str]]:
-        dia = self._ensure_diarizer()
-        if dia is None:
-            return []
-        ann = dia(audio_path)
-        return [
-            (float(seg.start), float(seg.end), str(label))
-            for seg, label in ann.itertracks(yield_label=True)
-        ]
+        """
+        Transcribe a file path or already-decoded audio. ``long_audio`` forces
+        (True) or disables (False) the parallel chunked mode; by default it
+        kicks in for recordings longer than ASR_LONG_AUDIO_THRESHOLD_S when
+        ASR_LONG_AUDIO_WORKERS > 1. ``profile`` picks the model size and
+        decoding parameters (app/services/decode_profiles.py).
+
+        With ASR_VAD_PREPASS, recordings without speech return no segments
+        without touching a model, and only the speech is decoded.
+        """
+        lang, rows = self._transcribe_rows(audio, language, vad, long_audio, profile)
+        return lang, [Segment(start=a, end=b, text=t) for a, b, t in rows]
+
+    def transcribe_table(
+        self,
+        audio: str | DecodedAudio,
+        language: str | None = None,
+        vad: bool = False,
+        long_audio: bool | None = None,
+        profile: DecodeProfile | None = None,
+    ) -> tuple[str, SegmentTable]:
+        """
+        Like :meth:`transcribe`, but packs segments into a SegmentTable as
+        Whisper yields them, so no per-segment objects are kept. The
+        long-audio path stitches its chunks first and is packed afterwards.
+        """
+        table = SegmentTableBuilder()
+
+        def add(a: float, b: float, t: str) -> None:
+            if t.strip():
+                table.append(a, b, t)
+
+        lang, rows = self._transcribe_rows(audio, language, vad, long_audio, profile, sink=add)
+        for row in rows:
+            add(*row)
+        return lang, table.build()
 
-    @staticmethod
-    def _overlap(a_start: float, a_end: float, b_start: float, b_end: float) -> float:
-        return max(0.0, min(a_end, b_end) - max(a_start, b_start))
+    def _transcribe_rows(
+        self,
+        audio: str | DecodedAudio,
+        language: str | None,
+        vad: bool,
+        long_audio: bool | None,
+        profile: DecodeProfile | None = None,
+        sink: RowSink | None = None,
+    ) -> tuple[str, Iterable[tuple[float, float, str]]]:
+        if isinstance(audio, DecodedAudio):
+            prep = run_prepass(None, audio.samples)
+        else:
+            prep = run_prepass(audio)
+        if prep is not None:
+            if prep.silent:
+                return language or "unknown", []
+            audio = DecodedAudio(prep.samples)
+            off = prep.offset
+            shifted = (lambda a, b, t: sink(a + off, b + off, t)) if sink is not None else None
+            lang, rows = self._decode_rows(
+                audio, language, vad, long_audio, profile, prep.clip_seconds(), prep.spans(), shifted
+            )
+            return lang, [(a + off, b + off, t) for a, b, t in rows]
+        return self._decode_rows(audio, language, vad, long_audio, profile, sink=sink)
+
+    def _decode_rows(
+        self,
+        audio: str | DecodedAudio,
+        language: str | None,
+        vad: bool,
+        long_audio: bool | None,
+        profile: DecodeProfile | None = None,
+        clip_timestamps: list[float] | None = None,
+        spans: list[tuple[int, int]] | None = None,
+        sink: RowSink | None = None,
+    ) -> tuple[str, Iterable[tuple[float, float, str]]]:
+        """(language, rows); with ``sink``, directly decoded rows go to it instead and rows is empty."""
+        model_name = profile.model_size if profile else None
+        settings = get_settings()
+        if long_audio is None:
+            long_audio = settings.asr_long_audio_workers > 1
+            if long_audio:
+                if not isinstance(audio, DecodedAudio):
+                    audio = decode_audio(audio)
+                long_audio = audio.duration > settings.asr_long_audio_threshold_s
+        if long_audio:
+            from app.services.long_audio import transcribe_parallel
+
+            if not isinstance(audio, DecodedAudio):
+                audio = decode_audio(audio)
+            return transcribe_parallel(
+                audio.samples,
+                model_name or self.model_name,
+                self.compute_type,
+                workers=max(2, settings.asr_long_audio_workers),
+                max_chunk_s=settings.asr_long_audio_chunk_s,
+                language=language,
+                spans=spans,
+                # Chunks are cut at speech boundaries already, so the profile's VAD is dropped.
+                **(profile.options(vad=False) if profile is not None else {}),
+            )
+
+        if profile is not None:
+            options = profile.options()
+            if vad and "vad_filter" not in options:
+                options.update(vad_filter=True, vad_parameters={"min_silence_duration_ms": 500})
+        else:
+            options = {
+                "beam_size": default_beam_size(),
+                "vad_filter": vad,
+                "vad_parameters": {"min_silence_duration_ms": 500},
+            }
+        if clip_timestamps:
+            # Speech regions are known already; Whisper seeks through them instead of running VAD.
+            options = {k: v for k, v in options.items() if not k.startswith("vad_")}
+            options["clip_timestamps"] = clip_timestamps
+        with self._ensure_model(model_name) as model:
+            segments_it, info = model.transcribe(
+                audio=audio.samples if isinstance(audio, DecodedAudio) else audio,
+                language=language,
+                **options,
+            )
+            lang = info.language or (language or "unknown")
+            # Decode while the lease is held; only the three fields are kept.
+            if sink is not None:
+                for seg in segments_it:
+                    sink(seg.start, seg.end, seg.text)
+                rows = []
+            else:
+                rows = [(s.start, s.end, s.text) for s in segments_it]
+        return lang, rows
+
+    def transcribe_with_speakers(
+        self,
+        audio: str | DecodedAudio,
+        language: str | None = None,
+        vad: bool = False,
+        num_speakers: int | None = None,
+        profile: DecodeProfile | None = None,
+    ) -> tuple[str, list[Segment]]:
+        """
+        Transcribe and label speakers in one pass. The audio is decoded once;
+        diarization runs on its own pool while Whisper runs on the calling
+        thread, so wall time is roughly max(ASR, diarization) instead of the sum.
+        """
+        if not isinstance(audio, DecodedAudio):
+            audio = decode_audio(audio)
+        turns_f = _get_diarize_pool().submit(self.diarize, audio, num_speakers)
+        try:
+            lang, segments = self.transcribe(audio, language=language, vad=vad, profile=profile)
+        except BaseException:
+            turns_f.cancel()
+            raise
+        return lang, self.assign_speakers(segments, turns_f.result())
+
+    def diarize(
+        self, audio: str | DecodedAudio, num_speakers: int | None = None
+    ) -> list[tuple[float, float, str]]:
+        """
+        Speaker turns via the ASR_DIARIZER backend; ``num_speakers`` (or
+        ASR_DIARIZER_SPEAKERS) is a hint. Returns [] when no backend is usable.
+        """
+        settings = get_settings()
+        backend = settings.asr_diarizer.lower()
+        num_speakers = num_speakers or settings.asr_diarizer_speakers or None
+        if backend == "off":
+            return []
+        if backend in ("auto", "pyannote"):
+            dia = self._ensure_diarizer()
+            if dia is not None:
+                kwargs = {"num_speakers": num_speakers} if num_speakers else {}
+                ann = dia(audio.pyannote_input() if isinstance(audio, DecodedAudio) else audio, **kwargs)
+                return [
+                    (float(seg.start), float(seg.end), str(label))
+                    for seg, label in ann.itertracks(yield_label=True)
+                ]
+            if backend == "pyannote":
+                return []
+        if not fast_diarizer.available():
+            return []
+        if not isinstance(audio, DecodedAudio):
+            audio = decode_audio(audio)
+        return fast_diarizer.get_fast_diarizer()(audio, num_speakers=num_speakers)
 
     def assign_speakers(
         self, segments: list[Segment], turns: list[tuple[float, float, str]]
     ) -> list[Segment]:
+        """Label each segment with its most-overlapping turn (see app/services/speakers.py)."""
         if not turns:
             return segments
-        out: list[Segment] = []
-        for s in segments:
-            best = None
-            best_overlap = 0.0
-            for ts, te, lab in turns:
-                ov = self._overlap(s.start, s.end, ts, te)
-                if ov > best_overlap:
-                    best_overlap = ov
-                    best = lab
-            out.append(Segment(start=s.start, end=s.end, text=s.text, speaker=best))
-        return out
+        labels = speaker_labels([(s.start, s.end) for s in segments], turns)
+        return [
+            Segment(start=s.start, end=s.end, text=s.text, speaker=lab)
+            for s, lab in zip(segments, labels)
+        ]
@@ -0,0 +1,113 @@
+# app/services/tuning.py
+"""
+Tuned CPU inference profile.
+
+``scripts/calibrate_asr.py`` runs the bundled sample under a grid of
+(compute_type, cpu_threads, num_workers, beam_size) values on the deploy box
+and writes the fastest setting whose transcript still agrees with the most
+accurate one to ASR_TUNED_PROFILE (JSON). At startup the profile is read
+once and applied:
+
+* the model registry passes ``cpu_threads`` / ``num_workers`` to
+  ``WhisperModel``, which covers asgi_dev's ``_load_model_if_needed`` and
+  ``FasterWhisperTranscriber._ensure_model`` alike;
+* ``pick_device_and_compute`` uses its ``compute_type`` on CPU unless
+  WHISPER_COMPUTE is set;
+* decode paths use :func:`default_beam_size` instead of a fixed 5.
+
+Without a profile file, behaviour is unchanged (CTranslate2 defaults, int8,
+beam 5).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from app.config import get_settings
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BEAM_SIZE = 5
+
+
+@dataclasses.dataclass(frozen=True)
+class TunedProfile:
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    beam_size: int
+    model_size: str | None = None
+    rtf: float | None = None  # wall time / audio time, all workers busy
+    peak_rss_mb: float | None = None
+    cpu_count: int | None = None  # cores on the box it was calibrated on
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TunedProfile:
+        names = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def save_tuned_profile(profile: TunedProfile, path: str | os.PathLike[str]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(profile.to_dict(), indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_profile: TunedProfile | None = None
+_profile_loaded = False
+_profile_lock = threading.Lock()
+
+
+def get_tuned_profile() -> TunedProfile | None:
+    """The profile at ASR_TUNED_PROFILE, read once per process; None if absent or unreadable."""
+    global _profile, _profile_loaded
+    with _profile_lock:
+        if _profile_loaded:
+            return _profile
+        _profile_loaded = True
+        path = get_settings().asr_tuned_profile
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                _profile = TunedProfile.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            log.warning("Ignoring unreadable tuned profile %s: %s", path, e)
+            return None
+        cores = os.cpu_count()
+        if _profile.cpu_count and cores and _profile.cpu_count != cores:
+            log.warning(
+                "Tuned profile %s was calibrated on %d cores, this box has %d; re-run calibrate_asr.py",
+                path, _profile.cpu_count, cores,
+            )
+        log.info("Using tuned ASR profile %s: %s", path, _profile)
+        return _profile
+
+
+def model_kwargs(device: str) -> dict[str, Any]:
+    """Extra ``WhisperModel`` arguments from the tuned profile (CPU only)."""
+    profile = get_tuned_profile()
+    if profile is None or device != "cpu":
+        return {}
+    return {"cpu_threads": profile.cpu_threads, "num_workers": profile.num_workers}
+
+
+def default_compute_type() -> str | None:
+    profile = get_tuned_profile()
+    return profile.compute_type if profile else None
+
+
+def default_beam_size() -> int:
+    profile = get_tuned_profile()
+    return profile.beam_size if profile else DEFAULT_BEAM_SIZE
@@ -0,0 +1,340 @@
+# app/services/vad.py
+"""
+Voice-activity pre-pass.
+
+Before any model is touched, the decoded audio gets a speech/non-speech map:
+one boolean per 30 ms frame. The map is computed once per recording and
+cached under ASR_VAD_CACHE_DIR, keyed by the upload's SHA-256 when known
+(otherwise by path, invalidated when the file's size or mtime changes), one
+file per backend. Like the PCM cache the directory is LRU-evicted past
+ASR_VAD_CACHE_MAX_MB, so nothing accumulates next to uploads. It is used to:
+
+* skip files with no speech at all without loading a Whisper model;
+* trim leading and trailing silence before decoding;
+* give chunk boundaries (cut in silences, at most N seconds) to the
+  parallel long-audio decoder and to the batched pipeline.
+
+Backends (ASR_VAD_BACKEND):
+
+* ``silero``: the ONNX Silero model bundled with faster-whisper (default);
+* ``webrtc``: ``webrtcvad`` when installed;
+* ``energy``: a frame-RMS gate relative to the recording's noise floor,
+  pure NumPy.
+
+The span-to-frame conversion, the energy gate and the smoothing (pad speech,
+close short gaps) all run on the whole frame array at once.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.audio import SAMPLE_RATE, AudioDecodeError, decode_audio
+from app.services.pcm_cache import LruBudget, decode_cached
+
+log = logging.getLogger(__name__)
+
+try:
+    import webrtcvad
+
+    _HAS_WEBRTC = True
+except Exception:
+    webrtcvad = None  # type: ignore
+    _HAS_WEBRTC = False
+
+FRAME_MS = 30
+
+
+@dataclasses.dataclass(frozen=True)
+class SpeechMap:
+    flags: np.ndarray  # bool, one per frame
+    frame_samples: int
+    total: int  # samples in the audio
+    sample_rate: int = SAMPLE_RATE
+    backend: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.total / self.sample_rate
+
+    @property
+    def speech_s(self) -> float:
+        return float(self.flags.sum()) * self.frame_samples / self.sample_rate
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_s / self.duration if self.total else 0.0
+
+    def is_silent(self, min_speech_s: float | None = None) -> bool:
+        if min_speech_s is None:
+            min_speech_s = get_settings().asr_vad_min_speech_s
+        return self.speech_s < min_speech_s
+
+    def spans(self) -> list[tuple[int, int]]:
+        """Speech regions as (start, end) sample offsets."""
+        edges = np.diff(np.concatenate(([0], self.flags.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * self.frame_samples
+        ends = np.minimum(np.flatnonzero(edges == -1) * self.frame_samples, self.total)
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def trim_bounds(self, pad_s: float = 0.2) -> tuple[int, int]:
+        """Sample range from just before the first speech to just after the last."""
+        idx = np.flatnonzero(self.flags)
+        if idx.size == 0:
+            return 0, 0
+        pad = int(pad_s * self.sample_rate)
+        start = max(0, int(idx[0]) * self.frame_samples - pad)
+        end = min(self.total, (int(idx[-1]) + 1) * self.frame_samples + pad)
+        return start, end
+
+    def chunks(self, max_chunk_s: float, overlap_s: float = 0.0) -> list[tuple[int, int]]:
+        """Decoder chunks of at most ``max_chunk_s``, cut in silences where possible."""
+        from app.services.long_audio import plan_chunks
+
+        return plan_chunks(self.spans(), self.total, max_chunk_s, overlap_s, self.sample_rate)
+
+    # ---- persistence ----
+    def save(self, path: str | os.PathLike[str], source_stat: tuple[int, int] = (0, 0)) -> None:
+        tmp = Path(str(path) + ".tmp.npz")
+        np.savez_compressed(
+            tmp,
+            flags=np.packbits(self.flags),
+            meta=np.array([len(self.flags), self.frame_samples, self.total, self.sample_rate, *source_stat]),
+            backend=np.array(self.backend),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> tuple[SpeechMap, tuple[int, int]]:
+        with np.load(path) as data:
+            n, frame, total, sr, size, mtime = data["meta"].tolist()
+            flags = np.unpackbits(data["flags"], count=n).astype(bool)
+            backend = str(data["backend"])
+        return cls(flags, frame, total, sr, backend), (size, mtime)
+
+
+# ---------- backends ----------
+def _frame_count(total: int, frame: int) -> int:
+    return -(-total // frame)
+
+
+def _flags_from_spans(spans: list[tuple[int, int]], total: int, frame: int) -> np.ndarray:
+    n = _frame_count(total, frame)
+    marks = np.zeros(n + 1, dtype=np.int32)
+    if spans:
+        s = np.asarray(spans, dtype=np.int64)
+        np.add.at(marks, s[:, 0] // frame, 1)
+        np.add.at(marks, np.minimum(-(-s[:, 1] // frame), n), -1)
+    return np.cumsum(marks[:-1]) > 0
+
+
+def _silero_flags(samples: np.ndarray, frame: int) -> np.ndarray:
+    from app.services.long_audio import speech_spans
+
+    return _flags_from_spans(speech_spans(samples), samples.shape[0], frame)
+
+
+def _energy_flags(samples: np.ndarray, frame: int, margin_db: float = 15.0, floor_db: float = -55.0) -> np.ndarray:
+    n = _frame_count(samples.shape[0], frame)
+    padded = np.zeros(n * frame, dtype=np.float32)
+    padded[: samples.shape[0]] = samples
+    rms = np.sqrt(np.mean(np.square(padded.reshape(n, frame)), axis=1))
+    db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    noise = np.percentile(db, 10) if n else floor_db
+    return db > max(noise + margin_db, floor_db)
+
+
+def _webrtc_flags(samples: np.ndarray, frame: int, sample_rate: int, aggressiveness: int = 2) -> np.ndarray:
+    vad = webrtcvad.Vad(aggressiveness)
+    n = _frame_count(samples.shape[0], frame)
+    pcm = np.zeros(n * frame, dtype=np.int16)
+    pcm[: samples.shape[0]] = np.clip(samples * 32767.0, -32768, 32767).astype(np.int16)
+    raw = pcm.tobytes()
+    step = frame * 2
+    return np.fromiter(
+        (vad.is_speech(raw[i * step : (i + 1) * step], sample_rate) for i in range(n)),
+        dtype=bool,
+        count=n,
+    )
+
+
+def _smooth(flags: np.ndarray, pad_frames: int, gap_frames: int) -> np.ndarray:
+    """Pad speech runs by ``pad_frames`` on both sides, then merge runs fewer than ``gap_frames`` apart."""
+    if not flags.any():
+        return flags
+    n = flags.shape[0]
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    starts = np.maximum(np.flatnonzero(edges == 1) - pad_frames, 0)
+    ends = np.minimum(np.flatnonzero(edges == -1) + pad_frames, n)
+    cut = starts[1:] - ends[:-1] >= gap_frames
+    starts = np.concatenate((starts[:1], starts[1:][cut]))
+    ends = np.concatenate((ends[:-1][cut], ends[-1:]))
+    marks = np.zeros(n + 1, dtype=np.int32)
+    np.add.at(marks, starts, 1)
+    np.add.at(marks, ends, -1)
+    return np.cumsum(marks[:-1]) > 0
+
+
+def compute_speech_map(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    backend: str | None = None,
+) -> SpeechMap:
+    backend = (backend or get_settings().asr_vad_backend).lower()
+    frame = sample_rate * FRAME_MS // 1000
+    if backend == "webrtc" and not _HAS_WEBRTC:
+        log.warning("webrtcvad is not installed; using the energy VAD")
+        backend = "energy"
+    if backend == "silero":
+        try:
+            # Silero already pads and merges its spans.
+            return SpeechMap(_silero_flags(samples, frame), frame, samples.shape[0], sample_rate, backend)
+        except (ImportError, RuntimeError) as e:  # onnxruntime missing
+            log.warning("Silero VAD unavailable (%s); using the energy VAD", e)
+            backend = "energy"
+    if backend == "webrtc":
+        flags = _smooth(_webrtc_flags(samples, frame, sample_rate), pad_frames=7, gap_frames=10)
+    else:
+        backend = "energy"
+        flags = _smooth(_energy_flags(samples, frame), pad_frames=7, gap_frames=10)
+    return SpeechMap(flags, frame, samples.shape[0], sample_rate, backend)
+
+
+# ---------- cached per recording ----------
+_budgets: dict[Path, LruBudget] = {}  # per cache directory
+_budgets_lock = threading.Lock()
+
+
+def map_path(path: str | os.PathLike[str] | None, sha256: str | None = None, backend: str | None = None) -> Path:
+    """Cache file for a recording's speech map: by content hash, else by absolute path."""
+    settings = get_settings()
+    backend = (backend or settings.asr_vad_backend).lower()
+    key = sha256 or hashlib.blake2b(os.fsencode(os.path.abspath(path)), digest_size=16).hexdigest()
+    return Path(settings.asr_vad_cache_dir) / key[:2] / f"{key}.vad-{backend}.npz"
+
+
+def _stat(path: str | os.PathLike[str]) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def speech_map_for(
+    path: str | os.PathLike[str],
+    samples: np.ndarray | None = None,
+    cache: bool = True,
+    sha256: str | None = None,
+) -> SpeechMap:
+    """
+    Speech map of the audio file at ``path``, from the cache when still valid.
+    ``samples`` (16 kHz mono) avoids a decode when the caller already has them;
+    ``sha256`` (the upload's hash) shares the entry between copies of the file.
+    """
+    side = map_path(path, sha256)
+    stat = (0, 0) if sha256 else _stat(path)
+    if cache and side.exists():
+        try:
+            smap, source = SpeechMap.load(side)
+            if source == stat:
+                os.utime(side)  # LRU touch
+                return smap
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Ignoring unreadable speech map %s: %s", side, e)
+    if samples is None:
+        samples = decode_audio(path).samples
+    smap = compute_speech_map(samples, SAMPLE_RATE)
+    if cache:
+        try:
+            side.parent.mkdir(parents=True, exist_ok=True)
+            smap.save(side, stat)
+            _evict(side.parent.parent, side.stat().st_size)
+        except OSError as e:
+            log.warning("Could not cache speech map for %s: %s", path, e)
+    return smap
+
+
+def _evict(root: Path, nbytes: int) -> None:
+    with _budgets_lock:
+        budget = _budgets.get(root)
+        if budget is None:
+            budget = _budgets[root] = LruBudget(root, "*/*.npz")
+    budget.add(nbytes, int(get_settings().asr_vad_cache_max_mb * 1024 * 1024))
+
+
+def discard_speech_map(path: str | os.PathLike[str] | None, sha256: str | None = None) -> None:
+    map_path(path, sha256).unlink(missing_ok=True)
+
+
+# ---------- what the decoder gets ----------
+@dataclasses.dataclass(frozen=True)
+class Prepass:
+    samples: np.ndarray  # audio trimmed to its speech
+    start: int  # samples cut from the front
+    clips: list[tuple[int, int]]  # speech chunks within ``samples``, cut in silences
+    speech: SpeechMap
+
+    @property
+    def silent(self) -> bool:
+        return not self.clips
+
+    @property
+    def offset(self) -> float:
+        """Seconds to add to timestamps decoded from ``samples``."""
+        return self.start / self.speech.sample_rate
+
+    def spans(self) -> list[tuple[int, int]]:
+        """Speech spans within ``samples``."""
+        end = self.samples.shape[0]
+        return [
+            (max(0, s - self.start), min(end, e - self.start))
+            for s, e in self.speech.spans()
+            if e > self.start and s < self.start + end
+        ]
+
+    def clip_dicts(self) -> list[dict[str, int]]:
+        """``clip_timestamps`` for BatchedInferencePipeline (sample offsets)."""
+        return [{"start": s, "end": e} for s, e in self.clips]
+
+    def clip_seconds(self) -> list[float]:
+        """``clip_timestamps`` for WhisperModel.transcribe (flat start/end seconds)."""
+        sr = self.speech.sample_rate
+        return [t / sr for clip in self.clips for t in clip]
+
+
+def run_prepass(
+    path: str | os.PathLike[str] | None,
+    samples: np.ndarray | None = None,
+    max_chunk_s: float = 30.0,
+    sha256: str | None = None,
+) -> Prepass | None:
+    """
+    Speech map, trim and chunking for one recording. Returns None when
+    ASR_VAD_PREPASS is off or the file cannot be decoded here; callers then
+    hand the file to Whisper as before. With the upload's ``sha256`` the
+    decode goes through the PCM cache (app/services/pcm_cache.py).
+    """
+    settings = get_settings()
+    if not settings.asr_vad_prepass:
+        return None
+    if samples is None:
+        try:
+            samples = decode_cached(path, sha256).samples
+        except (AudioDecodeError, OSError) as e:
+            log.warning("VAD pre-pass skipped for %s: %s", path, e)
+            return None
+    smap = speech_map_for(path, samples, sha256=sha256) if path is not None else compute_speech_map(samples)
+    if smap.is_silent(settings.asr_vad_min_speech_s):
+        return Prepass(samples[:0], 0, [], smap)
+    start, end = smap.trim_bounds()
+    clips = [
+        (max(0, s - start), min(end, e) - start)
+        for s, e in smap.chunks(max_chunk_s, overlap_s=0.0)
+    ]
+    return Prepass(samples[start:end], start, clips, smap)
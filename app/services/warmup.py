@@ -0,0 +1,191 @@
+# app/services/warmup.py
+"""
+Model preload and warm-up at startup.
+
+Loading a Whisper model takes seconds, and the first inference on it pays
+another one-off cost (CTranslate2 kernel selection, allocator growth). With
+lazy loading both land on the first request after a deploy, which can run
+past the proxy timeout. At startup the app instead hands the configured
+model keys to :func:`start_warmup`. A background thread then loads each one
+through the shared model registry and transcribes a few seconds of the
+bundled sample (``test.mp3``, or silence if it cannot be decoded).
+
+``/readyz`` answers 503 while the first warm-up runs, so the load balancer
+only routes traffic to hot workers. A failed attempt (faster-whisper missing,
+no network to fetch weights) is retried with exponential backoff. Meanwhile
+``/readyz`` reports the worker as ready but degraded, so auth, billing and
+the other routes keep serving while transcription falls back to lazy
+loading. ``/livez`` only says the process is up, and ``/healthz`` reports the
+per-model load and warm-up durations from :meth:`Warmup.stats`.
+
+Knobs (app/config.Settings): ASR_PRELOAD, ASR_PRELOAD_MODELS,
+ASR_WARMUP_AUDIO, ASR_WARMUP_SECONDS, ASR_WARMUP_RETRY_S,
+ASR_WARMUP_RETRY_MAX_S.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+from app.services.audio import SAMPLE_RATE, AudioDecodeError, decode_audio
+from app.services.model_registry import ModelKey, ModelRegistry, get_model_registry
+
+log = logging.getLogger(__name__)
+
+# (model, samples) -> None; runs one short decode to finish lazy initialisation
+InferFn = Callable[[Any, np.ndarray], None]
+
+
+def warmup_clip(path: str | None, seconds: float) -> np.ndarray:
+    """First ``seconds`` of the sample audio, or silence when it is missing or undecodable."""
+    n = max(1, int(seconds * SAMPLE_RATE))
+    if path:
+        try:
+            return decode_audio(path, max_seconds=seconds).samples[:n]
+        except (AudioDecodeError, OSError) as e:
+            log.warning("Warm-up audio %s unusable (%s); warming up on silence", path, e)
+    return np.zeros(n, dtype=np.float32)
+
+
+def _whisper_infer(model: Any, samples: np.ndarray) -> None:
+    segments, _info = model.transcribe(samples, beam_size=1, condition_on_previous_text=False)
+    for _ in segments:  # the generator does the work
+        pass
+
+
+class Warmup:
+    def __init__(
+        self,
+        keys: Sequence[ModelKey],
+        audio: np.ndarray,
+        registry: ModelRegistry | None = None,
+        infer: InferFn = _whisper_infer,
+        retry_s: float = 5.0,
+        retry_max_s: float = 300.0,
+    ) -> None:
+        self.keys = list(dict.fromkeys(keys))
+        self.audio = audio
+        self._registry = registry or get_model_registry()
+        self._infer = infer
+        self.retry_s = retry_s
+        self.retry_max_s = retry_max_s
+        self.state = "pending"  # pending -> loading -> ready | failed (-> loading on retry)
+        self.error: str | None = None
+        self.attempts = 0
+        self.next_retry_s: float | None = None
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.models: dict[ModelKey, dict[str, float]] = {}
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def degraded(self) -> bool:
+        """At least one attempt failed: serve everything, load models lazily."""
+        return not self.ready and self.attempts > 0 and self.error is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def run(self) -> None:
+        """One warm-up attempt; models already warm from an earlier attempt are skipped."""
+        self.state = "loading"
+        self.attempts += 1
+        self.started = self.started or time.monotonic()
+        try:
+            for key in self.keys:
+                if key in self.models:
+                    continue
+                t0 = time.monotonic()
+                with self._registry.lease(key) as model:
+                    t1 = time.monotonic()
+                    self._infer(model, self.audio)
+                t2 = time.monotonic()
+                self.models[key] = {"load_s": t1 - t0, "warmup_s": t2 - t1}
+                log.info("Model %s loaded in %.1fs, warmed up in %.1fs", key, t1 - t0, t2 - t1)
+            self.state = "ready"
+            self.error = None
+        except Exception as e:
+            log.exception("Model warm-up failed")
+            self.error = f"{e.__class__.__name__}: {e}"
+            self.state = "failed"
+        finally:
+            self.finished = time.monotonic()
+            self._done.set()
+
+    def run_until_ready(self) -> None:
+        """Retry failed attempts with exponential backoff until every model is warm."""
+        delay = self.retry_s
+        while True:
+            self.run()
+            if self.ready:
+                self.next_retry_s = None
+                return
+            self.next_retry_s = delay
+            log.warning("Model warm-up attempt %d failed; retrying in %.0fs", self.attempts, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, self.retry_max_s)
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run_until_ready, name="asr-warmup", daemon=True)
+        t.start()
+        return t
+
+    def stats(self) -> dict[str, Any]:
+        end = self.finished or time.monotonic()
+        return {
+            "state": self.state,
+            "error": self.error,
+            "attempts": self.attempts,
+            "next_retry_s": self.next_retry_s,
+            "total_s": round(end - self.started, 3) if self.started else None,
+            "models": [
+                {
+                    "model_size": k.model_size,
+                    "device": k.device,
+                    "compute_type": k.compute_type,
+                    **{name: round(v, 3) for name, v in t.items()},
+                }
+                for k, t in self.models.items()
+            ],
+        }
+
+
+_warmup: Warmup | None = None
+
+
+def start_warmup(
+    keys: Sequence[ModelKey],
+    audio_path: str | None,
+    seconds: float = 5.0,
+    background: bool = True,
+    retry_s: float = 5.0,
+    retry_max_s: float = 300.0,
+) -> Warmup:
+    """
+    Load and warm ``keys``; in the background unless ``background`` is False.
+    A blocking first attempt that fails keeps retrying in the background.
+    """
+    global _warmup
+    _warmup = Warmup(keys, warmup_clip(audio_path, seconds), retry_s=retry_s, retry_max_s=retry_max_s)
+    if background:
+        _warmup.start()
+    else:
+        _warmup.run()
+        if not _warmup.ready:
+            _warmup.start()
+    return _warmup
+
+
+def get_warmup() -> Warmup | None:
+    """The startup warm-up, or None when preloading is off (models load lazily)."""
+    return _warmup
@@ -29,6 +29,7 @@ from .stripe_client import (
     create_stripe_checkout_session,
     sync_subscription_from_stripe,
 )
+from .uploads import SpooledUpload, spool_upload
 
 __all__ = [
     "hash_password",
@@ -48,4 +49,6 @@ __all__ = [
     "sync_subscription_from_stripe",
     "send_email",
     "run_safety_checks",
+    "SpooledUpload",
+    "spool_upload",
 ]
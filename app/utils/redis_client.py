@@ -1,156 +1,1188 @@
 """
 Central place to get a Redis-like cache.
 
-- If REDIS_ENABLED=false or REDIS_URL is missing/unreachable, we fall back to an
-  in-memory dict with TTL so local dev keeps working.
-- We do not connect at import time; first use will try once.
+- If REDIS_ENABLED=false or REDIS_URL is missing/unreachable, we fall back to a
+  bounded in-memory LRU with TTL so local dev keeps working
+  (MEMORY_CACHE_MAX_ENTRIES / MEMORY_CACHE_MAX_MB; expired keys are swept
+  every MEMORY_CACHE_SWEEP_S seconds).
+- With Redis, hot keys (CACHE_L1_PREFIXES) are also kept in a short-TTL
+  per-process L1, invalidated across workers over Redis pub/sub.
+- Connections come from a BlockingConnectionPool sized by REDIS_POOL_*.
+  A circuit breaker switches to the memory fallback after repeated
+  failures and probes Redis again after REDIS_BREAKER_COOLDOWN_S, so a
+  worker reattaches on its own once Redis recovers. A saturated pool
+  ("No connection available" after REDIS_POOL_TIMEOUT_S) is load, not an
+  outage: it is not counted and the error is raised to the caller.
+- While the breaker is open each worker reads and writes its own memory
+  store. Those writes (``transcript:*`` payloads, summary ``lock:*`` keys)
+  are invisible to other workers and are not copied to Redis when it
+  reattaches, so locks and cached values are per-worker for that window.
+- ``async_cache`` is the same facade on redis.asyncio for async routes.
+- ``mget``/``mset``/``incrby`` and the hash commands cost one round-trip;
+  ``pipeline()`` queues several commands and sends them as one MULTI/EXEC
+  (on the memory fallback they run with all their keys locked).
+- We do not connect at import time; first use probes.
 """
 
 from __future__ import annotations
-import logging, time, threading
+import heapq, logging, os, sys, time, threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Any, Optional
 
 from app.config import get_settings
 
 log = logging.getLogger(__name__)
 
+try:
+    import redis  # pip install redis
+    import redis.asyncio as aioredis
+
+    _REDIS_ERRORS: tuple[type[BaseException], ...] = (redis.ConnectionError, redis.TimeoutError, OSError)
+except ImportError:  # memory fallback only
+    redis = None  # type: ignore
+    aioredis = None  # type: ignore
+    _REDIS_ERRORS = (OSError,)
+
+
+def _pool_exhausted(err: BaseException) -> bool:
+    """BlockingConnectionPool gave up waiting for a free connection; Redis itself is fine."""
+    return redis is not None and isinstance(err, redis.ConnectionError) and str(err).startswith(
+        "No connection available"
+    )
+
+
+# -------- Connection management --------
+
+class _Breaker:
+    """
+    Circuit breaker in front of Redis.
+
+    closed:    calls go to Redis; REDIS_BREAKER_THRESHOLD consecutive failures open it.
+    open:      calls use the memory fallback without touching the network.
+    half_open: after REDIS_BREAKER_COOLDOWN_S one caller probes with PING;
+               success closes the breaker (Redis is reattached), failure reopens it.
+
+    It starts open with an expired cooldown, so the first use is a probe.
+    """
+
+    def __init__(self, threshold: int, cooldown_s: float):
+        self.threshold = max(1, threshold)
+        self.cooldown_s = cooldown_s
+        self.state = "open"
+        self.failures = 0
+        self.trips = 0
+        self.probes = 0
+        self.last_error: Optional[str] = None
+        self._opened = float("-inf")
+        self._since = time.time()
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[str]:
+        """"call", "probe" (caller must PING and report back) or None (use memory)."""
+        if self.state == "closed":
+            return "call"
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened >= self.cooldown_s:
+                self.state = "half_open"
+                self.probes += 1
+                return "probe"
+            return "call" if self.state == "closed" else None
+
+    def success(self) -> None:
+        if self.state == "closed" and not self.failures:
+            return
+        with self._lock:
+            if self.state != "closed":
+                log.info("Redis reachable again; leaving the memory fallback")
+                self.state, self._since = "closed", time.time()
+            self.failures = 0
+
+    def failure(self, err: BaseException) -> None:
+        """Count ``err`` towards opening; pool exhaustion is re-raised uncounted instead."""
+        if _pool_exhausted(err):
+            with self._lock:
+                if self.state == "half_open":
+                    self.state, self._opened = "open", float("-inf")  # inconclusive; probe again
+            raise err
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{err.__class__.__name__}: {err}"
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state == "closed":
+                    self.trips += 1
+                    log.warning("Redis failing (%s); memory fallback for %.0fs", self.last_error, self.cooldown_s)
+                self.state, self._since = "open", time.time()
+                self._opened = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "since": self._since,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "probes": self.probes,
+            "last_error": self.last_error,
+        }
+
+
+_breaker = _Breaker(get_settings().REDIS_BREAKER_THRESHOLD, get_settings().REDIS_BREAKER_COOLDOWN_S)
 _redis_client = None
-_redis_checked = False
+_async_client = None
 _lock = threading.Lock()
 
 
-def _connect_redis():
-    global _redis_client, _redis_checked
+def _redis_configured() -> bool:
+    settings = get_settings()
+    return bool(settings.REDIS_ENABLED and settings.REDIS_URL and redis is not None)
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    settings = get_settings()
+    return {
+        "decode_responses": True,
+        "max_connections": settings.REDIS_POOL_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT_S,  # wait this long for a free connection
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_S,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT_S,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_S,
+    }
+
+
+def _sync_client():
+    global _redis_client
     with _lock:
-        if _redis_checked:
-            return _redis_client
-        _redis_checked = True
-
-        settings = get_settings()
-        if not settings.REDIS_ENABLED:
-            log.info("Redis disabled via REDIS_ENABLED=false")
-            _redis_client = None
-            return None
+        if _redis_client is None:
+            url = get_settings().REDIS_URL
+            # Blocking pool: callers queue for a connection instead of failing when all are busy.
+            pool = redis.BlockingConnectionPool.from_url(url, **_pool_kwargs())
+            _redis_client = redis.Redis(connection_pool=pool)
+            log.info("Redis pool for %s (max %d connections)", url.split("@")[-1], pool.max_connections)
+        return _redis_client
 
-        url = settings.REDIS_URL
-        if not url:
-            log.info("REDIS_URL not set; using in-memory cache fallback")
-            _redis_client = None
-            return None
 
+def _async_redis():
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            pool = aioredis.BlockingConnectionPool.from_url(get_settings().REDIS_URL, **_pool_kwargs())
+            _async_client = aioredis.Redis(connection_pool=pool)
+        return _async_client
+
+
+def _connect_redis():
+    """The pooled sync client, or None when Redis is off or the breaker is open."""
+    if not _redis_configured():
+        return None
+    mode = _breaker.allow()
+    if mode is None:
+        return None
+    client = _sync_client()
+    if mode == "probe":
         try:
-            import redis  # pip install redis
-            client = redis.from_url(url, decode_responses=True, socket_timeout=2)
-            # Optional: a light liveness check (won't run until first use)
             client.ping()
-            log.info("Connected to Redis at %s", url.split("@")[-1])
-            _redis_client = client
-            return client
         except Exception as e:
-            log.warning("Redis unavailable (%s). Using in-memory cache.", e)
-            _redis_client = None
+            _breaker.failure(e)
             return None
+        _breaker.success()
+    return client
 
 
-# -------- In-memory fallback with TTL --------
+async def _aconnect_redis():
+    """Async counterpart of _connect_redis (redis.asyncio client on its own pool)."""
+    if not _redis_configured():
+        return None
+    mode = _breaker.allow()
+    if mode is None:
+        return None
+    client = _async_redis()
+    if mode == "probe":
+        try:
+            await client.ping()
+        except Exception as e:
+            _breaker.failure(e)
+            return None
+        _breaker.success()
+    return client
+
+
+def redis_health() -> dict[str, Any]:
+    """Breaker state and pool settings, for /healthz."""
+    return {"configured": _redis_configured(), **_breaker.stats()}
+
+
+# -------- In-memory fallback: bounded LRU with TTL --------
+
+class _Stripe:
+    __slots__ = ("lock", "data", "heap", "nbytes", "hits", "misses", "evictions", "expired")
 
-class _MemoryCache:
     def __init__(self):
-        self._store: dict[str, tuple[Any, Optional[float]]] = {}
-        self._lock = threading.Lock()
+        self.lock = threading.Lock()
+        # key -> (value, expires_at | None, size); insertion order is LRU order.
+        # value is a str, or a dict[str, str] for hashes.
+        self.data: OrderedDict[str, tuple[Any, Optional[float], int]] = OrderedDict()
+        self.heap: list[tuple[float, str]] = []  # (expires_at, key), stale items skipped lazily
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = self.expired = 0
+
+
+def _entry_size(key: str, value: Any) -> int:
+    if isinstance(value, dict):
+        return sys.getsizeof(key) + sum(sys.getsizeof(f) + sys.getsizeof(v) for f, v in value.items()) + 64
+    return sys.getsizeof(key) + sys.getsizeof(value) + 64  # + tuple/dict slot overhead
+
+
+def _as_str(value: Any) -> str:
+    if not isinstance(value, (str, bytes, int, float)):
+        import json
+        value = json.dumps(value)
+    return str(value)
+
+
+class _WrongType(TypeError):
+    """Hash command on a string key or the other way round (Redis: WRONGTYPE)."""
 
-    def _expired(self, key: str) -> bool:
-        item = self._store.get(key)
-        if not item:
-            return True
-        _, exp = item
-        return exp is not None and exp < time.time()
 
+# key(s) each command touches, for locking
+def _op_keys(name: str, args: tuple) -> list[str]:
+    if name == "mget":
+        return list(args[0])
+    if name == "mset":
+        return list(args[0])
+    return [args[0]]
+
+
+class _MemoryCache:
+    """
+    Bounded LRU + TTL store used when Redis is off.
+
+    Keys hash onto independently locked stripes so concurrent requests rarely
+    wait on each other. Each stripe is an OrderedDict kept in LRU order (O(1)
+    touch and eviction) and gets an equal share of the entry and byte limits,
+    so eviction is LRU per stripe. A daemon sweeper removes expired keys every
+    ``sweep_interval`` seconds using a per-stripe expiry heap; keys written
+    with a TTL and never read again are reclaimed too.
+
+    Commands mirror redis-py's names and signatures. Multi-key commands and
+    :meth:`apply` (pipelines) take every stripe they touch, in a fixed order,
+    so they are atomic with respect to other callers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        stripes: int = 16,
+        sweep_interval: float = 30.0,
+    ):
+        n = max(1, stripes)
+        self._stripes = [_Stripe() for _ in range(n)]
+        self._max_entries = max(1, max_entries // n)
+        self._max_bytes = max(1, max_bytes // n)
+        self.sweep_interval = sweep_interval
+        self._sweeper_pid: Optional[int] = None
+        self._sweeper_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _stripe(self, key: str) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    @contextmanager
+    def _locked(self, keys: list[str]):
+        idx = sorted({hash(k) % len(self._stripes) for k in keys})
+        for i in idx:
+            self._stripes[i].lock.acquire()
+        try:
+            yield
+        finally:
+            for i in reversed(idx):
+                self._stripes[i].lock.release()
+
+    # ---- primitives; the caller holds the key's stripe lock ----
+    @staticmethod
+    def _drop(s: _Stripe, key: str) -> None:
+        _, _, size = s.data.pop(key)
+        s.nbytes -= size
+
+    def _item(self, key: str, count: bool = False) -> Optional[tuple[Any, Optional[float], int]]:
+        s = self._stripe(key)
+        item = s.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            self._drop(s, key)
+            s.expired += 1
+            item = None
+        if item is None:
+            if count:
+                s.misses += 1
+            return None
+        s.data.move_to_end(key)
+        if count:
+            s.hits += 1
+        return item
+
+    def _store(self, key: str, value: Any, exp_ts: Optional[float]) -> None:
+        s = self._stripe(key)
+        if key in s.data:
+            self._drop(s, key)
+        size = _entry_size(key, value)
+        s.data[key] = (value, exp_ts, size)
+        s.nbytes += size
+        if exp_ts is not None:
+            heapq.heappush(s.heap, (exp_ts, key))
+        # Evict from the cold end; the entry just written always stays.
+        while len(s.data) > 1 and (len(s.data) > self._max_entries or s.nbytes > self._max_bytes):
+            _, (_, _, old_size) = s.data.popitem(last=False)
+            s.nbytes -= old_size
+            s.evictions += 1
+
+    def _string(self, key: str, count: bool = False) -> Optional[tuple[str, Optional[float]]]:
+        item = self._item(key, count)
+        if item is None:
+            return None
+        if isinstance(item[0], dict):
+            raise _WrongType(key)
+        return item[0], item[1]
+
+    def _hash(self, key: str) -> tuple[dict[str, str], Optional[float]]:
+        item = self._item(key, count=True)
+        if item is None:
+            return {}, None
+        if not isinstance(item[0], dict):
+            raise _WrongType(key)
+        return item[0], item[1]
+
+    # ---- commands (lock-free bodies; see _run) ----
+    def _cmd_get(self, key: str) -> Optional[str]:
+        item = self._string(key, count=True)
+        return item[0] if item else None
+
+    def _cmd_set(self, key: str, value: Any, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._item(key) is not None:
+            return None  # what Redis answers to SET NX on an existing key
+        self._store(key, _as_str(value), time.time() + ex if ex else None)
+        return True
+
+    def _cmd_setex(self, key: str, ex: float, value: Any) -> bool:
+        return self._cmd_set(key, value, ex=ex)
+
+    def _cmd_delete_if_equals(self, key: str, value: Any) -> int:
+        item = self._string(key)
+        if item is None or item[0] != _as_str(value):
+            return 0
+        self._drop(self._stripe(key), key)
+        return 1
+
+    def _cmd_delete(self, key: str) -> int:
+        if self._item(key) is None:
+            return 0
+        self._drop(self._stripe(key), key)
+        return 1
+
+    def _cmd_expire(self, key: str, ex: float) -> bool:
+        item = self._item(key)
+        if item is None:
+            return False
+        self._store(key, item[0], time.time() + ex)
+        return True
+
+    def _cmd_mget(self, keys: list[str]) -> list[Optional[str]]:
+        return [self._cmd_get(k) for k in keys]
+
+    def _cmd_mset(self, mapping: dict[str, Any]) -> bool:
+        for k, v in mapping.items():
+            self._store(k, _as_str(v), None)
+        return True
+
+    def _cmd_incrby(self, key: str, amount: int = 1) -> int:
+        item = self._string(key)
+        try:
+            value = int(item[0] if item else 0) + amount
+        except ValueError:
+            raise ValueError(f"value at {key!r} is not an integer") from None
+        self._store(key, str(value), item[1] if item else None)  # keeps the TTL, like Redis
+        return value
+
+    def _cmd_hget(self, key: str, field: str) -> Optional[str]:
+        return self._hash(key)[0].get(field)
+
+    def _cmd_hgetall(self, key: str) -> dict[str, str]:
+        return dict(self._hash(key)[0])
+
+    def _cmd_hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[dict] = None) -> int:
+        h, exp = self._hash(key)
+        h = dict(h)
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        added = sum(1 for f in updates if f not in h)
+        h.update({str(f): _as_str(v) for f, v in updates.items()})
+        self._store(key, h, exp)
+        return added
+
+    def _cmd_hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        h, exp = self._hash(key)
+        h = dict(h)
+        try:
+            value = int(h.get(field, 0)) + amount
+        except ValueError:
+            raise ValueError(f"field {field!r} at {key!r} is not an integer") from None
+        h[field] = str(value)
+        self._store(key, h, exp)
+        return value
+
+    def _cmd_hdel(self, key: str, *fields: str) -> int:
+        h, exp = self._hash(key)
+        removed = [f for f in fields if f in h]
+        if removed:
+            h = {f: v for f, v in h.items() if f not in removed}
+            if h:
+                self._store(key, h, exp)
+            else:
+                self._drop(self._stripe(key), key)
+        return len(removed)
+
+    def _run(self, name: str, *args, **kwargs) -> Any:
+        self._ensure_sweeper()
+        keys = _op_keys(name, args)
+        if len(keys) == 1:
+            with self._stripe(keys[0]).lock:
+                return getattr(self, "_cmd_" + name)(*args, **kwargs)
+        with self._locked(keys):
+            return getattr(self, "_cmd_" + name)(*args, **kwargs)
+
+    def apply(self, ops: list[tuple[str, tuple, dict]]) -> list[Any]:
+        """
+        Run (command, args, kwargs) triples with every key they touch locked,
+        so no other caller sees a partial batch. Like MULTI/EXEC, a failing
+        command does not stop the rest; the first error is raised afterwards.
+        """
+        self._ensure_sweeper()
+        keys = [k for name, args, _ in ops for k in _op_keys(name, args)]
+        results: list[Any] = []
+        error: Optional[Exception] = None
+        with self._locked(keys):
+            for name, args, kwargs in ops:
+                try:
+                    results.append(getattr(self, "_cmd_" + name)(*args, **kwargs))
+                except (TypeError, ValueError) as e:
+                    results.append(e)
+                    error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    # ---- public API (redis-py compatible subset) ----
     def get(self, key: str) -> Optional[str]:
-        with self._lock:
-            if self._expired(key):
-                self._store.pop(key, None)
-                return None
-            val, _ = self._store[key]
-            return val
+        return self._run("get", key)
 
-    def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
-        with self._lock:
-            if not isinstance(value, (str, bytes, int, float)):
-                import json
-                value = json.dumps(value)
-            exp_ts = time.time() + ex if ex else None
-            self._store[key] = (str(value), exp_ts)
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> bool:
+        self._ensure_sweeper()
+        return bool(self._run("set", key, value, ex, nx))
 
     def delete(self, key: str) -> None:
-        with self._lock:
-            self._store.pop(key, None)
+        self._run("delete", key)
+
+    def delete_if_equals(self, key: str, value: Any) -> bool:
+        return bool(self._run("delete_if_equals", key, value))
 
     # common aliases
     def setex(self, key: str, ex: int, value: Any) -> None:
         self.set(key, value, ex=ex)
 
     def expire(self, key: str, ex: int) -> None:
-        with self._lock:
-            if key in self._store:
-                val, _ = self._store[key]
-                self._store[key] = (val, time.time() + ex)
+        self._run("expire", key, ex)
+
+    def mget(self, keys: list[str]) -> list[Optional[str]]:
+        return self._run("mget", list(keys))
+
+    def mset(self, mapping: dict[str, Any]) -> None:
+        self._run("mset", dict(mapping))
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        return self._run("incrby", key, amount)
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        return self._run("hget", key, field)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return self._run("hgetall", key)
+
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[dict] = None) -> int:
+        return self._run("hset", key, field, value, mapping)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return self._run("hincrby", key, field, amount)
+
+    def hdel(self, key: str, *fields: str) -> int:
+        return self._run("hdel", key, *fields)
 
     def ping(self) -> bool:
         return True
 
+    # ---- expiry ----
+    def sweep(self) -> int:
+        """Remove every expired key now; returns how many were removed."""
+        removed = 0
+        for s in self._stripes:
+            now = time.time()
+            with s.lock:
+                while s.heap and s.heap[0][0] <= now:
+                    exp_ts, key = heapq.heappop(s.heap)
+                    item = s.data.get(key)
+                    if item is not None and item[1] == exp_ts:
+                        self._drop(s, key)
+                        s.expired += 1
+                        removed += 1
+                # Overwrites and deletes leave stale heap items behind; rebuild when they dominate.
+                if len(s.heap) > 2 * len(s.data) + 64:
+                    s.heap = [(exp, k) for k, (_, exp, _) in s.data.items() if exp is not None]
+                    heapq.heapify(s.heap)
+        return removed
+
+    def _ensure_sweeper(self) -> None:
+        pid = os.getpid()
+        if self._sweeper_pid == pid or not self.sweep_interval:
+            return
+        with self._sweeper_lock:
+            # Threads do not survive fork(); each worker process starts its own.
+            if self._sweeper_pid == pid:
+                return
+            self._sweeper_pid = pid
+            threading.Thread(target=self._sweep_loop, name="memory-cache-sweeper", daemon=True).start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception:
+                log.exception("memory cache sweep failed")
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict[str, int]:
+        out = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        for s in self._stripes:
+            with s.lock:
+                out["entries"] += len(s.data)
+                out["bytes"] += s.nbytes
+                out["hits"] += s.hits
+                out["misses"] += s.misses
+                out["evictions"] += s.evictions
+                out["expired"] += s.expired
+        return out
+
+
+def _new_memory_cache() -> _MemoryCache:
+    settings = get_settings()
+    return _MemoryCache(
+        max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes=int(settings.MEMORY_CACHE_MAX_MB * 1024 * 1024),
+        stripes=settings.MEMORY_CACHE_STRIPES,
+        sweep_interval=settings.MEMORY_CACHE_SWEEP_S,
+    )
+
+
+_memory_cache = _new_memory_cache()
+
 
-_memory_cache = _MemoryCache()
+# -------- L1: per-process hot-key tier in front of Redis --------
+
+class _L1Tier:
+    """
+    Small per-process LRU in front of Redis for keys matching CACHE_L1_PREFIXES
+    (prefix -> L1 TTL in seconds; longest prefix wins).
+
+    Writes through the facade publish the key on CACHE_L1_CHANNEL; every
+    worker drops it from its L1 on receipt. L1 is only served while this
+    process's subscriber is connected; after a reconnect L1 starts empty,
+    because invalidations may have been missed. A generation counter stops a
+    read that raced an invalidation from filling L1 with the old value.
+    """
+
+    def __init__(self, prefixes: dict[str, float], max_entries: int, max_bytes: int, channel: str):
+        self.prefixes = sorted(((p, ttl) for p, ttl in prefixes.items() if ttl > 0), key=lambda x: -len(x[0]))
+        self.channel = channel
+        self._store = _MemoryCache(max_entries=max_entries, max_bytes=max_bytes, stripes=4, sweep_interval=0)
+        self._max = (max_entries, max_bytes)
+        self.generation = 0
+        self.live = False  # subscriber connected
+        self._origin = ""
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def ttl_for(self, key: str) -> float:
+        for prefix, ttl in self.prefixes:
+            if key.startswith(prefix):
+                return ttl
+        return 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        self._ensure_subscriber()
+        return self._store.get(key) if self.live else None
+
+    def fill(self, key: str, value: Any, ttl: float, generation: int) -> None:
+        # ``ex`` may be fractional here; _MemoryCache only needs time.time() + ex.
+        if self.live and generation == self.generation:
+            self._store.set(key, value, ex=ttl)
+
+    def forget(self, key: str) -> str:
+        """Drop ``key`` locally; returns the invalidation message to publish."""
+        self.generation += 1
+        self._store.delete(key)
+        return f"{self._origin}|{key}"
+
+    def invalidate(self, client, key: str) -> None:
+        try:
+            client.publish(self.channel, self.forget(key))
+        except Exception as e:
+            self.publish_failed(e)
+
+    def publish_failed(self, err: BaseException) -> None:
+        log.warning("L1 invalidation publish failed (%s); clearing L1", err)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.generation += 1
+        max_entries, max_bytes = self._max
+        self._store = _MemoryCache(max_entries=max_entries, max_bytes=max_bytes, stripes=4, sweep_interval=0)
+
+    def _on_message(self, data: str) -> None:
+        origin, _, key = data.partition("|")
+        if origin == self._origin:
+            return
+        self.generation += 1
+        self._store.delete(key)
+        self.invalidations += 1
+
+    def _ensure_subscriber(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Threads and sockets do not survive fork(); each worker subscribes itself.
+            self._pid = pid
+            self._origin = f"{pid}-{os.urandom(4).hex()}"
+            self.live = False
+            self._reset()
+            threading.Thread(target=self._listen, name="cache-l1-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                client = _connect_redis()
+                if client is None:
+                    raise ConnectionError("redis unavailable")
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.live = True
+                backoff = 0.5
+                while True:
+                    msg = pubsub.get_message(timeout=1.0)
+                    if msg and msg.get("type") == "message":
+                        data = msg["data"]
+                        self._on_message(data.decode("utf-8") if isinstance(data, bytes) else data)
+            except Exception as e:
+                if self.live:
+                    log.warning("L1 invalidation subscriber lost (%s); L1 off until it reconnects", e)
+                self.live = False
+                self._reset()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stats(self) -> dict[str, Any]:
+        st = self._store.stats()
+        return {
+            "enabled": bool(self.prefixes),
+            "subscribed": self.live,
+            "entries": st["entries"],
+            "hits": st["hits"],
+            "misses": st["misses"],
+            "invalidations": self.invalidations,
+        }
+
+
+def _new_l1() -> _L1Tier:
+    settings = get_settings()
+    return _L1Tier(
+        settings.CACHE_L1_PREFIXES,
+        max_entries=settings.CACHE_L1_MAX_ENTRIES,
+        max_bytes=int(settings.CACHE_L1_MAX_MB * 1024 * 1024),
+        channel=settings.CACHE_L1_CHANNEL,
+    )
+
+
+_l1 = _new_l1()
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (str, bytes, int, float)):
+        return value
+    import json
+    return json.dumps(value)
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+# Commands that change a key; their keys are invalidated in every worker's L1.
+# Compare-and-delete in one step on the server (releasing a lock only its holder owns).
+_DELETE_IF_EQUALS = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+_WRITES = frozenset({"set", "setex", "delete", "expire", "mset", "incrby", "hset", "hincrby", "hdel"})
+
+
+def _prepare(name: str, args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+    """JSON-encode values the way the memory fallback stores them."""
+    if name == "set":
+        return (args[0], _encode(args[1]), *args[2:]), kwargs
+    if name == "setex":
+        return (args[0], args[1], _encode(args[2])), kwargs
+    if name == "mset":
+        return ({k: _encode(v) for k, v in args[0].items()},), kwargs
+    if name == "hset":
+        if len(args) > 2:
+            args = (args[0], args[1], _encode(args[2]), *args[3:])
+        if kwargs.get("mapping"):
+            kwargs = {**kwargs, "mapping": {f: _encode(v) for f, v in kwargs["mapping"].items()}}
+        return args, kwargs
+    return args, kwargs
+
+
+def _l1_keys(ops: list[tuple[str, tuple, dict]]) -> list[str]:
+    return [k for name, args, _ in ops if name in _WRITES for k in _op_keys(name, args) if _l1.ttl_for(k)]
+
+
+class CachePipeline:
+    """
+    Commands queued on :meth:`Cache.pipeline`. Against Redis they are sent in
+    one round-trip as a MULTI/EXEC transaction; against the memory fallback
+    they are applied under the locks of every key involved. Results land in
+    ``results`` (and are returned by :meth:`execute`) in queue order.
+    """
+
+    def __init__(self, owner: Cache):
+        self._owner = owner
+        self.ops: list[tuple[str, tuple, dict]] = []
+        self.results: Optional[list[Any]] = None
+
+    def _queue(self, name: str, *args, **kwargs) -> CachePipeline:
+        self.ops.append((name, *_prepare(name, args, kwargs)))
+        return self
+
+    def get(self, key: str) -> CachePipeline:
+        return self._queue("get", key)
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> CachePipeline:
+        return self._queue("set", key, value, ex=ex) if ex else self._queue("set", key, value)
+
+    def delete(self, key: str) -> CachePipeline:
+        return self._queue("delete", key)
+
+    def expire(self, key: str, ex: int) -> CachePipeline:
+        return self._queue("expire", key, ex)
+
+    def mget(self, keys: list[str]) -> CachePipeline:
+        return self._queue("mget", list(keys))
+
+    def mset(self, mapping: dict[str, Any]) -> CachePipeline:
+        return self._queue("mset", dict(mapping))
+
+    def incrby(self, key: str, amount: int = 1) -> CachePipeline:
+        return self._queue("incrby", key, amount)
+
+    def hget(self, key: str, field: str) -> CachePipeline:
+        return self._queue("hget", key, field)
+
+    def hgetall(self, key: str) -> CachePipeline:
+        return self._queue("hgetall", key)
+
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[dict] = None) -> CachePipeline:
+        if field is None:
+            return self._queue("hset", key, mapping=mapping)
+        return self._queue("hset", key, field, value, mapping=mapping)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> CachePipeline:
+        return self._queue("hincrby", key, field, amount)
+
+    def hdel(self, key: str, *fields: str) -> CachePipeline:
+        return self._queue("hdel", key, *fields)
+
+    def execute(self) -> list[Any]:
+        if self.results is None:
+            self.results = self._owner._execute(self.ops) if self.ops else []
+        return self.results
+
+    def __enter__(self) -> CachePipeline:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.execute()
+
+
+class AsyncCachePipeline(CachePipeline):
+    async def execute(self) -> list[Any]:
+        if self.results is None:
+            self.results = await self._owner._execute(self.ops) if self.ops else []
+        return self.results
+
+    async def __aenter__(self) -> AsyncCachePipeline:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.execute()
 
 
 class Cache:
-    """Facade that exposes a subset of redis-py API against Redis or memory."""
+    """
+    Facade that exposes a subset of redis-py API against Redis or memory.
+    With Redis, keys matching CACHE_L1_PREFIXES are also served from the
+    per-process L1 tier (see _L1Tier). A Redis call that fails with a
+    connection error counts against the breaker and is answered from memory.
+
+    Batch commands (``mget``, ``mset``, ``pipeline()``) cost one round-trip
+    for any number of keys.
+    """
+
+    def __init__(self):
+        self.l2_hits = 0
+        self.l2_misses = 0
 
     @property
     def _client(self):
         return _connect_redis()
 
-    def get(self, key: str) -> Optional[str]:
+    def _count(self, val: Optional[str], key: str, ttl: float, generation: int) -> None:
+        if val is None:
+            self.l2_misses += 1
+        else:
+            self.l2_hits += 1
+            if ttl:
+                _l1.fill(key, val, ttl, generation)
+
+    def _call(self, name: str, *args, **kwargs) -> Any:
+        args, kwargs = _prepare(name, args, kwargs)
         client = self._client
         if client is None:
-            return _memory_cache.get(key)
-        return client.get(key)
+            return _memory_cache._run(name, *args, **kwargs)
+        try:
+            result = getattr(client, name)(*args, **kwargs)
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache._run(name, *args, **kwargs)
+        _breaker.success()
+        if name in _WRITES:
+            for key in _l1_keys([(name, args, kwargs)]):
+                _l1.invalidate(client, key)
+        return result
 
-    def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
+    def _execute(self, ops: list[tuple[str, tuple, dict]]) -> list[Any]:
         client = self._client
         if client is None:
-            _memory_cache.set(key, value, ex=ex)
-            return
+            return _memory_cache.apply(ops)
+        try:
+            pipe = client.pipeline(transaction=True)
+            for name, args, kwargs in ops:
+                getattr(pipe, name)(*args, **kwargs)
+            results = pipe.execute()
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.apply(ops)
+        _breaker.success()
+        for key in _l1_keys(ops):
+            _l1.invalidate(client, key)
+        return results
+
+    def get(self, key: str) -> Optional[str]:
+        client = self._client
+        if client is None:
+            return _memory_cache.get(key)
+        ttl = _l1.ttl_for(key)
+        if ttl:
+            val = _l1.get(key)
+            if val is not None:
+                return val
+            generation = _l1.generation
+        try:
+            val = client.get(key)
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.get(key)
+        _breaker.success()
+        self._count(val, key, ttl, generation if ttl else 0)
+        return val
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> bool:
+        """Store ``value``; with ``nx`` only if ``key`` is absent (False when it exists)."""
+        if nx:
+            return bool(self._call("set", key, value, ex=ex, nx=True))
         if ex is None:
-            client.set(key, value)
+            self._call("set", key, value)
         else:
-            client.setex(key, ex, value)
+            self._call("setex", key, ex, value)
+        return True
 
     def delete(self, key: str) -> None:
+        _memory_cache.delete(key)  # may hold a copy written while Redis was down
+        if self._client is not None:
+            self._call("delete", key)
+
+    def delete_if_equals(self, key: str, value: Any) -> bool:
+        """Delete ``key`` only while it still holds ``value``, atomically; True if deleted."""
         client = self._client
         if client is None:
-            _memory_cache.delete(key)
-            return
-        client.delete(key)
+            return _memory_cache.delete_if_equals(key, value)
+        try:
+            deleted = bool(client.eval(_DELETE_IF_EQUALS, 1, key, _encode(value)))
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.delete_if_equals(key, value)
+        _breaker.success()
+        if deleted and _l1.ttl_for(key):
+            _l1.invalidate(client, key)
+        return deleted
 
     def expire(self, key: str, ex: int) -> None:
-        client = self._client
-        if client is None:
-            _memory_cache.expire(key, ex)
+        self._call("expire", key, ex)
+
+    def mget(self, keys: list[str]) -> list[Optional[str]]:
+        """Values for ``keys`` in order (None where missing), in one round-trip."""
+        keys = list(keys)
+        if not keys:
+            return []
+        values = self._call("mget", keys)
+        if self._client is not None:
+            hits = sum(v is not None for v in values)
+            self.l2_hits += hits
+            self.l2_misses += len(values) - hits
+        return values
+
+    def mset(self, mapping: dict[str, Any], ex: Optional[int] = None) -> None:
+        """Write several keys at once; with ``ex`` each gets that TTL (atomically, via a pipeline)."""
+        if not mapping:
+            return
+        if ex is None:
+            self._call("mset", dict(mapping))
             return
-        client.expire(key, ex)
+        with self.pipeline() as pipe:
+            for k, v in mapping.items():
+                pipe.set(k, v, ex=ex)
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        return int(self._call("incrby", key, amount))
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        return self._call("hget", key, field)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return self._call("hgetall", key)
+
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[dict] = None) -> int:
+        if field is None:
+            return int(self._call("hset", key, mapping=mapping))
+        return int(self._call("hset", key, field, value, mapping=mapping))
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return int(self._call("hincrby", key, field, amount))
+
+    def hdel(self, key: str, *fields: str) -> int:
+        return int(self._call("hdel", key, *fields))
+
+    def pipeline(self) -> CachePipeline:
+        """Queue commands and send them together when the ``with`` block exits (or on ``execute()``)."""
+        return CachePipeline(self)
 
     def ping(self) -> bool:
         client = self._client
         if client is None:
             return _memory_cache.ping()
-        return bool(client.ping())
+        try:
+            ok = bool(client.ping())
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            raise
+        _breaker.success()
+        return ok
+
+    def stats(self) -> dict[str, Any]:
+        mem = _memory_cache.stats()
+        l1 = _l1.stats()
+        return {
+            "backend": "redis" if _breaker.state == "closed" and _redis_configured() else "memory",
+            "redis": redis_health(),
+            "memory": {**mem, "hit_ratio": _ratio(mem["hits"], mem["misses"])},
+            "l1": {**l1, "hit_ratio": _ratio(l1["hits"], l1["misses"])},
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_ratio": _ratio(self.l2_hits, self.l2_misses),
+            },
+        }
 
 
-# A ready-to-import singleton
+class AsyncCache(Cache):
+    """
+    ``Cache`` for async routes: the same fallback, breaker, L1 and counters,
+    with Redis calls awaited on redis.asyncio instead of blocking the event
+    loop. Memory and L1 lookups stay synchronous (no I/O).
+    """
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        args, kwargs = _prepare(name, args, kwargs)
+        client = await _aconnect_redis()
+        if client is None:
+            return _memory_cache._run(name, *args, **kwargs)
+        try:
+            result = await getattr(client, name)(*args, **kwargs)
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache._run(name, *args, **kwargs)
+        _breaker.success()
+        if name in _WRITES:
+            await self._invalidate(client, _l1_keys([(name, args, kwargs)]))
+        return result
+
+    async def _execute(self, ops: list[tuple[str, tuple, dict]]) -> list[Any]:
+        client = await _aconnect_redis()
+        if client is None:
+            return _memory_cache.apply(ops)
+        try:
+            pipe = client.pipeline(transaction=True)
+            for name, args, kwargs in ops:
+                getattr(pipe, name)(*args, **kwargs)
+            results = await pipe.execute()
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.apply(ops)
+        _breaker.success()
+        await self._invalidate(client, _l1_keys(ops))
+        return results
+
+    async def _invalidate(self, client, keys: list[str]) -> None:
+        for key in keys:
+            try:
+                await client.publish(_l1.channel, _l1.forget(key))
+            except Exception as e:
+                _l1.publish_failed(e)
+
+    async def get(self, key: str) -> Optional[str]:
+        client = await _aconnect_redis()
+        if client is None:
+            return _memory_cache.get(key)
+        ttl = _l1.ttl_for(key)
+        if ttl:
+            val = _l1.get(key)
+            if val is not None:
+                return val
+            generation = _l1.generation
+        try:
+            val = await client.get(key)
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.get(key)
+        _breaker.success()
+        self._count(val, key, ttl, generation if ttl else 0)
+        return val
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> bool:
+        if nx:
+            return bool(await self._call("set", key, value, ex=ex, nx=True))
+        if ex is None:
+            await self._call("set", key, value)
+        else:
+            await self._call("setex", key, ex, value)
+        return True
+
+    async def delete(self, key: str) -> None:
+        _memory_cache.delete(key)
+        if await _aconnect_redis() is not None:
+            await self._call("delete", key)
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        client = await _aconnect_redis()
+        if client is None:
+            return _memory_cache.delete_if_equals(key, value)
+        try:
+            deleted = bool(await client.eval(_DELETE_IF_EQUALS, 1, key, _encode(value)))
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            return _memory_cache.delete_if_equals(key, value)
+        _breaker.success()
+        if deleted and _l1.ttl_for(key):
+            await self._invalidate(client, [key])
+        return deleted
+
+    async def expire(self, key: str, ex: int) -> None:
+        await self._call("expire", key, ex)
+
+    async def mget(self, keys: list[str]) -> list[Optional[str]]:
+        keys = list(keys)
+        return await self._call("mget", keys) if keys else []
+
+    async def mset(self, mapping: dict[str, Any], ex: Optional[int] = None) -> None:
+        if not mapping:
+            return
+        if ex is None:
+            await self._call("mset", dict(mapping))
+            return
+        async with self.pipeline() as pipe:
+            for k, v in mapping.items():
+                pipe.set(k, v, ex=ex)
+
+    async def incrby(self, key: str, amount: int = 1) -> int:
+        return int(await self._call("incrby", key, amount))
+
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        return await self._call("hget", key, field)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return await self._call("hgetall", key)
+
+    async def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[dict] = None) -> int:
+        if field is None:
+            return int(await self._call("hset", key, mapping=mapping))
+        return int(await self._call("hset", key, field, value, mapping=mapping))
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return int(await self._call("hincrby", key, field, amount))
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        return int(await self._call("hdel", key, *fields))
+
+    def pipeline(self) -> AsyncCachePipeline:
+        """``async with async_cache.pipeline() as p: ...``; commands are sent on exit."""
+        return AsyncCachePipeline(self)
+
+    async def ping(self) -> bool:
+        client = await _aconnect_redis()
+        if client is None:
+            return _memory_cache.ping()
+        try:
+            ok = bool(await client.ping())
+        except _REDIS_ERRORS as e:
+            _breaker.failure(e)
+            raise
+        _breaker.success()
+        return ok
+
+
+# Ready-to-import singletons
 cache = Cache()
+async_cache = AsyncCache()
 
 # Backwards-compatible name used elsewhere in the codebase
 redis_client = cache
-
-
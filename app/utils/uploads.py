@@ -0,0 +1,133 @@
+"""
+Shared upload spooling for the transcription routes.
+
+Uploads are copied to disk chunk by chunk instead of ``await file.read()``-ing
+them into memory, with the size and SHA-256 computed on the way. The
+per-plan size limit (Settings.upload_limits_mb) is enforced before the copy
+when the size is already known and again while streaming, failing with 413.
+"""
+
+import hashlib
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import text as sqla_text
+
+from app.config import get_settings
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_PLAN = "free"
+
+
+@dataclass
+class SpooledUpload:
+    """Handle to an upload on disk; use as a context manager to delete it afterwards."""
+
+    path: Path
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+
+    @property
+    def size_mb(self) -> float:
+        return self.size / (1024 * 1024)
+
+    def cleanup(self) -> None:
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+
+def normalize_plan(plan_name: Optional[str]) -> str:
+    """Map a stored plan name (e.g. a Stripe nickname like "Pro Monthly") to a limits key."""
+    limits = get_settings().upload_limits_mb
+    name = (plan_name or "").lower()
+    for key in sorted(limits, key=len, reverse=True):
+        if key in name:
+            return key
+    return DEFAULT_PLAN
+
+
+def plan_for_user_id(db, user_id: Optional[int]) -> str:
+    """Plan of the user's active subscription, or the free plan."""
+    if not user_id:
+        return DEFAULT_PLAN
+    try:
+        row = db.execute(
+            sqla_text(
+                "SELECT plan_name FROM subscriptions "
+                "WHERE user_id = :u AND status IN ('active', 'trialing') "
+                "ORDER BY started_at DESC LIMIT 1"
+            ),
+            {"u": user_id},
+        ).first()
+    except Exception:
+        # No subscriptions table (dev DB) or a broken session: treat as free.
+        db.rollback()
+        return DEFAULT_PLAN
+    return normalize_plan(row[0] if row else None)
+
+
+def upload_limit_bytes(plan: Optional[str] = None) -> int:
+    limits = get_settings().upload_limits_mb
+    mb = limits.get(plan or DEFAULT_PLAN, limits.get(DEFAULT_PLAN, 0))
+    return int(mb * 1024 * 1024)
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"upload_too_large: limit is {limit // (1024 * 1024)} MB for your plan",
+    )
+
+
+async def spool_upload(
+    file: UploadFile,
+    *,
+    plan: Optional[str] = None,
+    dest: Optional[Path] = None,
+    default_ext: str = ".bin",
+) -> SpooledUpload:
+    """
+    Stream ``file`` to ``dest`` (default: a scratch file in the temp dir).
+
+    Raises 413 as soon as the upload exceeds the plan's limit; the partial
+    file is removed.
+    """
+    limit = upload_limit_bytes(plan)
+    if limit and file.size is not None and file.size > limit:
+        raise _too_large(limit)
+
+    if dest is None:
+        ext = Path(file.filename or "").suffix.lower() or default_ext
+        dest = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}{ext}"
+
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with dest.open("wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if limit and size > limit:
+                    raise _too_large(limit)
+                out.write(chunk)
+                digest.update(chunk)
+    except BaseException:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        raise
+    return SpooledUpload(path=dest, size=size, sha256=digest.hexdigest(), filename=file.filename)
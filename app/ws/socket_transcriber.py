@@ -1,12 +1,46 @@
 # === app/ws/socket_transcriber.py ===
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.services.stream_mux import get_stream_mux
+from app.services.streaming import StreamingRecognizer
+
+
+async def _send_segments(ws: WebSocket, segments: list[dict]) -> None:
+    for seg in segments:
+        await ws.send_json({"type": "final" if seg["final"] else "partial", **seg})
 
 
 async def websocket_endpoint(ws: WebSocket):
     """
     WebSocket endpoint for live transcription.
-    Currently a stub that sends a 'Live transcription coming soon.' message.
+
+    The client streams 16 kHz mono 16-bit PCM as binary frames and receives
+    ``{"type": "partial" | "final", id, text, start, end, final}`` messages.
+    Partials for one utterance share its id until the final replaces them.
+    When the server is at live-stream capacity the socket is closed with 1013.
     """
     await ws.accept()
-    await ws.send_text("Live transcription coming soon.")
-    # TODO: hook up real-time transcription stream here
+    mux = get_stream_mux()
+    session = mux.admit() if mux is not None else None
+    if mux is not None and session is None:
+        # Decoding one more stream would push every caption past the latency SLO.
+        await ws.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="stream_capacity_reached")
+        return
+    streamer = StreamingRecognizer(
+        language=ws.query_params.get("language") or None,
+        decode=session.decode if session is not None else None,
+    )
+    try:
+        while True:
+            chunk = await ws.receive_bytes()
+            await _send_segments(ws, await streamer.feed(chunk))
+    except WebSocketDisconnect:
+        # Flush so the buffer is released; the finals only reach a half-closed client.
+        segments = await streamer.flush()
+        try:
+            await _send_segments(ws, segments)
+        except (RuntimeError, WebSocketDisconnect):
+            pass
+    finally:
+        if session is not None:
+            session.close()
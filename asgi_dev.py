@@ -1,6 +1,6 @@
-# asgi_dev.py — dev API with lazy Whisper loading and python-jose JWT
+# asgi_dev.py — dev API with background Whisper warm-up and python-jose JWT
 # Includes all endpoints from main.py + /api/video-task endpoint (video transcription/subtitle)
-# - Avoids heavy ASR loading at startup
+# - Loads and warms ASR models in the background at startup (/readyz gates traffic)
 # - Secure JWT auth
 # - Compatible with VideoUpload.jsx frontend
 # - Includes all routes from main.py for complete API access
@@ -14,17 +14,33 @@ from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, UploadFile, status, BackgroundTasks, APIRouter
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, UploadFile, status, BackgroundTasks, APIRouter, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
-from sqlalchemy import Column, DateTime, Integer, String, Text, create_engine, select
+from sqlalchemy import Column, DateTime, Integer, String, Text, create_engine, inspect, select
 from sqlalchemy import text as sqla_text
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+from app.config import get_settings
+from app.services.batching import batching_enabled, get_batch_scheduler
+from app.services.asr_executor import busy_response, get_asr_executor, run_asr
+from app.services.decode_profiles import DecodeProfile, get_profile, resolve_profile
+from app.services.job_queue import JobQueue, QueueFullError, worker_gone, worker_id
+from app.services.model_registry import (
+    ModelKey,
+    get_model_registry,
+    pick_device_and_compute,
+)
+from app.services.result_cache import entry_from_segments, entry_text, get_result_cache, profile_key
+from app.services.tuning import get_tuned_profile
+from app.services.vad import Prepass, run_prepass
+from app.services.warmup import get_warmup, start_warmup
+from app.utils.uploads import plan_for_user_id, spool_upload
 
 
 load_dotenv(".env")
@@ -50,8 +66,6 @@ STORAGE_DIR = Path(os.getenv("STORAGE_DIR", "data")).resolve()
 ASGI_ENABLE_TRANSCRIBE = os.getenv("ASGI_ENABLE_TRANSCRIBE", "1") == "1"
 ASGI_LOAD_MODEL = os.getenv("ASGI_LOAD_MODEL", "0") == "1"
 MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
-ENV_DEVICE = os.getenv("WHISPER_DEVICE")
-ENV_COMPUTE = os.getenv("WHISPER_COMPUTE")
 
 # ---------- db ----------
 engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
@@ -76,6 +90,8 @@ class Job(Base):
     status = Column(String, nullable=False, server_default="queued")
     transcript = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=sqla_text("CURRENT_TIMESTAMP"))
+    owner = Column(String, nullable=True)  # job_queue.worker_id() of the process whose queue holds it
+    user_id = Column(Integer, nullable=True)  # None for anonymous uploads
 
 # ---------- schemas ----------
 class Token(BaseModel):
@@ -109,18 +125,6 @@ def create_access_token(sub: int | str, expires_minutes: int = ACCESS_TOKEN_EXPI
     return jwt.encode(payload, SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
-def pick_device_and_compute() -> tuple[str, str]:
-    if ENV_DEVICE:
-        return ENV_DEVICE, (ENV_COMPUTE or ("float16" if ENV_DEVICE == "cuda" else "int8"))
-    try:
-        import ctranslate2 as ct2
-        if getattr(ct2, "get_cuda_device_count", lambda: 0)() > 0:
-            return "cuda", "float16"
-    except Exception:
-        pass
-    return "cpu", "int8"
-
-
 def has_onnxruntime() -> bool:
     try:
         import onnxruntime  # noqa: F401
@@ -150,36 +154,100 @@ app.add_middleware(
 log = logging.getLogger("echoscript")
 logging.basicConfig(level=logging.INFO)
 
-WHISPER = None
 VAD_ENABLED = False
 DEVICE = "cpu"
 COMPUTE = "int8"
 
 
-def _load_model_if_needed():
-    """Lazy-load Whisper only when required (or if ASGI_LOAD_MODEL=1)."""
-    global WHISPER, VAD_ENABLED, DEVICE, COMPUTE
-    if WHISPER is not None:
-        return
-    try:
-        from faster_whisper import WhisperModel
-    except Exception as e:
-        raise RuntimeError(
-            "Whisper not installed or import failed. "
-            "Install faster-whisper and its dependencies.\n"
-            f"Original error: {e}"
-        )
+def _model_key() -> ModelKey:
+    global DEVICE, COMPUTE
     DEVICE, COMPUTE = pick_device_and_compute()
+    return ModelKey(MODEL_SIZE, DEVICE, COMPUTE)
+
+
+def _load_model_if_needed(key: ModelKey | None = None):
+    """Ensure the default (or given) Whisper model is resident in the shared model registry."""
+    global VAD_ENABLED
     VAD_ENABLED = has_onnxruntime()
-    WHISPER = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type=ENV_COMPUTE or COMPUTE)
+    with get_model_registry().lease(key or _model_key()):
+        pass
+
+
+def _preload_keys() -> list[ModelKey]:
+    # The default model, plus any sizes listed in ASR_PRELOAD_MODELS; the rest load on first use.
+    key = _model_key()
+    extra = get_settings().asr_preload_models
+    return [key] + [ModelKey(size, key.device, key.compute_type) for size in extra]
+
+
+_PROCESS_STARTED = datetime.now(UTC)
+
+
+def _ensure_job_columns() -> None:
+    """create_all() does not alter existing tables; add the job ownership columns if missing."""
+    have = {c["name"] for c in inspect(engine).get_columns("jobs")}
+    for name, ddl in (("owner", "VARCHAR"), ("user_id", "INTEGER")):
+        if name in have:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(sqla_text(f"ALTER TABLE jobs ADD COLUMN {name} {ddl}"))
+        except Exception:
+            # A sibling worker starting at the same time may have added it first.
+            if name not in {c["name"] for c in inspect(engine).get_columns("jobs")}:
+                raise
+
+
+def _fail_interrupted_jobs() -> None:
+    """
+    Jobs live in the in-memory queue of the worker that accepted them, so
+    any left queued or processing by a worker that has exited will never
+    finish; fail them so /api/v1/jobs/{id} stops polling. Jobs owned by
+    live sibling workers are left alone. Rows from before jobs had an owner
+    are failed only if they predate this process.
+    """
+    db = SessionLocal()
+    try:
+        active = Job.status.in_(("queued", "processing"))
+        owned = db.execute(select(Job.id, Job.owner).where(active, Job.owner.is_not(None))).all()
+        gone = [r.id for r in owned if worker_gone(r.owner)]
+        gone += db.scalars(
+            select(Job.id).where(active, Job.owner.is_(None), Job.created_at < _PROCESS_STARTED)
+        ).all()
+        if gone:
+            db.query(Job).filter(Job.id.in_(gone)).update(
+                {Job.status: "error", Job.transcript: "interrupted: the server restarted before the job finished"},
+                synchronize_session=False,
+            )
+        db.commit()
+        if gone:
+            log.warning("Marked %d interrupted job(s) as failed", len(gone))
+    except Exception as e:
+        db.rollback()
+        log.error(f"Could not recover interrupted jobs: {e}")
+    finally:
+        db.close()
 
 
 @app.on_event("startup")
 def on_startup():
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
     Base.metadata.create_all(bind=engine)
-    if ASGI_LOAD_MODEL and ASGI_ENABLE_TRANSCRIBE:
-        _load_model_if_needed()
+    _ensure_job_columns()
+    _fail_interrupted_jobs()
+    settings = get_settings()
+    if ASGI_ENABLE_TRANSCRIBE and (ASGI_LOAD_MODEL or settings.asr_preload):
+        global VAD_ENABLED
+        VAD_ENABLED = has_onnxruntime()
+        # ASGI_LOAD_MODEL=1 keeps the old blocking behaviour; otherwise /readyz gates traffic.
+        start_warmup(
+            _preload_keys(),
+            settings.asr_warmup_audio,
+            settings.asr_warmup_seconds,
+            background=not ASGI_LOAD_MODEL,
+            retry_s=settings.asr_warmup_retry_s,
+            retry_max_s=settings.asr_warmup_retry_max_s,
+        )
     _mount_all_routes()
 
 
@@ -198,18 +266,53 @@ def v1_health_ok() -> str:
     return "ok"
 
 
+@app.get("/livez", response_class=PlainTextResponse)
+def livez() -> str:
+    """The process is up and serving; says nothing about models or the database."""
+    return "ok"
+
+
+@app.get("/readyz")
+def readyz():
+    """
+    200 once the database answers and the first startup warm-up (if any) has
+    finished; 503 before. If warm-up failed the worker still takes traffic
+    ("degraded": transcription loads models lazily) while warm-up retries.
+    """
+    warmup = get_warmup()
+    body = {"status": "ready", "warmup": warmup.state if warmup else "lazy"}
+    try:
+        with engine.connect() as conn:
+            conn.execute(sqla_text("select 1"))
+    except Exception as e:
+        body.update(status="not_ready", db=f"{e.__class__.__name__}: {e}")
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if warmup is not None and warmup.degraded:
+        body.update(status="degraded", error=warmup.error)
+    elif warmup is not None and not warmup.ready:
+        body.update(status="not_ready", error=warmup.error)
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return body
+
+
 @app.get("/healthz")
 def healthz():
     with engine.connect() as conn:
         conn.execute(sqla_text("select 1"))
+    warmup = get_warmup()
     return {
         "status": "ok",
         "model": MODEL_SIZE,
         "device": DEVICE,
-        "compute_type": ENV_COMPUTE or COMPUTE,
+        "compute_type": COMPUTE,
         "vad": VAD_ENABLED,
         "transcribe_enabled": ASGI_ENABLE_TRANSCRIBE,
-        "whisper_loaded": WHISPER is not None,
+        "whisper_loaded": get_model_registry().peek(_model_key()) is not None,
+        "models": get_model_registry().stats(),
+        "job_queue": _JOB_QUEUE.stats(),
+        "asr_executor": get_asr_executor().stats(),
+        "warmup": warmup.stats() if warmup else {"state": "lazy"},
+        "tuned_profile": profile.to_dict() if (profile := get_tuned_profile()) else None,
     }
 
 
@@ -402,119 +505,308 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 # ---------- transcription ----------
-def _transcribe_file(audio_path: Path, language: str | None = "en") -> str:
-    _load_model_if_needed()
-    segments, _info = WHISPER.transcribe(
-        str(audio_path),
-        beam_size=5,
-        best_of=1,
-        vad_filter=VAD_ENABLED,
-        language=language,
-        temperature=0.0,
-        condition_on_previous_text=True,
+def _default_profile() -> DecodeProfile:
+    return get_profile(get_settings().asr_default_profile)
+
+
+def _result_cache_key(sha256: str, language: str | None, profile: DecodeProfile | None = None) -> str:
+    return profile_key(sha256, language, profile or _default_profile())
+
+
+def _cached_entry(sha256: str, language: str | None, profile: DecodeProfile | None = None) -> dict | None:
+    cache = get_result_cache()
+    if cache is None:
+        return None
+    return cache.get(_result_cache_key(sha256, language, profile))
+
+
+def _transcribe_file(
+    audio_path: Path,
+    language: str | None = "en",
+    sha256: str | None = None,
+    profile: DecodeProfile | None = None,
+) -> str:
+    return entry_text(_transcribe_entry(audio_path, language=language, sha256=sha256, profile=profile))
+
+
+def _transcribe_entry(
+    audio_path: Path,
+    language: str | None = "en",
+    sha256: str | None = None,
+    profile: DecodeProfile | None = None,
+) -> dict:
+    """
+    Transcribe ``audio_path`` to ``{"language", "segments": [{start, end, text, ...}]}``
+    with the given decode profile (default: ASR_DEFAULT_PROFILE); with ``sha256``
+    the result cache is consulted and filled.
+
+    The VAD pre-pass (ASR_VAD_PREPASS) runs first: uploads without speech are
+    answered without loading a model, and only the speech is decoded.
+    """
+    profile = profile or _default_profile()
+    if sha256:
+        cached = _cached_entry(sha256, language, profile)
+        if cached is not None:
+            return cached
+    prep = run_prepass(audio_path, sha256=sha256)
+    if prep is not None and prep.silent:
+        entry = entry_from_segments([], language)
+    else:
+        entry = _decode_entry(audio_path, language, profile, prep)
+    cache = get_result_cache() if sha256 else None
+    if cache is not None:
+        try:
+            cache.put(_result_cache_key(sha256, language, profile), entry)
+        except OSError as e:
+            log.warning("Could not write result cache entry: %s", e)
+    return entry
+
+
+def _decode_entry(audio_path: Path, language: str | None, profile: DecodeProfile, prep: Prepass | None) -> dict:
+    key = profile.model_key()
+    _load_model_if_needed(key)
+    if batching_enabled():
+        if prep is not None:
+            audio, clips = prep.samples, prep.clips
+        else:
+            from faster_whisper import decode_audio
+
+            audio, clips = decode_audio(str(audio_path)), None
+        # Short clips share a batched decode with other in-flight requests.
+        result = get_batch_scheduler(key).transcribe(
+            audio,
+            language=language,
+            clips=clips,
+            **profile.options(vad=False),
+        )
+        segments, detected = result.segments, result.language
+    else:
+        with get_model_registry().lease(key) as model:
+            if prep is not None:
+                segments, info = model.transcribe(
+                    prep.samples,
+                    language=language,
+                    clip_timestamps=prep.clip_seconds(),
+                    **profile.options(vad=False),
+                )
+            else:
+                segments, info = model.transcribe(
+                    str(audio_path),
+                    language=language,
+                    **profile.options(vad=VAD_ENABLED),
+                )
+            # segments is a lazy generator: decode while we still hold the model
+            segments, detected = list(segments), info.language
+    entry = entry_from_segments(segments, detected)
+    if prep is not None and prep.start:
+        # Timestamps are relative to the trimmed audio; move them back onto the file's timeline.
+        for item in entry["segments"]:
+            item["start"] = round(item["start"] + prep.offset, 3)
+            item["end"] = round(item["end"] + prep.offset, 3)
+    return entry
+
+
+def _set_job_status(db: Session, job_id: str, status_: str, transcript: str | None = None) -> None:
+    db.execute(
+        sqla_text("UPDATE jobs SET status=:s, transcript=:t WHERE id=:i"),
+        {"s": status_, "t": transcript, "i": job_id},
     )
-    parts = [
-        getattr(seg, "text", "").strip()
-        for seg in segments
-        if getattr(seg, "text", "").strip()
-    ]
-    return (" ".join(parts)).strip() or "(empty transcript)"
+    db.commit()
+
+
+def _optional_user_id(authorization: str | None) -> int | None:
+    """User id from an optional ``Authorization: Bearer`` header; None when absent or invalid."""
+    from jose import JWTError
+
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        user_id = payload.get("sub")
+        return int(user_id) if user_id else None
+    except (JWTError, ValueError, TypeError) as e:
+        log.warning(f"Could not decode JWT token: {e}")
+        return None
+
+
+def _save_user_transcript(
+    db: Session,
+    user_id: int | None,
+    original_filename: str | None,
+    storage_filename: str,
+    text: str,
+    file_size: int,
+    language: str | None,
+    segments: list[dict] | None = None,
+) -> None:
+    """ALSO save to transcripts table (and its timed segments) for authenticated users."""
+    if not user_id:
+        log.info(f"No authenticated user, transcript only saved to jobs table")
+        return
+    try:
+        from app.models import Transcript
+
+        transcript = Transcript(
+            user_id=user_id,
+            title=original_filename or f"Transcript {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            original_filename=original_filename,
+            storage_filename=storage_filename,
+            content=text,
+            duration=None,
+            file_size=file_size,
+            language=language if language != "auto" else "en",
+            status="completed"
+        )
+
+        db.add(transcript)
+        db.commit()
+        db.refresh(transcript)
+        log.info(f"Transcript saved to transcripts table with id={transcript.id} for user={user_id}")
+    except Exception as e:
+        db.rollback()
+        log.error(f"Failed to save to transcripts table: {e}")
+        return
+    if segments:
+        # Separate commit: the transcript (with its full text) stays even if the segments fail.
+        from app.services.segment_store import store_segments
+
+        store_segments(db, transcript.id, segments)
+        # Don't fail the job if transcript save fails
+
+
+def _run_transcription_job(
+    job_id: str,
+    target: Path,
+    language: str | None,
+    user_id: int | None,
+    original_filename: str | None,
+    file_size: int,
+    sha256: str | None = None,
+    profile_name: str | None = None,
+) -> None:
+    """Worker-side half of /api/v1/transcribe: queued -> processing -> done/error."""
+    db = SessionLocal()
+    try:
+        _set_job_status(db, job_id, "processing")
+        try:
+            profile = get_profile(profile_name) if profile_name else None
+            entry = _transcribe_entry(target, language=language, sha256=sha256, profile=profile)
+        except Exception as e:
+            log.exception("transcription_failed for job %s", job_id)
+            _set_job_status(db, job_id, "error", f"transcription_error: {e}")
+            return
+        text = entry_text(entry)
+        _set_job_status(db, job_id, "done", text)
+        _save_user_transcript(
+            db, user_id, original_filename, target.name, text, file_size, language, entry["segments"]
+        )
+    finally:
+        db.close()
+
+
+_JOB_QUEUE = JobQueue(
+    workers=get_settings().asr_job_workers,
+    name="asr-job",
+    max_queued=get_settings().asr_job_max_queued,
+)
+
+
+def _add_job(db: Session, job: Job) -> None:
+    db.add(job)
+    db.commit()
 
 
-@app.post("/api/v1/transcribe", response_model=JobOut)
+@app.post("/api/v1/transcribe", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
 async def transcribe(
+    response: Response,
     file: UploadFile = File(...), 
     db: Session = Depends(get_db), 
     language: str | None = "en",
+    profile: str | None = None,
     authorization: Optional[str] = Header(None)
 ):
+    """
+    Spool the upload, queue the job and return its id; poll /api/v1/jobs/{id} for the result.
+    ``profile`` (fast|balanced|accurate) trades speed for accuracy within the user's plan.
+
+    A byte-identical upload that was already transcribed with the same settings
+    is answered straight from the result cache (200, status "done").
+    """
     if not ASGI_ENABLE_TRANSCRIBE:
         raise HTTPException(status_code=503, detail="transcription_disabled")
 
-    # Try to get current user from authorization header
-    current_user_id = None
-    try:
-        from app.dependencies import get_current_user
-        from app.models import Transcript, User
-        from fastapi import Header, Request
-        from jose import jwt, JWTError
-        
-        # Try to extract token from Authorization header
-        token = authorization
-        if token and token.startswith("Bearer "):
-            token = token[7:]
-            try:
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-                user_id = payload.get("sub")
-                if user_id:
-                    current_user_id = int(user_id)
-                    log.info(f"Authenticated user_id={current_user_id} for transcription")
-            except (JWTError, ValueError, TypeError) as e:
-                log.warning(f"Could not decode JWT token: {e}")
-    except Exception as e:
-        log.warning(f"Could not authenticate user: {e}")
+    current_user_id = _optional_user_id(authorization)
+    if current_user_id:
+        log.info(f"Authenticated user_id={current_user_id} for transcription")
 
     ext = Path(file.filename).suffix.lower() or ".bin"
     job_id = str(uuid.uuid4())
     target = STORAGE_DIR / f"{job_id}{ext}"
 
-    file_size = 0
-    with target.open("wb") as out:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            out.write(chunk)
-            file_size += len(chunk)
+    # Database and result-cache I/O is blocking too; keep it off the event loop.
+    plan = await run_in_threadpool(plan_for_user_id, db, current_user_id)
+    decode_profile = resolve_profile(profile, plan)
+    upload = await spool_upload(file, plan=plan, dest=target)
+    file_size, sha256 = upload.size, upload.sha256
 
-    db.add(Job(id=job_id, filename=target.name, status="processing", transcript=None))
-    db.commit()
+    cached = await run_in_threadpool(_cached_entry, sha256, language, decode_profile)
+    if cached is not None:
+        text = entry_text(cached)
 
-    try:
-        text = _transcribe_file(target, language=language)
-        db.execute(
-            sqla_text("UPDATE jobs SET status=:s, transcript=:t WHERE id=:i"),
-            {"s": "done", "t": text, "i": job_id},
-        )
-        db.commit()
-        
-        # ALSO save to transcripts table for authenticated users
-        if current_user_id:
-            try:
-                from app.models import Transcript
-                
-                transcript = Transcript(
-                    user_id=current_user_id,
-                    title=file.filename or f"Transcript {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                    original_filename=file.filename,
-                    storage_filename=target.name,
-                    content=text,
-                    duration=None,
-                    file_size=file_size,
-                    language=language if language != "auto" else "en",
-                    status="completed"
-                )
-                
-                db.add(transcript)
-                db.commit()
-                db.refresh(transcript)
-                log.info(f"Transcript saved to transcripts table with id={transcript.id} for user={current_user_id}")
-            except Exception as e:
-                log.error(f"Failed to save to transcripts table: {e}")
-                # Don't fail the request if transcript save fails
-        else:
-            log.info(f"No authenticated user, transcript only saved to jobs table")
-        
+        def save_cached() -> None:
+            _add_job(db, Job(id=job_id, filename=target.name, status="done", transcript=text, user_id=current_user_id))
+            _save_user_transcript(
+                db, current_user_id, file.filename, target.name, text, file_size, language, cached["segments"]
+            )
+
+        await run_in_threadpool(save_cached)
+        response.status_code = status.HTTP_200_OK
         return JobOut(job_id=job_id, status="done", filename=target.name, transcript=text)
-    except Exception as e:
-        import logging
-        logging.exception(f"transcription_failed for job {job_id}")
-        db.execute(
-            sqla_text("UPDATE jobs SET status=:s, transcript=:t WHERE id=:i"),
-            {"s": "error", "t": f"transcription_error: {e}", "i": job_id},
+
+    await run_in_threadpool(
+        _add_job,
+        db,
+        Job(
+            id=job_id,
+            filename=target.name,
+            status="queued",
+            transcript=None,
+            owner=worker_id(),
+            user_id=current_user_id,
+        ),
+    )
+
+    try:
+        _JOB_QUEUE.submit(
+            _run_transcription_job,
+            job_id,
+            target,
+            language,
+            current_user_id,
+            file.filename,
+            file_size,
+            sha256,
+            decode_profile.name,
         )
-        db.commit()
-        return JSONResponse(status_code=500, content={"detail": "transcription_failed", "job_id": job_id, "error": str(e)})
+    except QueueFullError as e:
+
+        def drop_job() -> None:
+            db.execute(sqla_text("DELETE FROM jobs WHERE id=:i"), {"i": job_id})
+            db.commit()
+
+        await run_in_threadpool(drop_job)
+        target.unlink(missing_ok=True)
+        raise busy_response(e) from None
+    return JobOut(job_id=job_id, status="queued", filename=target.name)
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobOut)
+def get_job(job_id: str, db: Session = Depends(get_db), authorization: Optional[str] = Header(None)):
+    job = db.get(Job, job_id)
+    # A signed-in user's job is only visible to them; 404 rather than 403 so ids don't leak.
+    if job is None or (job.user_id is not None and job.user_id != _optional_user_id(authorization)):
+        raise HTTPException(status_code=404, detail="job_not_found")
+    return JobOut(job_id=job.id, status=job.status, filename=job.filename, transcript=job.transcript)
 
 
 # ---------- video-task endpoint for VideoUpload.jsx ----------
@@ -523,24 +815,25 @@ async def video_task(
     file: UploadFile = File(...),
     task_type: str = Form("transcription"),
     language: str = Form("auto"),
+    profile: Optional[str] = Form(None),
 ):
     """Handles both transcription and subtitle generation from video upload."""
     if not ASGI_ENABLE_TRANSCRIBE:
         raise HTTPException(status_code=503, detail="transcription_disabled")
+    # Anonymous endpoint: the free plan's profiles apply
+    decode_profile = resolve_profile(profile, None)
 
     ext = Path(file.filename).suffix.lower() or ".mp4"
     job_id = str(uuid.uuid4())
     video_path = STORAGE_DIR / f"{job_id}{ext}"
 
-    with video_path.open("wb") as out:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            out.write(chunk)
+    upload = await spool_upload(file, dest=video_path)
 
     try:
-        result_text = _transcribe_file(video_path, language=language)
+        # The upload hash lets repeat tasks on the same media reuse its decoded PCM (and result).
+        result_text = await run_asr(
+            _transcribe_file, video_path, language=language, sha256=upload.sha256, profile=decode_profile
+        )
         if task_type == "subtitles":
             # Basic SRT formatting
             subtitles = "\n".join(
@@ -548,6 +841,8 @@ async def video_task(
             )
             return {"status": "success", "subtitles": subtitles}
         return {"status": "success", "transcript": result_text}
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
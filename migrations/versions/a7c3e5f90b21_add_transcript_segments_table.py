@@ -0,0 +1,33 @@
+"""Add transcript_segments table
+
+Revision ID: a7c3e5f90b21
+Revises: d4f21b8e9a12
+Create Date: 2026-10-17 10:12:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a7c3e5f90b21'
+down_revision = 'd4f21b8e9a12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transcript_segments',
+        sa.Column('transcript_id', sa.Integer(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('start_ms', sa.Integer(), nullable=False),
+        sa.Column('end_ms', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('speaker', sa.String(length=32), nullable=True),
+        sa.Column('avg_logprob', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['transcript_id'], ['transcripts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('transcript_id', 'seq')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transcript_segments')
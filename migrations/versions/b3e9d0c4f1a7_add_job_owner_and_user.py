@@ -0,0 +1,24 @@
+"""Add owner and user_id to jobs
+
+Revision ID: b3e9d0c4f1a7
+Revises: a7c3e5f90b21
+Create Date: 2026-10-17 12:40:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b3e9d0c4f1a7'
+down_revision = 'a7c3e5f90b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('owner', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('user_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'user_id')
+    op.drop_column('jobs', 'owner')
@@ -0,0 +1,69 @@
+"""
+Requests/second of the micro-batch scheduler as a function of batch size.
+
+Cuts the bundled sample into short clips, fires them at the scheduler from
+concurrent threads (simulating simultaneous uploads) and reports throughput
+and latency per batch size on CPU int8.
+
+Usage: python scripts/bench_batching.py [audio] [--model small] [--clips 32]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from faster_whisper import decode_audio  # noqa: E402
+
+from app.services.batching import SAMPLE_RATE, BatchScheduler  # noqa: E402
+from app.services.model_registry import ModelKey, get_model_registry  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("audio", nargs="?", default="test.mp3")
+    ap.add_argument("--model", default="small")
+    ap.add_argument("--clips", type=int, default=32)
+    ap.add_argument("--clip-seconds", type=float, default=8.0)
+    ap.add_argument("--batch-sizes", default="1,2,4,8,16")
+    ap.add_argument("--max-wait-ms", type=float, default=50.0)
+    args = ap.parse_args()
+
+    audio = decode_audio(args.audio, sampling_rate=SAMPLE_RATE)
+    step = int(args.clip_seconds * SAMPLE_RATE)
+    pieces = [audio[i : i + step] for i in range(0, max(1, audio.shape[0] - step), step)]
+    clips = [pieces[i % len(pieces)] for i in range(args.clips)]
+
+    key = ModelKey(args.model, "cpu", "int8")
+    registry = get_model_registry()
+    with registry.lease(key):  # load once, outside the timed region
+        pass
+
+    print(f"model={args.model} cpu/int8 clips={len(clips)} x {args.clip_seconds:.0f}s")
+    print(f"{'batch':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'avg batch':>9}")
+    for size in [int(x) for x in args.batch_sizes.split(",")]:
+        sched = BatchScheduler(key, max_batch_size=size, max_wait_ms=args.max_wait_ms)
+        latencies: list[float] = []
+
+        def one(clip):
+            t0 = time.perf_counter()
+            sched.submit(clip, language="en", beam_size=1).result()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(clips)) as pool:
+            list(pool.map(one, clips))
+        wall = time.perf_counter() - started
+        latencies.sort()
+        print(
+            f"{size:>5} {len(clips) / wall:>8.2f} {statistics.median(latencies):>8.0f} "
+            f"{latencies[int(len(latencies) * 0.95) - 1]:>8.0f} {sched.stats()['avg_batch']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
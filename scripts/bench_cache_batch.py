@@ -0,0 +1,127 @@
+"""
+Round-trips saved by batching cache commands.
+
+For each batch size, times N single ``get``/``incrby`` calls against one
+``mget`` and one ``pipeline()`` doing the same work through the Cache facade.
+
+Uses Redis at REDIS_URL when it answers a PING. Otherwise the memory fallback
+is wrapped in a fake client that sleeps --rtt milliseconds per round-trip, so
+the numbers show what batching saves over a network of that latency.
+
+Usage: python scripts/bench_cache_batch.py [--sizes 1,10,100,1000] [--rtt 0.3] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import get_settings  # noqa: E402
+from app.utils.redis_client import Cache, _MemoryCache  # noqa: E402
+
+rc = sys.modules["app.utils.redis_client"]
+
+
+class _SlowPipe:
+    def __init__(self, client):
+        self.client, self.ops = client, []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.ops.append((name, a, kw))
+
+    def execute(self):
+        self.client.round_trip()
+        return self.client.mem.apply(self.ops)
+
+
+class _SimulatedRedis:
+    """In-memory store that pays ``rtt`` seconds per round-trip."""
+
+    def __init__(self, rtt: float):
+        self.mem = _MemoryCache(sweep_interval=0)
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def __getattr__(self, name):
+        def call(*a, **kw):
+            self.round_trip()
+            return getattr(self.mem, name)(*a, **kw)
+
+        return call
+
+    def pipeline(self, transaction=True):
+        return _SlowPipe(self)
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1,10,100,1000")
+    ap.add_argument("--rtt", type=float, default=0.3, help="simulated round-trip in ms (no Redis only)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    cache = Cache()
+    try:
+        cache.ping()
+        backend = "redis" if rc._connect_redis() is not None else None
+    except Exception:
+        backend = None
+    if backend is None:
+        fake = _SimulatedRedis(args.rtt / 1000)
+        settings = get_settings()
+        settings.REDIS_ENABLED, settings.REDIS_URL = True, "redis://simulated"
+        rc._sync_client = lambda: fake
+        rc._breaker.success()
+        backend = f"simulated, rtt {args.rtt} ms"
+    print(f"backend: {backend}")
+    print(f"{'n':>6} {'get x n':>10} {'mget':>10} {'incr x n':>10} {'pipeline':>10} {'speedup':>8}")
+
+    for n in (int(x) for x in args.sizes.split(",")):
+        keys = [f"bench:{n}:{i}" for i in range(n)]
+        cache.mset({k: "0" for k in keys})
+
+        def singles_get():
+            for k in keys:
+                cache.get(k)
+
+        def batch_get():
+            cache.mget(keys)
+
+        def singles_incr():
+            for k in keys:
+                cache.incrby(k)
+
+        def batch_incr():
+            with cache.pipeline() as p:
+                for k in keys:
+                    p.incrby(k)
+
+        repeat = args.repeat if n <= 100 else 1
+        g1, g2 = _best(singles_get, repeat), _best(batch_get, repeat)
+        i1, i2 = _best(singles_incr, repeat), _best(batch_incr, repeat)
+        print(
+            f"{n:>6} {g1 * 1000:>8.2f}ms {g2 * 1000:>8.2f}ms {i1 * 1000:>8.2f}ms {i2 * 1000:>8.2f}ms"
+            f" {(g1 + i1) / (g2 + i2):>7.1f}x"
+        )
+        with cache.pipeline() as p:
+            for k in keys:
+                p.delete(k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Real-time factor of the diarization backends on CPU.
+
+Decodes the audio once, runs the built-in fast diarizer and (when installed)
+pyannote on it, and prints wall time, RTF (= wall time / audio duration;
+below 1.0 is faster than real time) and the number of turns and speakers
+each one found.
+
+Usage: python scripts/bench_diarization.py [audio] [--speakers N] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from faster_whisper import decode_audio  # noqa: E402
+
+from app.services import fast_diarizer  # noqa: E402
+from app.services.audio import SAMPLE_RATE, DecodedAudio  # noqa: E402
+from app.services.transcription import FasterWhisperTranscriber, _HAS_PYANNOTE  # noqa: E402
+
+
+def _run(name, fn, duration, repeat):
+    best, turns = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        turns = fn()
+        best = min(best, time.perf_counter() - t0)
+    speakers = len({lab for _, _, lab in turns})
+    print(f"{name:<10}{best:>9.2f}{best / duration:>8.3f}{len(turns):>8}{speakers:>10}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("audio", nargs="?", default="test.mp3")
+    ap.add_argument("--speakers", type=int, default=None, help="speaker-count hint")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    audio = DecodedAudio(decode_audio(args.audio, sampling_rate=SAMPLE_RATE))
+    print(f"{args.audio}: {audio.duration:.1f} s\n")
+    print(f"{'backend':<10}{'wall s':>9}{'RTF':>8}{'turns':>8}{'speakers':>10}")
+
+    if fast_diarizer.available():
+        dia = fast_diarizer.FastDiarizer()
+        _run("fast", lambda: dia(audio, num_speakers=args.speakers), audio.duration, args.repeat)
+    else:
+        print("fast      skipped (librosa not installed)")
+
+    if _HAS_PYANNOTE:
+        pipeline = FasterWhisperTranscriber()._ensure_diarizer()
+        kwargs = {"num_speakers": args.speakers} if args.speakers else {}
+
+        def run_pyannote():
+            ann = pipeline(audio.pyannote_input(), **kwargs)
+            return [(s.start, s.end, lab) for s, lab in ann.itertracks(yield_label=True)]
+
+        # pyannote is slow enough on CPU that one run is representative.
+        _run("pyannote", run_pyannote, audio.duration, 1)
+    else:
+        print("pyannote  skipped (pyannote.audio not installed)")
+
+
+if __name__ == "__main__":
+    main()
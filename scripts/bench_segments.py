@@ -0,0 +1,106 @@
+"""
+Heap footprint and serialization time of transcript segment representations.
+
+Synthesises a long transcript (default 10 hours at ~3 s per segment, three
+speakers) and measures it as a list of dicts (what compact_endpoints built),
+a list of Segment dataclasses, and a SegmentTable. Memory is the tracemalloc
+delta while building each one from the same source tuples.
+
+Usage: python scripts/bench_segments.py [--hours 10] [--seg-seconds 3]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.segment_table import SegmentTable  # noqa: E402
+from app.services.transcription import Segment  # noqa: E402
+
+_WORDS = "the of and to in is you that it he was for on are as with his they at be this have from".split()
+
+
+def _source(n: int, seg_s: float) -> list[tuple[float, float, str, str]]:
+    rnd = random.Random(0)
+    rows = []
+    for i in range(n):
+        start = i * seg_s
+        text = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(6, 14)))
+        rows.append((start, start + seg_s * 0.9, text, f"SPEAKER_{i % 3:02d}"))
+    return rows
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - t0
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def _srt_from_dicts(segments: list[dict]) -> str:
+    def ts(sec: float) -> str:
+        ms = int(round(sec * 1000))
+        h, ms = divmod(ms, 3_600_000)
+        m, ms = divmod(ms, 60_000)
+        s, ms = divmod(ms, 1000)
+        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+    return "\n".join(
+        f"{i}\n{ts(seg['start'])} --> {ts(seg['end'])}\n{seg['text']}\n" for i, seg in enumerate(segments, 1)
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hours", type=float, default=10.0)
+    ap.add_argument("--seg-seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    n = int(args.hours * 3600 / args.seg_seconds)
+    # Each representation gets its own copy of the strings so none is credited with another's text.
+    src = _source(n, args.seg_seconds)
+    print(f"{n} segments ({args.hours:g} h)\n")
+
+    builders = {
+        "list[dict]": lambda: [
+            {"start": a, "end": b, "text": "".join(t), "speaker": "".join(s)} for a, b, t, s in src
+        ],
+        "list[Segment]": lambda: [Segment(a, b, "".join(t), "".join(s)) for a, b, t, s in src],
+        "SegmentTable": lambda: SegmentTable.from_segments(
+            {"start": a, "end": b, "text": t, "speaker": s} for a, b, t, s in src
+        ),
+    }
+    print(f"{'representation':<16}{'heap MB':>10}{'B/seg':>8}{'build s':>9}{'json s':>8}{'srt s':>8}")
+    for name, build in builders.items():
+        obj, size, build_s = _measure(build)
+        t0 = time.perf_counter()
+        if isinstance(obj, SegmentTable):
+            obj.to_json()
+            json_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            obj.to_srt()
+        else:
+            dicts = obj if isinstance(obj[0], dict) else [
+                {"start": s.start, "end": s.end, "text": s.text, "speaker": s.speaker} for s in obj
+            ]
+            json.dumps(dicts, ensure_ascii=False)
+            json_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            _srt_from_dicts(dicts)
+        srt_s = time.perf_counter() - t0
+        print(f"{name:<16}{size / 1e6:>10.1f}{size / n:>8.0f}{build_s:>9.3f}{json_s:>8.3f}{srt_s:>8.3f}")
+        del obj
+
+
+if __name__ == "__main__":
+    main()
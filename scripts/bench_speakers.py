@@ -0,0 +1,83 @@
+"""
+Speaker assignment: original nested loop vs the interval index in
+app/services/speakers.py (pure Python and NumPy paths).
+
+Synthesises a meeting of the given length with ~4 s ASR segments and
+diarization turns of 0.5-8 s from a handful of speakers, checks that all
+implementations agree, and prints the time of each.
+
+Usage: python scripts/bench_speakers.py [--minutes 60 120 240] [--speakers 6]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.speakers import speaker_labels  # noqa: E402
+
+
+def _nested_loop(spans, turns):
+    out = []
+    for s, e in spans:
+        best, best_overlap = None, 0.0
+        for ts, te, lab in turns:
+            ov = max(0.0, min(e, te) - max(s, ts))
+            if ov > best_overlap:
+                best_overlap, best = ov, lab
+        out.append(best)
+    return out
+
+
+def _meeting(minutes: float, speakers: int, rnd: random.Random):
+    total = minutes * 60.0
+    spans, t = [], 0.0
+    while t < total:
+        d = rnd.uniform(1.5, 6.5)
+        spans.append((t, t + d))
+        t += d + rnd.uniform(0.0, 0.4)
+    turns, t = [], 0.0
+    while t < total:
+        d = rnd.uniform(0.5, 8.0)
+        turns.append((t, t + d, f"SPEAKER_{rnd.randrange(speakers):02d}"))
+        t += d - rnd.uniform(0.0, 0.3)  # slight cross-talk overlap
+    return spans, turns
+
+
+def _time(fn, *args, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--minutes", type=float, nargs="+", default=[60.0, 120.0, 240.0])
+    ap.add_argument("--speakers", type=int, default=6)
+    ap.add_argument("--skip-naive-over", type=int, default=5_000_000, help="skip the O(NxM) loop above N*M")
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    print(f"{'minutes':>8}{'segments':>10}{'turns':>8}{'nested s':>10}{'index s':>10}{'numpy s':>10}")
+    for minutes in args.minutes:
+        spans, turns = _meeting(minutes, args.speakers, rnd)
+        fast, t_py = _time(lambda: speaker_labels(spans, turns, use_numpy=False))
+        vec, t_np = _time(lambda: speaker_labels(spans, turns, use_numpy=True))
+        assert fast == vec
+        if len(spans) * len(turns) <= args.skip_naive_over:
+            ref, t_ref = _time(_nested_loop, spans, turns, repeat=1)
+            assert ref == fast, "interval index disagrees with the nested loop"
+            naive = f"{t_ref:>10.3f}"
+        else:
+            naive = f"{'skipped':>10}"
+        print(f"{minutes:>8g}{len(spans):>10}{len(turns):>8}{naive}{t_py:>10.4f}{t_np:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+CPU saved by the VAD pre-pass on silence-heavy recordings.
+
+Builds a test recording from the sample audio by cutting it into pieces and
+putting silence between them (--silence: fraction of the result that is
+silent), then:
+
+* times the speech map for each VAD backend;
+* transcribes the recording with ASR_VAD_PREPASS off (Whisper's own VAD on
+  the whole file) and on (trim + pre-computed clips), and prints the
+  process CPU seconds (all threads, ``time.process_time``) and wall time of
+  each, plus a fully silent recording that the pre-pass answers without
+  decoding.
+
+Usage: python scripts/bench_vad.py [audio] [--model tiny] [--silence 0.7] [--pieces 6]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from faster_whisper import decode_audio  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.services import vad  # noqa: E402
+from app.services.audio import SAMPLE_RATE, DecodedAudio  # noqa: E402
+from app.services.transcription import FasterWhisperTranscriber  # noqa: E402
+
+
+def _silence_heavy(speech: np.ndarray, silence: float, pieces: int) -> np.ndarray:
+    parts = np.array_split(speech, pieces)
+    gap = int(speech.shape[0] * silence / (1.0 - silence) / (pieces + 1))
+    noise = np.random.default_rng(0).normal(0, 1e-4, gap).astype(np.float32)
+    out = [noise]
+    for p in parts:
+        out += [p, noise]
+    return np.concatenate(out)
+
+
+def _timed(fn):
+    c0, w0 = time.process_time(), time.perf_counter()
+    result = fn()
+    return result, time.process_time() - c0, time.perf_counter() - w0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("audio", nargs="?", default="test.mp3")
+    ap.add_argument("--model", default="tiny")
+    ap.add_argument("--language", default=None)
+    ap.add_argument("--silence", type=float, default=0.7)
+    ap.add_argument("--pieces", type=int, default=6)
+    args = ap.parse_args()
+
+    speech = decode_audio(args.audio, sampling_rate=SAMPLE_RATE)
+    audio = _silence_heavy(speech, args.silence, args.pieces)
+    duration = audio.shape[0] / SAMPLE_RATE
+    print(f"{args.audio}: {speech.shape[0] / SAMPLE_RATE:.1f} s of speech in {duration:.1f} s\n")
+
+    print(f"{'backend':<10}{'CPU s':>8}{'speech s':>10}")
+    for backend in ("energy", "webrtc", "silero"):
+        smap, cpu, _wall = _timed(lambda b=backend: vad.compute_speech_map(audio, backend=b))
+        print(f"{smap.backend:<10}{cpu:>8.3f}{smap.speech_s:>10.1f}")
+
+    settings = get_settings()
+    tr = FasterWhisperTranscriber(model_name=args.model)
+    tr.transcribe(DecodedAudio(audio[: 2 * SAMPLE_RATE]), long_audio=False)  # load + warm up
+
+    print(f"\n{'run':<22}{'CPU s':>8}{'wall s':>8}{'segments':>10}")
+    silent = DecodedAudio(np.zeros_like(audio))
+    for label, clip, prepass in (
+        ("silence-heavy, off", audio, False),
+        ("silence-heavy, on", audio, True),
+        ("all silent, off", silent.samples, False),
+        ("all silent, on", silent.samples, True),
+    ):
+        settings.asr_vad_prepass = prepass
+        (_lang, segs), cpu, wall = _timed(
+            lambda c=clip: tr.transcribe(DecodedAudio(c), language=args.language, vad=True, long_audio=False)
+        )
+        print(f"{label:<22}{cpu:>8.2f}{wall:>8.2f}{len(segs):>10}")
+
+
+if __name__ == "__main__":
+    main()
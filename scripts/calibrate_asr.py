@@ -0,0 +1,185 @@
+"""
+Calibrate CPU inference settings and write a tuned profile.
+
+Runs the bundled sample under a grid of (compute_type, cpu_threads,
+num_workers, beam_size) values. Every grid point runs in a fresh process so
+that peak RSS is per configuration. It loads the model, warms it up, then
+decodes the clip ``num_workers`` times concurrently (that is what the extra
+CTranslate2 workers are for). RTF is wall time / audio decoded.
+
+The transcript of the most accurate setting (largest beam, widest compute
+type) is the reference. The fastest setting whose transcript still agrees
+with it (word-level similarity >= --min-agreement) and fits --max-rss-mb is
+written to ASR_TUNED_PROFILE, where the model registry and decode paths pick
+it up at startup (see app/services/tuning.py).
+
+Usage: python scripts/calibrate_asr.py [audio] [--model small] [--seconds 30]
+           [--compute int8,float32] [--threads 2,4,8] [--workers 1,2] [--beams 1,5]
+           [--min-agreement 0.9] [--max-rss-mb 0] [--out PATH] [--dry-run]
+"""
+
+import argparse
+import difflib
+import itertools
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import get_settings  # noqa: E402
+from app.services.tuning import TunedProfile, save_tuned_profile  # noqa: E402
+
+SAMPLE_RATE = 16000
+# Reference preference when beams tie: widest compute type first.
+_PRECISION = {"float32": 3, "int8_float32": 2, "int16": 2, "int8": 1}
+
+
+def _trial(args: dict, out: multiprocessing.Queue) -> None:
+    import resource
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from faster_whisper import WhisperModel, decode_audio
+
+    try:
+        audio = decode_audio(args["audio"], sampling_rate=SAMPLE_RATE)[: int(args["seconds"] * SAMPLE_RATE)]
+        t0 = time.perf_counter()
+        model = WhisperModel(
+            args["model"],
+            device="cpu",
+            compute_type=args["compute_type"],
+            cpu_threads=args["cpu_threads"],
+            num_workers=args["num_workers"],
+        )
+        load_s = time.perf_counter() - t0
+
+        def decode(clip):
+            segments, _ = model.transcribe(
+                clip, beam_size=args["beam_size"], best_of=1, temperature=0.0, language=args["language"]
+            )
+            return " ".join(s.text.strip() for s in segments)
+
+        decode(audio[: 2 * SAMPLE_RATE])  # warm-up
+        workers = args["num_workers"]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(workers) as pool:
+            texts = list(pool.map(decode, [audio] * workers))
+        wall = time.perf_counter() - t0
+        out.put(
+            {
+                **args,
+                "load_s": load_s,
+                "rtf": wall / (audio.shape[0] / SAMPLE_RATE * workers),
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+                "text": texts[0],
+            }
+        )
+    except Exception as e:  # reported, not fatal to the sweep
+        out.put({**args, "error": f"{e.__class__.__name__}: {e}"})
+
+
+def _run(args: dict, timeout: float) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_trial, args=(args, q))
+    p.start()
+    p.join(timeout)
+    if p.is_alive():
+        p.kill()
+        return {**args, "error": "timeout"}
+    return q.get() if not q.empty() else {**args, "error": f"exit code {p.exitcode}"}
+
+
+def _agreement(ref: str, text: str) -> float:
+    return difflib.SequenceMatcher(None, ref.lower().split(), text.lower().split()).ratio()
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",") if x]
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    default_threads = sorted({t for t in (1, 2, 4, 8, 16, 32, cores) if t <= cores})
+    ap = argparse.ArgumentParser()
+    ap.add_argument("audio", nargs="?", default="test.mp3")
+    ap.add_argument("--model", default=os.getenv("WHISPER_MODEL_SIZE") or get_settings().whisper_model_size)
+    ap.add_argument("--language", default=None)
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--compute", default="int8,float32")
+    ap.add_argument("--threads", default=",".join(map(str, default_threads)))
+    ap.add_argument("--workers", default="1,2,4")
+    ap.add_argument("--beams", default="1,5")
+    ap.add_argument("--min-agreement", type=float, default=0.9)
+    ap.add_argument("--max-rss-mb", type=float, default=0.0, help="0 = no memory cap")
+    ap.add_argument("--allow-oversubscribe", action="store_true", help="keep threads x workers > cores")
+    ap.add_argument("--timeout", type=float, default=900.0, help="per grid point, seconds")
+    ap.add_argument("--out", default=get_settings().asr_tuned_profile)
+    ap.add_argument("--dry-run", action="store_true", help="print the grid and exit")
+    a = ap.parse_args()
+
+    grid = [
+        {
+            "audio": a.audio,
+            "model": a.model,
+            "language": a.language,
+            "seconds": a.seconds,
+            "compute_type": ct,
+            "cpu_threads": th,
+            "num_workers": nw,
+            "beam_size": bs,
+        }
+        for ct, th, nw, bs in itertools.product(
+            a.compute.split(","), _ints(a.threads), _ints(a.workers), _ints(a.beams)
+        )
+        if a.allow_oversubscribe or th * nw <= cores
+    ]
+    print(f"{len(grid)} configurations of {a.model} on {cores} cores, {a.seconds:g} s of {a.audio}")
+    if a.dry_run:
+        for g in grid:
+            print(f"  {g['compute_type']:<13} threads={g['cpu_threads']:<3} workers={g['num_workers']:<2} beam={g['beam_size']}")
+        return
+
+    header = f"{'compute':<13}{'threads':>8}{'workers':>8}{'beam':>6}{'RTF':>8}{'RSS MB':>9}{'load s':>8}"
+    print(header)
+    results = []
+    for g in grid:
+        r = _run(g, a.timeout)
+        results.append(r)
+        prefix = f"{r['compute_type']:<13}{r['cpu_threads']:>8}{r['num_workers']:>8}{r['beam_size']:>6}"
+        if "error" in r:
+            print(f"{prefix}  failed: {r['error']}")
+        else:
+            print(f"{prefix}{r['rtf']:>8.3f}{r['peak_rss_mb']:>9.0f}{r['load_s']:>8.1f}")
+
+    ok = [r for r in results if "error" not in r]
+    if not ok:
+        sys.exit("every configuration failed; no profile written")
+    ref = max(ok, key=lambda r: (r["beam_size"], _PRECISION.get(r["compute_type"], 0), -r["rtf"]))
+    eligible = [
+        r
+        for r in ok
+        if _agreement(ref["text"], r["text"]) >= a.min_agreement
+        and (not a.max_rss_mb or r["peak_rss_mb"] <= a.max_rss_mb)
+    ]
+    if not eligible:
+        sys.exit("no configuration met --min-agreement / --max-rss-mb; no profile written")
+    best = min(eligible, key=lambda r: r["rtf"])
+    profile = TunedProfile(
+        compute_type=best["compute_type"],
+        cpu_threads=best["cpu_threads"],
+        num_workers=best["num_workers"],
+        beam_size=best["beam_size"],
+        model_size=a.model,
+        rtf=round(best["rtf"], 4),
+        peak_rss_mb=round(best["peak_rss_mb"], 1),
+        cpu_count=cores,
+    )
+    save_tuned_profile(profile, a.out)
+    print(f"\nbest: {profile}\nwritten to {a.out}")
+
+
+if __name__ == "__main__":
+    main()
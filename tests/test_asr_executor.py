@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import asr_executor
+from app.services.asr_executor import AsrExecutor, run_asr
+
+
+def test_blocking_work_leaves_the_event_loop_free():
+    ex = AsrExecutor(workers=1, max_queue=4)
+
+    async def main():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        hb = asyncio.create_task(heartbeat())
+        result = await ex.run(lambda: time.sleep(0.2) or "done")
+        hb.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+    assert result == "done"
+    assert ticks >= 10
+    stats = ex.stats()
+    assert stats["queued"] == 0 and stats["running"] == 0 and stats["run_ms"] > 0
+
+
+def test_saturated_executor_returns_429_with_retry_after(monkeypatch):
+    ex = AsrExecutor(workers=1, max_queue=1)
+    monkeypatch.setattr(asr_executor, "_executor", ex)
+    gate = threading.Event()
+    ex.submit(gate.wait)
+    time.sleep(0.05)
+    ex.submit(lambda: None)  # fills the one queue slot
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run_asr(lambda: None))
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
+    assert ex.stats()["rejected"] == 1
+    gate.set()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from app.services.audio import AudioDecodeError, DecodedAudio, decode_audio
+
+
+def test_decoded_audio_duration_and_peaks():
+    samples = np.zeros(16000 * 2, dtype=np.float32)
+    samples[100] = -0.5
+    samples[16000 + 5] = 0.25
+    audio = DecodedAudio(samples)
+    assert audio.duration == 2.0
+    peaks = audio.peaks(2)
+    assert peaks.tolist() == [0.5, 0.25]
+    assert DecodedAudio(np.zeros(0, dtype=np.float32)).peaks().size == 0
+
+
+def test_decode_audio_reports_undecodable_input(tmp_path):
+    bogus = tmp_path / "not-audio.mp3"
+    bogus.write_bytes(b"definitely not audio")
+    with pytest.raises(AudioDecodeError):
+        decode_audio(bogus)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.services.batching import BatchResult, BatchScheduler
+from app.services.model_registry import ModelKey, ModelRegistry
+
+KEY = ModelKey("tiny", "cpu", "int8")
+
+
+def _scheduler(monkeypatch, **kwargs):
+    registry = ModelRegistry(loader=lambda key: object())
+    sched = BatchScheduler(KEY, registry=registry, **kwargs)
+    groups = []
+
+    def fake_group(self, model, items):
+        groups.append(len(items))
+        for p in items:
+            p.future.set_result(BatchResult([], p.language, p.audio.shape[0] / 16000))
+
+    monkeypatch.setattr(BatchScheduler, "_decode_group", fake_group)
+    return sched, groups
+
+
+def test_flushes_on_max_batch_size(monkeypatch):
+    sched, groups = _scheduler(monkeypatch, max_batch_size=2, max_wait_ms=5000)
+    futures = [sched.submit(np.zeros(16000, dtype=np.float32), language="en") for _ in range(4)]
+    results = [f.result(timeout=2) for f in futures]
+    assert groups == [2, 2]
+    assert all(r.duration == 1.0 for r in results)
+
+
+def test_flushes_on_deadline_and_groups_by_language(monkeypatch):
+    sched, groups = _scheduler(monkeypatch, max_batch_size=16, max_wait_ms=20)
+    futures = [
+        sched.submit(np.zeros(8000, dtype=np.float32), language=lang)
+        for lang in ("en", "en", "fr")
+    ]
+    for f in futures:
+        f.result(timeout=2)
+    assert sorted(groups) == [1, 2]
+    assert sched.stats()["batches"] == 1
+
+
+def test_long_audio_without_vad_or_clips_uses_window_clips(monkeypatch):
+    from app.services import batching
+
+    calls = []
+
+    class FakePipeline:
+        def __init__(self, model):
+            pass
+
+        def transcribe(self, audio, **kwargs):
+            calls.append(kwargs)
+            return iter([]), type("Info", (), {"language": "en", "duration": audio.shape[0] / 16000})()
+
+    monkeypatch.setattr(batching, "_HAS_BATCHED", True)
+    monkeypatch.setattr(batching, "BatchedInferencePipeline", FakePipeline, raising=False)
+    sched = BatchScheduler(KEY, registry=ModelRegistry(loader=lambda key: object()))
+    sched._transcribe_long(np.zeros(16000 * 70, dtype=np.float32), "en", "transcribe", {"vad_filter": False})
+    clips = calls[0]["clip_timestamps"]
+    assert [(c["start"], c["end"]) for c in clips] == [(0, 480000), (480000, 960000), (960000, 1120000)]
+    assert "vad_filter" not in calls[0]
@@ -0,0 +1,209 @@
+import asyncio
+import sys
+import threading
+
+import pytest
+import redis
+
+from app.config import get_settings
+from app.utils.redis_client import AsyncCache, Cache, _Breaker, _MemoryCache
+
+# ``app.utils.redis_client`` the attribute is the Cache singleton; patch the module.
+rc = sys.modules["app.utils.redis_client"]
+
+
+def _ttl(mem, key):
+    return mem._stripe(key).data[key][1]
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    monkeypatch.setattr(get_settings(), "REDIS_ENABLED", False)
+    mem = _MemoryCache(sweep_interval=0, stripes=4)
+    monkeypatch.setattr(rc, "_memory_cache", mem)
+    return mem
+
+
+def test_memory_batch_commands(memory):
+    cache = Cache()
+    cache.mset({"a": "1", "b": {"n": 2}})
+    assert cache.mget(["a", "b", "missing"]) == ["1", '{"n": 2}', None]
+    assert cache.mget([]) == []
+
+    cache.set("hits", "5", ex=60)
+    assert cache.incrby("hits", 3) == 8 and cache.incrby("new") == 1
+    assert memory.get("hits") == "8"
+    assert _ttl(memory, "hits") is not None  # INCRBY keeps the TTL
+
+    assert cache.hset("user:1", mapping={"plan": "pro", "jobs": 1}) == 2
+    assert cache.hset("user:1", "plan", "free") == 0
+    assert cache.hincrby("user:1", "jobs", 2) == 3
+    assert cache.hget("user:1", "plan") == "free"
+    assert cache.hgetall("user:1") == {"plan": "free", "jobs": "3"}
+    assert cache.hdel("user:1", "plan", "nope") == 1
+    assert cache.hgetall("missing") == {}
+
+
+def test_memory_type_errors(memory):
+    cache = Cache()
+    cache.set("s", "text")
+    cache.hset("h", "f", "v")
+    with pytest.raises(ValueError):
+        cache.incrby("s")
+    with pytest.raises(TypeError):
+        cache.hget("s", "f")
+    with pytest.raises(TypeError):
+        cache.get("h")
+
+
+def test_delete_if_equals(memory):
+    cache = Cache()
+    cache.set("lock", "mine")
+    assert not cache.delete_if_equals("lock", "theirs") and cache.get("lock") == "mine"
+    assert cache.delete_if_equals("lock", "mine") and cache.get("lock") is None
+    assert not cache.delete_if_equals("lock", "mine")
+
+
+def test_mset_with_ttl(memory):
+    cache = Cache()
+    cache.mset({"x": "1", "y": "2"}, ex=30)
+    assert cache.mget(["x", "y"]) == ["1", "2"]
+    assert all(_ttl(memory, k) is not None for k in "xy")
+
+
+def test_memory_pipeline(memory):
+    cache = Cache()
+    cache.set("n", "1")
+    cache.set("s", "text")
+    with pytest.raises(ValueError):
+        with cache.pipeline() as p:
+            p.incrby("n", 10).incrby("s").set("fresh", "v", ex=5)
+    # Like MULTI/EXEC: the other commands still ran, the first error is raised.
+    assert cache.mget(["n", "fresh"]) == ["11", "v"]
+
+    with cache.pipeline() as p:
+        p.incrby("n", 1).mget(["n", "fresh"]).hincrby("h", "f")
+    assert p.results == [12, ["12", "v"], 1]
+
+
+def test_memory_pipeline_is_isolated(memory):
+    cache = Cache()
+    cache.mset({"from": "1000", "to": "0"})
+    seen = []
+
+    def transfer():
+        for _ in range(500):
+            with cache.pipeline() as p:
+                p.incrby("from", -1).incrby("to", 1)
+
+    def audit():
+        for _ in range(500):
+            with cache.pipeline() as p:
+                p.mget(["from", "to"])
+            seen.append(sum(int(v) for v in p.results[0]))
+
+    threads = [threading.Thread(target=f) for f in (transfer, transfer, audit)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert set(seen) == {1000}
+    assert cache.mget(["from", "to"]) == ["0", "1000"]
+
+
+def test_pipeline_not_sent_on_error(memory):
+    cache = Cache()
+    with pytest.raises(RuntimeError):
+        with cache.pipeline() as p:
+            p.set("k", "v")
+            raise RuntimeError("abort")
+    assert cache.get("k") is None and p.results is None
+
+
+class _Pipe:
+    def __init__(self, client):
+        self.client, self.ops = client, []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.ops.append((name, a, kw))
+
+    def execute(self):
+        self.client.round_trips += 1
+        self.client.check()
+        return [getattr(self.client.mem, n)(*a, **kw) for n, a, kw in self.ops]
+
+
+class _FakeRedis:
+    """Counts round-trips; commands are answered by an in-memory store."""
+
+    def __init__(self):
+        self.mem = _MemoryCache(sweep_interval=0)
+        self.round_trips = 0
+        self.down = False
+
+    def check(self):
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+
+    def __getattr__(self, name):
+        def call(*a, **kw):
+            self.round_trips += 1
+            self.check()
+            return getattr(self.mem, name)(*a, **kw)
+
+        return call
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def publish(self, channel, data):
+        pass
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    monkeypatch.setattr(get_settings(), "REDIS_ENABLED", True)
+    monkeypatch.setattr(get_settings(), "REDIS_URL", "redis://test:6379/0")
+    monkeypatch.setattr(rc, "_breaker", _Breaker(threshold=1, cooldown_s=60))
+    monkeypatch.setattr(rc, "_memory_cache", _MemoryCache(sweep_interval=0))
+    client = _FakeRedis()
+    monkeypatch.setattr(rc, "_sync_client", lambda: client)
+    return client
+
+
+def test_pipeline_is_one_round_trip(fake_redis):
+    cache = Cache()
+    cache.ping()
+    fake_redis.round_trips = 0
+    with cache.pipeline() as p:
+        for i in range(50):
+            p.incrby(f"c:{i}", i)
+        p.mget([f"c:{i}" for i in range(3)])
+    assert fake_redis.round_trips == 1
+    assert p.results[-1] == ["0", "1", "2"]
+    assert cache.mget([f"c:{i}" for i in range(50)])[49] == "49"
+    assert fake_redis.round_trips == 2
+
+
+def test_pipeline_falls_back_to_memory(fake_redis):
+    cache = Cache()
+    cache.ping()
+    fake_redis.down = True
+    with cache.pipeline() as p:
+        p.hset("h", mapping={"a": 1}).hincrby("h", "a", 4)
+    assert p.results == [1, 5]
+    assert rc._breaker.state == "open"
+    assert cache.hgetall("h") == {"a": "5"}  # served from memory while open
+
+
+def test_async_pipeline(memory):
+    cache = AsyncCache()
+
+    async def run():
+        async with cache.pipeline() as p:
+            p.mset({"a": "1", "b": "2"}).incrby("a", 1)
+        assert p.results == [True, 2]
+        assert await cache.mget(["a", "b"]) == ["2", "2"]
+        assert await cache.hincrby("h", "f", 3) == 3
+
+    asyncio.run(run())
@@ -0,0 +1,148 @@
+import queue
+import sys
+import time
+
+import pytest
+
+from app.utils.redis_client import Cache, _L1Tier
+
+# ``app.utils.redis_client`` the attribute is the Cache singleton; patch the module.
+redis_client = sys.modules["app.utils.redis_client"]
+
+
+class _Broker:
+    def __init__(self):
+        self.subscribers = []
+
+    def publish(self, channel, data):
+        for ch, q in self.subscribers:
+            if ch == channel:
+                q.put({"type": "message", "channel": channel, "data": data})
+
+
+class _PubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.q = queue.Queue()
+
+    def subscribe(self, channel):
+        self.broker.subscribers.append((channel, self.q))
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+class _FakeRedis:
+    """Shared dict + pub/sub; one instance per simulated worker, same store."""
+
+    def __init__(self, store, broker):
+        self.store, self.broker = store, broker
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store[key] = str(value)
+
+    def setex(self, key, ex, value):
+        self.store[key] = str(value)
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def expire(self, key, ex):
+        pass
+
+    def publish(self, channel, data):
+        self.broker.publish(channel, data)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _PubSub(self.broker)
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.time() + timeout
+    while not cond() and time.time() < deadline:
+        time.sleep(0.01)
+    assert cond()
+
+
+@pytest.fixture
+def two_workers(monkeypatch):
+    store, broker = {}, _Broker()
+    workers = []
+    for _ in range(2):
+        l1 = _L1Tier({"usage:summary": 30.0}, max_entries=100, max_bytes=1 << 20, channel="inv")
+        workers.append((Cache(), l1, _FakeRedis(store, broker)))
+
+    def use(i):
+        cache, l1, client = workers[i]
+        monkeypatch.setattr(redis_client, "_l1", l1)
+        monkeypatch.setattr(redis_client, "_connect_redis", lambda: client)
+        return cache, l1, client
+
+    return use
+
+
+def test_hot_keys_are_served_from_l1(two_workers):
+    cache, l1, client = two_workers(0)
+    cache.set("usage:summary", {"users": 1}, ex=300)
+    cache.get("usage:summary")
+    _wait(lambda: l1.live)
+    assert cache.get("usage:summary") == '{"users": 1}'  # fills L1
+    before = client.gets
+    assert cache.get("usage:summary") == '{"users": 1}'
+    assert client.gets == before
+    st = cache.stats()
+    # The very first read may already fill L1 if the subscriber connected meanwhile.
+    assert st["l1"]["hits"] >= 1 and st["l2"]["hits"] >= 1
+    assert 0 < st["l1"]["hit_ratio"] <= 1
+
+    cache.set("other", "x")
+    cache.get("other")
+    cache.get("other")
+    assert client.gets == before + 2  # not an L1 prefix
+
+
+def test_writes_invalidate_other_workers(two_workers):
+    a, l1_a, _ = two_workers(0)
+    a.set("usage:summary", "v1")
+    a.get("usage:summary")
+    _wait(lambda: l1_a.live)
+    assert a.get("usage:summary") == "v1"
+
+    b, l1_b, _ = two_workers(1)
+    b.get("usage:summary")
+    _wait(lambda: l1_b.live)
+    b.set("usage:summary", "v2")
+
+    two_workers(0)
+    _wait(lambda: l1_a.invalidations == 1)
+    assert a.get("usage:summary") == "v2"
+
+
+def test_lost_subscriber_disables_l1(two_workers):
+    cache, l1, client = two_workers(0)
+    cache.set("usage:summary", "v1")
+    cache.get("usage:summary")
+    _wait(lambda: l1.live)
+    cache.get("usage:summary")
+    l1.live = False
+    before = client.gets
+    assert cache.get("usage:summary") == "v1"
+    assert client.gets == before + 1
+
+
+def test_prefix_rules():
+    l1 = _L1Tier({"summary:": 60.0, "summary:big:": 5.0, "off:": 0}, 10, 1 << 20, "c")
+    assert l1.ttl_for("summary:1") == 60.0
+    assert l1.ttl_for("summary:big:1") == 5.0
+    assert l1.ttl_for("off:1") == 0.0 and l1.ttl_for("transcript:1") == 0.0
@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.services import transcription
+from app.services.decode_profiles import allowed_profiles, get_profile, resolve_profile
+from app.services.transcription import FasterWhisperTranscriber
+
+
+def test_plan_caps_and_defaults():
+    assert allowed_profiles(None) == ["fast"]
+    assert allowed_profiles("Pro Monthly") == ["fast", "balanced", "accurate"]
+    assert resolve_profile(None, "free").name == "fast"
+    assert resolve_profile(None, "edu").name == "balanced"
+    assert resolve_profile("Accurate", "premium").name == "accurate"
+    with pytest.raises(HTTPException) as e:
+        resolve_profile("accurate", "edu")
+    assert e.value.status_code == 403
+    with pytest.raises(HTTPException) as e:
+        resolve_profile("turbo", "pro")
+    assert e.value.status_code == 400
+
+
+def test_profile_options(monkeypatch):
+    fast, accurate = get_profile("fast"), get_profile("accurate")
+    assert fast.options(vad=False) == {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "word_timestamps": False,
+    }
+    opts = accurate.options()
+    assert opts["beam_size"] == 5 and opts["word_timestamps"] is True
+    assert opts["temperature"][0] == 0.0 and len(opts["temperature"]) > 1
+    assert opts["vad_parameters"] == {"min_silence_duration_ms": 300}
+    assert fast.model_key().model_size == "base"
+    monkeypatch.setattr(get_settings(), "asr_profile_models", {"fast": "tiny"})
+    assert get_profile("fast").model_key().model_size == "tiny"
+
+
+def test_transcriber_uses_profile_model_and_options(monkeypatch):
+    calls = []
+
+    class _Model:
+        def transcribe(self, audio, **kw):
+            calls.append(kw)
+            seg = SimpleNamespace(start=0.0, end=1.0, text=" hi")
+            return iter([seg]), SimpleNamespace(language="en")
+
+    leased = []
+
+    class _Registry:
+        @contextmanager
+        def lease(self, key):
+            leased.append(key)
+            yield _Model()
+
+    monkeypatch.setattr(transcription, "get_model_registry", lambda: _Registry())
+    tr = FasterWhisperTranscriber(model_name="small")
+    lang, segs = tr.transcribe("x.wav", long_audio=False, profile=get_profile("fast"))
+    assert (lang, segs[0].text) == ("en", " hi")
+    assert leased[-1].model_size == "base"
+    assert calls[-1]["beam_size"] == 1 and calls[-1]["vad_filter"] is True
+
+    tr.transcribe("x.wav", long_audio=False)
+    assert leased[-1].model_size == "small" and calls[-1]["vad_filter"] is False
+
+
+def test_long_audio_chunks_get_profile_options(monkeypatch):
+    import numpy as np
+
+    from app.services import long_audio
+    from app.services.audio import DecodedAudio
+
+    seen = {}
+
+    def fake_parallel(samples, model_size, compute_type, **kw):
+        seen.update(kw, model_size=model_size)
+        return "en", [(0.0, 1.0, " hi")]
+
+    monkeypatch.setattr(get_settings(), "asr_vad_prepass", False)
+    monkeypatch.setattr(long_audio, "transcribe_parallel", fake_parallel)
+    tr = FasterWhisperTranscriber(model_name="small")
+    audio = DecodedAudio(np.zeros(16000, dtype=np.float32))
+    tr.transcribe(audio, long_audio=True, profile=get_profile("accurate"))
+    assert seen["beam_size"] == 5 and seen["word_timestamps"] is True
+    assert "vad_filter" not in seen
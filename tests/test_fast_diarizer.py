@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from app.config import get_settings
+from app.services import fast_diarizer, transcription
+from app.services.audio import DecodedAudio
+from app.services.fast_diarizer import (
+    FastDiarizer,
+    agglomerate,
+    cluster_windows,
+    plan_windows,
+    windows_to_turns,
+)
+from app.services.transcription import FasterWhisperTranscriber
+
+
+def _blobs(pattern, dim=24, seed=0):
+    rnd = np.random.default_rng(seed)
+    centres = rnd.normal(size=(max(pattern) + 1, dim)) * 3
+    return centres[pattern] + rnd.normal(scale=0.3, size=(len(pattern), dim))
+
+
+def test_agglomerate_with_hint_and_threshold():
+    pattern = [2, 2, 0, 0, 1, 2, 1, 0]
+    emb = _blobs(pattern)
+    # Labels are numbered by first appearance.
+    assert agglomerate(emb, num_clusters=3).tolist() == [0, 0, 1, 1, 2, 0, 2, 1]
+    assert agglomerate(emb, threshold=0.5).tolist() == [0, 0, 1, 1, 2, 0, 2, 1]
+    assert agglomerate(emb, num_clusters=1).tolist() == [0] * 8
+    assert agglomerate(np.zeros((0, 4))).size == 0
+
+
+def test_subsampled_clustering_assigns_every_window():
+    pattern = [i // 50 % 2 for i in range(1000)]
+    labels = cluster_windows(_blobs(pattern), num_speakers=2, max_points=100)
+    assert labels.tolist() == pattern
+
+
+def test_windows_and_turns():
+    ws, we, own_s, own_e = plan_windows([(0.0, 3.0), (5.0, 6.0)], win_s=1.5, hop_s=0.75)
+    assert ws.tolist() == [0.0, 0.75, 1.5, 5.0]
+    assert we.tolist() == [1.5, 2.25, 3.0, 6.0]
+    assert own_s[0] == 0.0 and own_e[2] == 3.0 and own_e[0] == own_s[1]
+    # The lone "1" inside the first span is smoothed away; the second span stays its own turn.
+    turns = windows_to_turns(own_s, own_e, np.array([0, 1, 0, 0]))
+    assert turns == [(0.0, 3.0, "SPEAKER_00"), (5.0, 6.0, "SPEAKER_00")]
+
+
+def test_diarize_backend_setting(monkeypatch):
+    settings = get_settings()
+    tr = FasterWhisperTranscriber()
+    audio = DecodedAudio(np.zeros(16000, dtype=np.float32))
+    calls = []
+
+    class _Fake:
+        def __call__(self, audio, num_speakers=None):
+            calls.append(num_speakers)
+            return [(0.0, 1.0, "SPEAKER_00")]
+
+    monkeypatch.setattr(fast_diarizer, "available", lambda: True)
+    monkeypatch.setattr(fast_diarizer, "get_fast_diarizer", lambda: _Fake())
+    monkeypatch.setattr(transcription, "_HAS_PYANNOTE", False)
+    monkeypatch.setattr(settings, "asr_diarizer_speakers", 2)
+
+    monkeypatch.setattr(settings, "asr_diarizer", "off")
+    assert tr.diarize(audio) == []
+    monkeypatch.setattr(settings, "asr_diarizer", "pyannote")
+    assert tr.diarize(audio) == []
+    monkeypatch.setattr(settings, "asr_diarizer", "auto")
+    assert tr.diarize(audio) == [(0.0, 1.0, "SPEAKER_00")]
+    monkeypatch.setattr(settings, "asr_diarizer", "fast")
+    tr.diarize(audio, num_speakers=3)
+    assert calls == [2, 3]
+
+
+def test_fast_diarizer_separates_two_voices():
+    pytest.importorskip("librosa")
+    sr = 16000
+    t = np.arange(int(sr * 4)) / sr
+    # Two "voices" with different pitch and timbre, alternating every 4 s.
+    low = 0.3 * np.sign(np.sin(2 * np.pi * 110 * t)) * np.sin(2 * np.pi * 3 * t) ** 2
+    high = 0.3 * np.sin(2 * np.pi * 660 * t) + 0.1 * np.sin(2 * np.pi * 1980 * t)
+    samples = np.concatenate([low, high, low, high]).astype(np.float32)
+    dia = FastDiarizer(speech=lambda s: [(0, s.shape[0])])
+    turns = dia(DecodedAudio(samples, sr), num_speakers=2)
+    assert [lab for _, _, lab in turns] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_00", "SPEAKER_01"]
+    assert abs(turns[1][0] - 4.0) < 1.0
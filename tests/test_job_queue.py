@@ -0,0 +1,95 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app.services.job_queue import JobQueue, QueueFullError, worker_gone, worker_id
+
+
+def test_worker_pool_bounds_concurrency_and_survives_failures():
+    q = JobQueue(workers=2, name="test-job")
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    done = []
+
+    def job(i):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        if i == 0:
+            raise RuntimeError("boom")
+        done.append(i)
+
+    for i in range(6):
+        q.submit(job, i)
+    q._queue.join()
+    q.stop(timeout=1)
+
+    assert peak <= 2
+    assert sorted(done) == [1, 2, 3, 4, 5]
+
+
+def test_full_queue_rejects_with_retry_hint():
+    q = JobQueue(workers=1, name="test-full", max_queued=2)
+    gate = threading.Event()
+    q.submit(gate.wait)
+    time.sleep(0.05)  # let the worker pick up the blocking job
+    q.submit(lambda: None)
+    q.submit(lambda: None)
+    with pytest.raises(QueueFullError) as exc:
+        q.submit(lambda: None)
+    assert exc.value.retry_after >= 1
+    gate.set()
+    q._queue.join()
+    q.stop(timeout=1)
+    assert q.stats()["queued"] == 0
+
+
+def test_concurrent_submits_never_overshoot_the_limit():
+    q = JobQueue(workers=1, name="test-race", max_queued=5)
+    gate = threading.Event()
+    q.submit(gate.wait)
+    time.sleep(0.05)
+    accepted = []
+    barrier = threading.Barrier(20)
+
+    def submit():
+        barrier.wait()
+        try:
+            q.submit(lambda: None)
+            accepted.append(1)
+        except QueueFullError:
+            pass
+
+    threads = [threading.Thread(target=submit) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(accepted) == 5
+    gate.set()
+    q._queue.join()
+    q.stop(timeout=1)
+
+
+def test_only_jobs_of_exited_workers_count_as_interrupted():
+    host = socket.gethostname()
+    sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        assert not worker_gone(f"{host}:{sibling.pid}")  # a live sibling keeps its jobs
+    finally:
+        sibling.kill()
+        sibling.wait()
+    assert worker_gone(f"{host}:{sibling.pid}")
+    assert worker_id() == f"{host}:{os.getpid()}"
+    assert worker_gone(worker_id())  # same pid as ours: left by a previous process
+    assert not worker_gone(f"some-other-host:{sibling.pid}")  # cannot tell; leave it
@@ -0,0 +1,23 @@
+from app.services.long_audio import plan_chunks, stitch
+
+SR = 16000
+
+
+def test_chunks_cut_in_silence_and_respect_limit():
+    spans = [(0, 4 * SR), (5 * SR, 9 * SR), (12 * SR, 15 * SR)]
+    chunks = plan_chunks(spans, total=16 * SR, max_chunk_s=10)
+    assert chunks == [(0, 10 * SR), (int(10.5 * SR), 15 * SR)]
+    assert all(end - start <= 10 * SR for start, end in chunks)
+
+
+def test_long_span_is_hard_split_with_overlap():
+    chunks = plan_chunks([(0, 25 * SR)], total=25 * SR, max_chunk_s=10, overlap_s=1)
+    assert chunks == [(0, 10 * SR), (9 * SR, 19 * SR), (18 * SR, 25 * SR)]
+
+
+def test_stitch_drops_repeated_border_words_and_covered_segments():
+    first = [(0.0, 4.0, " hello there general"), (4.0, 10.0, " we meet again my friend")]
+    second = [(9.0, 9.8, " friend"), (9.5, 12.0, " my friend, how are you")]
+    out = stitch([first, second])
+    assert [s[2] for s in out] == [" hello there general", " we meet again my friend", "how are you"]
+    assert out[-1][0] == 10.0
@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+
+from app.config import get_settings
+from app.utils.redis_client import Cache, _MemoryCache
+
+
+def _cache(**kw):
+    kw.setdefault("sweep_interval", 0)
+    return _MemoryCache(**kw)
+
+
+def test_lru_eviction_by_count():
+    c = _cache(max_entries=3, stripes=1)
+    for k in "abc":
+        c.set(k, k)
+    assert c.get("a") == "a"  # a is now most recent
+    c.set("d", "d")
+    assert c.get("b") is None
+    assert [c.get(k) for k in "acd"] == ["a", "c", "d"]
+    assert c.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes():
+    c = _cache(max_entries=1000, max_bytes=4000, stripes=1)
+    for i in range(20):
+        c.set(f"k{i}", "x" * 500)
+    st = c.stats()
+    assert st["bytes"] <= 4000 and st["evictions"] > 0
+    assert c.get("k19") == "x" * 500
+
+
+def test_ttl_and_counters():
+    c = _cache()
+    c.set("a", {"n": 1}, ex=60)
+    assert c.get("a") == '{"n": 1}'
+    assert c.get("missing") is None
+    c.expire("a", -1)
+    assert c.get("a") is None
+    st = c.stats()
+    assert (st["hits"], st["misses"], st["expired"], st["entries"]) == (1, 2, 1, 0)
+
+
+def test_sweeper_reclaims_unread_keys():
+    c = _cache(stripes=4, sweep_interval=0.02)
+    for i in range(50):
+        c.set(f"transcript:{i}", "payload", ex=1)
+        c.expire(f"transcript:{i}", 0)
+    c.set("keep", "v")
+    deadline = time.time() + 2
+    while c.stats()["entries"] > 1 and time.time() < deadline:
+        time.sleep(0.02)
+    c.close()
+    assert c.stats()["entries"] == 1 and c.get("keep") == "v"
+
+
+def test_overwrite_keeps_latest_ttl():
+    c = _cache()
+    c.set("a", "1", ex=1)
+    c.set("a", "2")  # no TTL any more
+    for s in c._stripes:
+        s.heap = [(0.0, k) for _, k in s.heap]  # pretend the old expiry passed
+    assert c.sweep() == 0 and c.get("a") == "2"
+
+
+def test_concurrent_writers_stay_within_limits():
+    c = _cache(max_entries=256, stripes=8)
+
+    def work(n):
+        for i in range(2000):
+            c.set(f"{n}:{i}", "v")
+            c.get(f"{n}:{i // 2}")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    st = c.stats()
+    assert st["entries"] <= 256
+    assert st["entries"] + st["evictions"] == 8 * 2000
+
+
+def test_writes_through_the_facade_start_the_sweeper(monkeypatch):
+    rc = sys.modules["app.utils.redis_client"]
+    mem = _MemoryCache(sweep_interval=0.05, stripes=2)
+    monkeypatch.setattr(get_settings(), "REDIS_ENABLED", False)
+    monkeypatch.setattr(rc, "_memory_cache", mem)
+    try:
+        cache = Cache()
+        for i in range(20):
+            cache.set(f"transcript:{i}", "x", ex=1)
+        assert mem._sweeper_pid is not None
+        # Never read again: only the sweeper can expire them.
+        deadline = time.monotonic() + 5
+        while mem.stats()["expired"] < 20 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert mem.stats()["expired"] == 20
+    finally:
+        mem.close()
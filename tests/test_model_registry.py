@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from app.services.model_registry import ModelKey, ModelRegistry
+
+SMALL = ModelKey("small", "cpu", "int8")
+BASE = ModelKey("base", "cpu", "int8")
+TINY = ModelKey("tiny", "cpu", "int8")
+
+
+def _registry(budget_mb=0, delay=0.0):
+    loads = []
+
+    def loader(key):
+        loads.append(key)
+        time.sleep(delay)
+        return object()
+
+    sizes = {SMALL: 500, BASE: 150, TINY: 80}
+    return ModelRegistry(budget_mb=budget_mb, loader=loader, estimator=sizes.__getitem__), loads
+
+
+def test_concurrent_acquire_loads_once():
+    reg, loads = _registry(delay=0.05)
+    got = []
+
+    def worker():
+        with reg.lease(SMALL) as model:
+            got.append(model)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loads == [SMALL]
+    assert len({id(m) for m in got}) == 1
+
+
+def test_refcount_and_release():
+    reg, _ = _registry()
+    reg.acquire(SMALL)
+    reg.acquire(SMALL)
+    assert reg.stats()["models"][0]["refcount"] == 2
+    reg.release(SMALL)
+    reg.release(SMALL)
+    assert reg.stats()["models"][0]["refcount"] == 0
+    with pytest.raises(RuntimeError):
+        reg.release(SMALL)
+
+
+def test_lru_eviction_of_idle_models_under_budget():
+    reg, loads = _registry(budget_mb=700)
+    with reg.lease(SMALL):
+        pass
+    with reg.lease(BASE):
+        pass
+    # touch SMALL so BASE becomes least recently used
+    with reg.lease(SMALL):
+        pass
+    with reg.lease(TINY):
+        pass
+
+    resident = {m["model_size"] for m in reg.stats()["models"]}
+    assert resident == {"small", "tiny"}
+    assert loads == [SMALL, BASE, TINY]
+
+
+def test_busy_models_are_never_evicted():
+    reg, _ = _registry(budget_mb=600)
+    model = reg.acquire(SMALL)
+    with reg.lease(BASE):
+        pass
+    assert reg.peek(SMALL) is model
+    reg.release(SMALL)
+    assert reg.evict_idle() == [SMALL, BASE]
+    assert reg.peek(SMALL) is None
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from app.config import get_settings
+from app.services import pcm_cache
+from app.services.audio import DecodedAudio
+from app.services.pcm_cache import PcmCache
+
+
+def test_roundtrip_is_memory_mapped(tmp_path):
+    cache = PcmCache(tmp_path, max_bytes=0)
+    samples = np.linspace(-1, 1, 16000, dtype=np.float32)
+    stored = cache.put("ab" * 32, samples)
+    assert isinstance(stored.samples, np.memmap)
+    hit = cache.get("ab" * 32)
+    assert isinstance(hit.samples, np.memmap) and not hit.samples.flags.writeable
+    assert np.array_equal(hit.samples, samples)
+    assert cache.get("cd" * 32) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PcmCache(tmp_path, max_bytes=0)
+    for i, key in enumerate(("a1", "b2", "c3")):
+        cache.put(key * 32, np.zeros(4000, dtype=np.float32))
+        os.utime(cache._path(key * 32), (i, i))
+    cache.max_bytes = 2 * 4000 * 4 + 512  # room for two
+    cache.get("a1" * 32)  # touch: now the most recent
+    cache.put("d4" * 32, np.zeros(4000, dtype=np.float32))
+    kept = {p.stem[:2] for p in tmp_path.glob("*/*.npy")}
+    assert kept == {"a1", "d4"}
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = PcmCache(tmp_path, max_bytes=0)
+    path = cache._path("ee" * 32)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not numpy")
+    assert cache.get("ee" * 32) is None and not path.exists()
+
+
+def test_decode_cached_runs_ffmpeg_once_per_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "asr_pcm_cache_dir", str(tmp_path))
+    monkeypatch.setattr(pcm_cache, "_cache", None)
+    calls = []
+
+    def fake_decode(path):
+        calls.append(path)
+        return DecodedAudio(np.full(800, 0.5, dtype=np.float32))
+
+    monkeypatch.setattr(pcm_cache, "decode_audio", fake_decode)
+    first = pcm_cache.decode_cached("one.mp4", "f0" * 32)
+    again = pcm_cache.decode_cached("other-name.mp4", "f0" * 32)
+    assert calls == ["one.mp4"]
+    assert np.array_equal(first.samples, again.samples)
+
+    pcm_cache.decode_cached("no-hash.mp4")
+    assert calls == ["one.mp4", "no-hash.mp4"]
+    monkeypatch.setattr(pcm_cache, "_cache", None)
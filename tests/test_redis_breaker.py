@@ -0,0 +1,152 @@
+import asyncio
+import sys
+import time
+
+import pytest
+import redis
+
+from app.config import get_settings
+from app.utils.redis_client import AsyncCache, Cache, _Breaker
+
+# ``app.utils.redis_client`` the attribute is the Cache singleton; patch the module.
+rc = sys.modules["app.utils.redis_client"]
+
+
+class _Flaky:
+    def __init__(self):
+        self.down = False
+        self.store = {}
+
+    def _check(self):
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+
+    def ping(self):
+        self._check()
+        return True
+
+    def get(self, key):
+        self._check()
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self._check()
+        self.store[key] = str(value)
+
+    def setex(self, key, ex, value):
+        self.set(key, value)
+
+    def delete(self, key):
+        self._check()
+        self.store.pop(key, None)
+
+    def publish(self, channel, data):
+        pass
+
+
+class _AsyncFlaky(_Flaky):
+    async def ping(self):
+        return _Flaky.ping(self)
+
+    async def get(self, key):
+        return _Flaky.get(self, key)
+
+    async def set(self, key, value):
+        return _Flaky.set(self, key, value)
+
+    async def setex(self, key, ex, value):
+        return _Flaky.set(self, key, value)
+
+    async def publish(self, channel, data):
+        pass
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setattr(get_settings(), "REDIS_ENABLED", True)
+    monkeypatch.setattr(get_settings(), "REDIS_URL", "redis://test:6379/0")
+    monkeypatch.setattr(rc, "_breaker", _Breaker(threshold=2, cooldown_s=0.05))
+    monkeypatch.setattr(rc, "_memory_cache", rc._MemoryCache(sweep_interval=0))
+    client = _Flaky()
+    monkeypatch.setattr(rc, "_sync_client", lambda: client)
+    return client
+
+
+def test_breaker_states():
+    b = _Breaker(threshold=2, cooldown_s=0.05)
+    assert b.allow() == "probe"  # first use
+    b.success()
+    assert b.state == "closed" and b.allow() == "call"
+    b.failure(OSError("x"))
+    assert b.state == "closed"
+    b.failure(OSError("x"))
+    assert b.state == "open" and b.allow() is None and b.trips == 1
+    time.sleep(0.06)
+    assert b.allow() == "probe" and b.allow() is None  # one probe at a time
+    b.failure(OSError("still down"))
+    assert b.state == "open" and b.trips == 1
+    time.sleep(0.06)
+    assert b.allow() == "probe"
+    b.success()
+    assert b.state == "closed" and b.stats()["consecutive_failures"] == 0
+
+
+def test_falls_back_and_reattaches(flaky):
+    cache = Cache()
+    cache.set("k", "redis")
+    assert flaky.store == {"k": "redis"}
+
+    flaky.down = True
+    cache.set("k", "mem")  # connection error: written to memory instead
+    assert cache.get("k") == "mem"
+    assert rc._breaker.state == "open"
+    assert cache.stats()["backend"] == "memory"
+
+    flaky.down = False
+    assert cache.get("k") == "mem"  # still in cooldown
+    time.sleep(0.06)
+    assert cache.get("k") == "redis"  # probe succeeded, Redis is back
+    assert rc._breaker.state == "closed" and rc._breaker.probes == 2
+
+
+def test_async_cache_uses_asyncio_client(flaky, monkeypatch):
+    aclient = _AsyncFlaky()
+    monkeypatch.setattr(rc, "_async_redis", lambda: aclient)
+    cache = AsyncCache()
+
+    async def run():
+        await cache.set("usage:summary", {"users": 2}, ex=60)
+        assert aclient.store["usage:summary"] == '{"users": 2}'
+        assert await cache.get("usage:summary") == '{"users": 2}'
+        aclient.down = True
+        await cache.set("x", "1")
+        await cache.set("y", "2")
+        assert rc._breaker.state == "open"
+        assert await cache.get("x") == "1"  # from memory, no Redis call
+
+    asyncio.run(run())
+
+
+def test_saturated_pool_is_raised_not_counted(flaky, monkeypatch):
+    cache = Cache()
+    cache.set("k", "redis")
+
+    def exhausted(*a, **kw):
+        raise redis.ConnectionError("No connection available.")
+
+    monkeypatch.setattr(flaky, "set", exhausted)
+    for _ in range(5):
+        with pytest.raises(redis.ConnectionError):
+            cache.set("k", "mem")
+    # Redis is busy, not down: no failover to this worker's private memory store.
+    assert rc._breaker.state == "closed" and rc._breaker.failures == 0
+    assert rc._memory_cache.get("k") is None
+    assert cache.get("k") == "redis"
+
+
+def test_saturated_pool_during_probe_probes_again():
+    b = _Breaker(threshold=2, cooldown_s=60)
+    assert b.allow() == "probe"
+    with pytest.raises(redis.ConnectionError):
+        b.failure(redis.ConnectionError("No connection available."))
+    assert b.state == "open" and b.allow() == "probe"
@@ -0,0 +1,69 @@
+import os
+import time
+
+from app.services import pcm_cache
+from app.services.result_cache import ResultCache, entry_from_segments, entry_text, make_key
+
+
+class _Seg:
+    def __init__(self, start, end, text):
+        self.start, self.end, self.text = start, end, text
+
+
+def test_key_covers_every_output_setting():
+    base = make_key("abc", "small", "int8", "en", "transcribe", True)
+    assert base == make_key("abc", "small", "int8", "en", "transcribe", True)
+    assert base != make_key("abd", "small", "int8", "en", "transcribe", True)
+    assert base != make_key("abc", "base", "int8", "en", "transcribe", True)
+    assert base != make_key("abc", "small", "float16", "en", "transcribe", True)
+    assert base != make_key("abc", "small", "int8", None, "transcribe", True)
+    assert base != make_key("abc", "small", "int8", "en", "translate", True)
+    assert base != make_key("abc", "small", "int8", "en", "transcribe", False)
+
+
+def test_roundtrip_and_ttl(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=0, ttl_s=60)
+    entry = entry_from_segments([_Seg(0.0, 1.0, " hello "), _Seg(1.0, 2.0, " "), _Seg(2.0, 3.0, "world")], "en")
+    cache.put("k" * 64, entry)
+    got = cache.get("k" * 64)
+    assert got == {"language": "en", "segments": [
+        {"start": 0.0, "end": 1.0, "text": "hello"},
+        {"start": 2.0, "end": 3.0, "text": "world"},
+    ]}
+    assert entry_text(got) == "hello world"
+    assert cache.get("x" * 64) is None
+
+    cache.ttl_s = 0.001
+    time.sleep(0.01)
+    assert cache.get("k" * 64) is None
+    assert not list(tmp_path.glob("*/*.json"))
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=0, ttl_s=0)
+    entry = {"language": "en", "segments": [{"start": 0.0, "end": 1.0, "text": "x" * 200}]}
+    for i, key in enumerate(["a" * 64, "b" * 64, "c" * 64]):
+        cache.put(key, entry)
+        path = cache._path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    assert cache.get("a" * 64) is not None  # touch: "b" is now the oldest
+
+    size = cache._path("a" * 64).stat().st_size
+    cache.max_bytes = 3 * size + size // 2  # room for three entries, not four
+    cache.put("d" * 64, entry)
+    assert cache.get("b" * 64) is None
+    assert all(cache.get(k * 64) is not None for k in "acd")
+
+
+def test_eviction_only_rescans_when_over_budget(tmp_path, monkeypatch):
+    scans = []
+    real = pcm_cache.evict_lru
+    monkeypatch.setattr(pcm_cache, "evict_lru", lambda *a: scans.append(a) or real(*a))
+    cache = ResultCache(tmp_path, max_bytes=10_000, ttl_s=0)
+    entry = {"language": "en", "segments": [{"start": 0.0, "end": 1.0, "text": "x" * 200}]}
+    for i in range(20):
+        cache.put(f"{i:02d}" * 32, entry)
+    # One scan to learn the size, then only when the running total passes the budget.
+    assert 1 <= len(scans) < 5
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.json")) <= 10_000
+
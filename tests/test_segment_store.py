@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Transcript, TranscriptSegment, User
+from app.services.segment_store import delete_segments, load_segments, save_segments, store_segments
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    event.listen(engine, "connect", lambda conn, _rec: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, future=True)()
+
+
+def test_segments_bulk_insert_and_time_range_reads():
+    db = _session()
+    db.add(User(id=1, email="a@b.c", password="x"))
+    db.flush()
+    t = Transcript(user_id=1, title="t", storage_filename="t.wav", content="")
+    db.add(t)
+    db.flush()
+
+    segments = [
+        SimpleNamespace(start=0.0, end=1.25, text=" Hello there ", avg_logprob=-0.21),
+        {"start": 1.25, "end": 1.3, "text": "  "},
+        {"start": 1.3, "end": 2.0004, "text": "General", "speaker": "SPEAKER_01"},
+        {"start": 2.5, "end": 4.0, "text": "Kenobi."},
+    ]
+    assert save_segments(db, t.id, segments) == 3
+    db.commit()
+
+    rows = load_segments(db, t.id)
+    assert [r["text"] for r in rows] == ["Hello there", "General", "Kenobi."]
+    assert rows[0] == {"start": 0.0, "end": 1.25, "text": "Hello there", "speaker": None, "avg_logprob": -0.21}
+    assert rows[1]["end"] == 2.0 and rows[1]["speaker"] == "SPEAKER_01"
+    assert [r["text"] for r in load_segments(db, t.id, from_ms=1500, to_ms=2600)] == ["General", "Kenobi."]
+
+    # Saving again replaces rather than appends.
+    save_segments(db, t.id, segments[:1])
+    db.commit()
+    assert len(load_segments(db, t.id)) == 1
+
+    db.delete(t)
+    db.commit()
+    assert db.query(TranscriptSegment).count() == 0
+
+
+def test_missing_segment_table_keeps_the_transcript():
+    # A database created before transcript_segments existed.
+    db = _session()
+    TranscriptSegment.__table__.drop(db.get_bind())
+    db.add(User(id=1, email="a@b.c", password="x"))
+    db.flush()
+    t = Transcript(user_id=1, title="t", storage_filename="t.wav", content="hello")
+    db.add(t)
+    db.commit()
+
+    assert store_segments(db, t.id, [{"start": 0.0, "end": 1.0, "text": "hello"}]) is False
+    assert db.get(Transcript, t.id).content == "hello"
+
+    delete_segments(db, t.id)
+    db.delete(db.get(Transcript, t.id))
+    db.commit()
+    assert db.query(Transcript).count() == 0
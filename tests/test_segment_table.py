@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.segment_table import SegmentTable, SegmentTableBuilder
+from app.services.transcription import Segment
+
+
+def _table():
+    return SegmentTable.from_segments(
+        [
+            Segment(start=0.0, end=1.25, text=" Hello there "),
+            {"start": 1.25, "end": 1.3, "text": "  "},
+            {"start": 1.3, "end": 2.0004, "text": "Général", "speaker": "SPEAKER_01"},
+            SimpleNamespace(start=3661.5, end=3662.0, text="Kenobi.", speaker="SPEAKER_00"),
+            {"start": 3700.0, "end": 3701.0, "text": "\"quoted\"", "speaker": "SPEAKER_01"},
+        ]
+    )
+
+
+def test_columns_interned_speakers_and_views():
+    t = _table()
+    assert len(t) == 4
+    assert t.starts.dtype == np.float64 and t.speakers.dtype == np.int16
+    assert t.speaker_names == ("SPEAKER_01", "SPEAKER_00")
+    assert t.speakers.tolist() == [-1, 0, 1, 0]
+    assert [s.text for s in t] == ["Hello there", "Général", "Kenobi.", '"quoted"']
+    assert t[-1].speaker == "SPEAKER_01" and t[0].speaker is None
+    assert t[1].to_dict() == {"start": 1.3, "end": 2.0004, "text": "Général", "speaker": "SPEAKER_01"}
+    assert t.full_text() == 'Hello there Général Kenobi. "quoted"'
+
+
+def test_slices_share_buffers():
+    t = _table()
+    tail = t[1:3]
+    assert len(tail) == 2
+    assert np.shares_memory(tail.starts, t.starts)
+    assert [s.text for s in tail] == ["Général", "Kenobi."]
+    assert tail.texts() == ["Général", "Kenobi."]
+    assert len(t[3:1]) == 0 and t[3:1].full_text() == ""
+    assert [s.text for s in t.between(1.5, 3661.6)] == ["Général", "Kenobi."]
+
+
+def test_json_and_srt_match_reference_serializers():
+    t = _table()
+    assert json.loads(t.to_json()) == t.to_dicts()
+    assert json.loads(t[:1].to_json()) == [{"start": 0.0, "end": 1.25, "text": "Hello there"}]
+    assert SegmentTable.empty().to_json() == "[]"
+    srt = t.to_srt().split("\n\n")
+    assert srt[0] == "1\n00:00:00,000 --> 00:00:01,250\nHello there"
+    assert srt[2] == "3\n01:01:01,500 --> 01:01:02,000\nKenobi."
+    assert len(srt) == 4
+    odd = SegmentTable.from_segments([{"start": float("nan"), "end": float("inf"), "text": "x"}])
+    assert json.loads(odd.to_json()) == [{"start": None, "end": None, "text": "x"}]
+
+
+def test_builder_keeps_flat_buffers_and_hands_them_over():
+    b = SegmentTableBuilder()
+    for i in range(3):
+        b.append(float(i), i + 0.5, f" seg {i} ", "A" if i else None)
+    # No list of per-segment floats or bytes objects while decoding.
+    assert b._starts.typecode == "d" and isinstance(b._text, bytearray)
+    t = b.build()
+    assert t.texts() == ["seg 0", "seg 1", "seg 2"] and t.speakers.tolist() == [-1, 0, 0]
+    assert len(b.build()) == 0  # the builder starts afresh
+
+
+def test_transcribe_table_packs_segments_while_decoding(monkeypatch):
+    from contextlib import contextmanager
+
+    from app.config import get_settings
+    from app.services import segment_table, transcription
+
+    appended = []
+    real_append = segment_table.SegmentTableBuilder.append
+
+    def append(self, start, end, text, speaker=None):
+        appended.append(text)
+        real_append(self, start, end, text, speaker)
+
+    def segments():
+        for i in range(3):
+            assert len(appended) == max(0, i - 1)  # earlier rows are packed already (blank one skipped)
+            yield SimpleNamespace(start=float(i), end=i + 1.0, text=" " if i == 0 else f"s{i}")
+
+    class _Registry:
+        @contextmanager
+        def lease(self, key):
+            yield SimpleNamespace(transcribe=lambda audio, **kw: (segments(), SimpleNamespace(language="en")))
+
+    monkeypatch.setattr(get_settings(), "asr_vad_prepass", False)
+    monkeypatch.setattr(segment_table.SegmentTableBuilder, "append", append)
+    monkeypatch.setattr(transcription, "get_model_registry", lambda: _Registry())
+    lang, table = transcription.FasterWhisperTranscriber().transcribe_table("x.wav", long_audio=False)
+    assert lang == "en" and appended == ["s1", "s2"] and len(table) == 2
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from app.services import speakers
+from app.services.speakers import _TurnIndex, speaker_labels
+from app.services.transcription import FasterWhisperTranscriber, Segment
+
+
+def _reference(spans, turns):
+    # The original O(N x M) loop from FasterWhisperTranscriber.assign_speakers.
+    out = []
+    for s, e in spans:
+        best = None
+        best_overlap = 0.0
+        for ts, te, lab in turns:
+            ov = max(0.0, min(e, te) - max(s, ts))
+            if ov > best_overlap:
+                best_overlap = ov
+                best = lab
+        out.append(best)
+    return out
+
+
+def _case(rnd, n, m, grid):
+    # Coarse grids give many exact ties, touching edges and zero-length spans.
+    def span():
+        a = rnd.randrange(0, 60) / grid
+        return a, a + rnd.randrange(0, 12) / grid
+
+    spans = [span() for _ in range(n)]
+    turns = []
+    for i in range(m):
+        a, b = span()
+        if rnd.random() < 0.05:
+            b = a + rnd.randrange(20, 60) / grid  # long, nesting turn
+        if rnd.random() < 0.05:
+            a, b = b, a  # inverted turn never overlaps
+        turns.append((a, b, f"S{rnd.randrange(0, 4)}_{i}"))
+    return spans, turns
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_matches_reference_on_random_inputs(use_numpy):
+    rnd = random.Random(1234)
+    for trial in range(400):
+        spans, turns = _case(rnd, rnd.randrange(0, 30), rnd.randrange(0, 30), grid=rnd.choice([1, 2, 4, 7.3]))
+        assert speaker_labels(spans, turns, use_numpy=use_numpy) == _reference(spans, turns), trial
+
+
+def test_one_long_turn_does_not_widen_every_range():
+    rnd = random.Random(7)
+    turns = [(0.0, 3600.0, "background")]
+    turns += [(i * 0.6, i * 0.6 + rnd.uniform(0.3, 1.2), f"S{i % 5}") for i in range(6000)]
+    spans = [(i * 0.6, i * 0.6 + 0.5) for i in range(6000)]
+    idx = _TurnIndex(turns)
+    candidates = max(sum(hi - lo for lo, hi in idx.ranges(s, e)) for s, e in spans)
+    assert candidates <= 8
+    expected = _reference(spans, turns)
+    assert speaker_labels(spans, turns, use_numpy=False) == expected
+    assert speaker_labels(spans, turns, use_numpy=True) == expected
+
+
+def test_numpy_path_expands_in_chunks(monkeypatch):
+    monkeypatch.setattr(speakers, "MAX_PAIRS", 7)
+    rnd = random.Random(99)
+    spans, turns = _case(rnd, 300, 200, grid=4)
+    assert speaker_labels(spans, turns, use_numpy=True) == _reference(spans, turns)
+
+
+def test_tie_goes_to_first_listed_turn_and_no_overlap_is_none():
+    turns = [(5.0, 7.0, "late"), (0.0, 2.0, "B"), (0.0, 2.0, "A"), (1.0, 3.0, "C")]
+    spans = [(1.0, 2.0), (2.0, 2.0), (10.0, 11.0), (1.5, 3.0)]
+    expected = ["B", None, None, "C"]
+    assert speaker_labels(spans, turns, use_numpy=False) == expected
+    assert speaker_labels(spans, turns, use_numpy=True) == expected
+
+
+def test_assign_speakers_keeps_segments():
+    tr = FasterWhisperTranscriber()
+    segs = [Segment(0.0, 1.0, "a"), Segment(1.0, 2.5, "b")]
+    assert tr.assign_speakers(segs, []) is segs
+    out = tr.assign_speakers(segs, [(0.0, 1.2, "X"), (1.2, 3.0, "Y")])
+    assert [(s.text, s.speaker) for s in out] == [("a", "X"), ("b", "Y")]
@@ -0,0 +1,86 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.batching import BatchResult
+from app.services.stream_mux import StreamMultiplexer
+
+
+def _echo_batch(calls):
+    def decode(audios, languages):
+        calls.append(len(audios))
+        out = []
+        for audio in audios:
+            word = SimpleNamespace(start=0.0, end=0.5, word=f" n{len(audio)}")
+            out.append(BatchResult([SimpleNamespace(words=[word])], "en", len(audio) / 16000))
+        return out
+
+    return decode
+
+
+def test_windows_from_many_streams_share_one_tick():
+    calls = []
+    mux = StreamMultiplexer(tick_ms=50, max_batch=8, decode_batch=_echo_batch(calls))
+    sessions = [mux.admit() for _ in range(6)]
+    results = [None] * 6
+    barrier = threading.Barrier(6)
+
+    def run(i):
+        barrier.wait()
+        results[i] = sessions[i].decode(np.zeros(100 + i, dtype=np.float32), None, "")
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    # Each session gets its own hypothesis back...
+    assert [r[1][0].text for r in results] == [f" n{100 + i}" for i in range(6)]
+    # ...but the model was called far fewer times than there were windows.
+    assert sum(calls) == 6 and len(calls) < 6
+    assert mux.stats()["active_streams"] == 6
+    for s in sessions:
+        s.close()
+    assert mux.stats()["active_streams"] == 0
+
+
+def test_admission_control_refuses_streams_past_slo_or_cap():
+    mux = StreamMultiplexer(tick_ms=100, max_batch=4, latency_slo_ms=1000, max_streams=3,
+                            decode_batch=_echo_batch([]))
+    held = [mux.admit() for _ in range(3)]
+    assert all(held)
+    assert mux.admit() is None  # hard cap
+    held[0].close()
+
+    # 0.4 s per batch at 1 window/s per stream and a 0.1 s tick: 40 streams
+    # fill one batch of 4 per tick, 100 streams need three batches (> 1 s).
+    mux.max_streams = 1000
+    mux.batch_ewma = 0.4
+    mux._last_sample = time.monotonic()
+    assert mux.projected_latency(40) < 1.0 < mux.projected_latency(100)
+    mux._active = 99
+    assert mux.admit() is None
+    mux._active = 2
+    mux.latency_ewma = 1.2  # measured latency already over the SLO
+    assert mux.admit() is None
+    assert mux.stats()["rejected"] == 3
+
+
+def test_stale_gauges_do_not_block_admission():
+    mux = StreamMultiplexer(tick_ms=100, latency_slo_ms=1000, decode_batch=_echo_batch([]))
+    # One slow first decode (a lazy model load) pushed both gauges past the SLO.
+    mux.latency_ewma, mux.batch_ewma = 1.6, 8.0
+    mux._last_sample = time.monotonic()
+
+    # No stream is active and nothing is queued: the gauges are reset.
+    session = mux.admit()
+    assert session is not None
+    assert mux.stats()["latency_ms"] == 0.0
+
+    # With a stream active but no decode for a while, old samples are ignored too.
+    mux.latency_ewma, mux.batch_ewma = 1.6, 8.0
+    mux._last_sample = time.monotonic() - 60.0
+    assert mux.admit() is not None
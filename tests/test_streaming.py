@@ -0,0 +1,99 @@
+import numpy as np
+
+from app.services.streaming import PcmRing, StreamingRecognizer, Word
+
+SR = 16000
+SCRIPT = [
+    (0.0, 0.5, " Hello"),
+    (0.5, 1.0, " world"),
+    (1.0, 1.5, " this"),
+    (1.5, 2.0, " is"),
+    (2.0, 2.5, " a"),
+    (2.5, 3.0, " test."),
+]
+
+
+def test_ring_is_bounded_and_keeps_the_newest_samples():
+    ring = PcmRing(5)
+    assert ring.append(np.arange(3, dtype=np.float32)) == 0
+    assert ring.append(np.arange(3, 6, dtype=np.float32)) == 1
+    assert ring.view().tolist() == [1, 2, 3, 4, 5]
+    ring.drop(2)
+    assert ring.append(np.array([6, 7], dtype=np.float32)) == 0
+    assert ring.view().tolist() == [3, 4, 5, 6, 7]
+    assert ring.append(np.arange(10, 20, dtype=np.float32)) == 10
+    assert ring.view().tolist() == [15, 16, 17, 18, 19]
+
+
+def _scripted_recognizer(speech_until: float):
+    calls = []
+
+    def decode(audio, language, prompt):
+        start = rec._offset
+        end = start + len(audio) / SR
+        heard = [w for w in SCRIPT if w[0] >= start - 1e-6 and w[1] <= end - 0.2]
+        words = [Word(s - start, e - start, t) for s, e, t in heard]
+        if len(heard) < len([w for w in SCRIPT if w[0] >= start - 1e-6]):
+            # The word being spoken right now comes out differently every time.
+            tip = words[-1].end if words else 0.0
+            words.append(Word(tip, tip + 0.3, f" zz{len(calls)}"))
+        calls.append(prompt)
+        return "en", words
+
+    def vad(audio):
+        # VAD sees only the newest samples of the ring
+        end = rec._offset + len(rec._ring) / SR
+        start = end - len(audio) / SR
+        if end <= speech_until:
+            return [(0, len(audio))]
+        stop = int((3.0 - start) * SR)
+        return [(0, stop)] if stop > 0 else []
+
+    rec = StreamingRecognizer(decode=decode, vad=vad, window_s=10.0)
+    return rec, calls
+
+
+def test_partials_need_agreement_and_pause_finalises():
+    rec, _calls = _scripted_recognizer(speech_until=4.0)
+    second = (np.zeros(SR, dtype=np.int16)).tobytes()
+    events = [rec.feed_sync(second) for _ in range(5)]
+
+    assert events[0] == []  # one decode alone is never shown
+    partials = [seg for step in events for seg in step if not seg["final"]]
+    assert [p["text"] for p in partials] == ["Hello", "Hello world this", "Hello world this is a"]
+    assert all("zz" not in p["text"] for p in partials)
+
+    finals = [seg for step in events for seg in step if seg["final"]]
+    assert len(finals) == 1
+    assert finals[0]["text"] == "Hello world this is a test."
+    assert (finals[0]["start"], finals[0]["end"]) == (0.0, 3.0)
+    assert finals[0]["id"] == partials[0]["id"]
+    assert rec.flush_sync() == []
+
+
+def test_silence_is_not_decoded_and_buffer_stays_small():
+    rec = StreamingRecognizer(
+        decode=lambda *_: (_ for _ in ()).throw(AssertionError("decoded silence")),
+        vad=lambda audio: [],
+        window_s=5.0,
+    )
+    for _ in range(30):
+        assert rec.feed_sync(np.zeros(SR // 2, dtype=np.int16).tobytes()) == []
+    assert rec.decodes == 0
+    assert len(rec._ring) <= SR
+    assert abs(rec._offset + len(rec._ring) / SR - 15.0) < 1e-6
+
+
+def test_vad_only_sees_new_audio():
+    seen = []
+
+    def vad(audio):
+        seen.append(len(audio))
+        return [(0, len(audio))]
+
+    rec = StreamingRecognizer(decode=lambda *_: ("en", []), vad=vad, window_s=20.0)
+    for _ in range(15):
+        rec.feed_sync(np.zeros(SR, dtype=np.int16).tobytes())
+    assert len(rec._ring) > 10 * SR  # speech without words keeps growing the ring...
+    assert max(seen) <= 1.5 * SR  # ...but each step runs VAD over one step plus the context
+    assert rec._speech == [(0, 15 * SR)]
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app.config import get_settings
+from app.routes import usage
+from app.routes.usage import GenerateSummaryIn, _normalise_transcript, _summary_key, _summary_options
+from app.utils.redis_client import _MemoryCache
+
+rc = sys.modules["app.utils.redis_client"]
+
+
+@pytest.fixture
+def openai_calls(monkeypatch):
+    monkeypatch.setattr(get_settings(), "REDIS_ENABLED", False)
+    monkeypatch.setattr(get_settings(), "SUMMARY_LOCK_POLL_S", 0.01)
+    monkeypatch.setattr(rc, "_memory_cache", _MemoryCache(sweep_interval=0))
+    calls = []
+    lock = threading.Lock()
+
+    def fake(transcript, tone, length):
+        with lock:
+            calls.append((transcript, tone, length))
+        time.sleep(0.1)
+        return f"summary of {transcript}"
+
+    monkeypatch.setattr(usage, "_generate_summary_with_openai", fake)
+    return calls
+
+
+def _key(transcript, tone="default", length="short"):
+    tone, length = _summary_options(tone, length)
+    return _summary_key(_normalise_transcript(transcript), tone, length)
+
+
+def test_key_is_normalised():
+    assert _key("Hello   world\n") == _key(" Hello world") == _key("Hello world", "DEFAULT ", "Short")
+    assert _key("Hello world", "made-up") == _key("Hello world")  # unknown tone: default prompt
+    assert _key("Hello world", "formal") != _key("Hello world")
+    assert _key("Hello world") != _key("Hello world!")
+    assert _key("Hello world").startswith("summary:") and len(_key("x")) == len("summary:") + 32
+
+
+def test_key_is_stable_across_processes():
+    code = "from app.routes.usage import _summary_key; print(_summary_key('same text', 'default', 'short'))"
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        for seed in ("1", "2")
+    }
+    assert keys == {_summary_key("same text", "default", "short")}
+
+
+def test_concurrent_requests_share_one_call(openai_calls):
+    async def run():
+        payload = GenerateSummaryIn(transcript="the meeting notes", tone="friendly")
+        first = await asyncio.gather(*(usage.generate_summary(payload, get_settings()) for _ in range(10)))
+        again = await usage.generate_summary(payload, get_settings())
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(openai_calls) == 1
+    assert {r.summary for r in first} == {"summary of the meeting notes"}
+    assert again.cached and not usage._inflight
+
+
+def test_lock_coordinates_workers(openai_calls):
+    """Two workers (no shared in-process task) still make one upstream call."""
+    settings = get_settings()
+    key = _key("shared")
+
+    async def run():
+        return await asyncio.gather(*(usage._summarise_once(key, "shared", "default", "short", settings) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert len(openai_calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True, True]
+    assert asyncio.run(rc.async_cache.get(f"lock:{key}")) is None  # released
+
+
+def test_failure_is_not_cached(openai_calls, monkeypatch):
+    def boom(*args):
+        openai_calls.append(args)
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(usage, "_generate_summary_with_openai", boom)
+    payload = GenerateSummaryIn(transcript="x")
+
+    async def run():
+        return await asyncio.gather(*(usage.generate_summary(payload, get_settings()) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert len(openai_calls) == 1 and all(getattr(e, "status_code", None) == 500 for e in errors)
+    asyncio.run(run())
+    assert len(openai_calls) == 2  # lock released, nothing cached
+
+
+def test_transcript_is_sent_unchanged(openai_calls):
+    text = "A: hello\nB:  hi there\n"
+    asyncio.run(usage.generate_summary(GenerateSummaryIn(transcript=text), get_settings()))
+    assert openai_calls == [(text, "default", "short")]
+
+
+def test_lock_release_leaves_a_newer_holder_alone(openai_calls, monkeypatch):
+    settings = get_settings()
+    key = _key("slow")
+
+    def slow(transcript, tone, length):
+        # Our lock expired meanwhile and another worker took it.
+        asyncio.run(rc.async_cache.set(f"lock:{key}", "someone-else", ex=60))
+        return "s"
+
+    monkeypatch.setattr(usage, "_generate_summary_with_openai", slow)
+    asyncio.run(usage._summarise_once(key, "slow", "default", "short", settings))
+    assert asyncio.run(rc.async_cache.get(f"lock:{key}")) == "someone-else"
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import transcription
+from app.services.audio import DecodedAudio
+from app.services.segment_table import SegmentTable
+from app.services.transcription import FasterWhisperTranscriber, Segment
+
+
+def test_diarization_and_asr_overlap_on_one_decode(monkeypatch):
+    decoded = []
+
+    def fake_decode(path):
+        decoded.append(path)
+        return DecodedAudio(np.zeros(16000, dtype=np.float32))
+
+    monkeypatch.setattr(transcription, "decode_audio", fake_decode)
+    # Both sides must be running at once to get past the barrier.
+    both = threading.Barrier(2, timeout=5)
+    tr = FasterWhisperTranscriber()
+    seen = []
+
+    def fake_transcribe(audio, language=None, vad=False, profile=None):
+        seen.append(audio)
+        both.wait()
+        return "en", [Segment(0.0, 1.0, "hi"), Segment(1.0, 2.0, "there")]
+
+    def fake_diarize(audio, num_speakers=None):
+        seen.append(audio)
+        both.wait()
+        return [(0.0, 1.1, "A"), (1.1, 2.0, "B")]
+
+    monkeypatch.setattr(tr, "transcribe", fake_transcribe)
+    monkeypatch.setattr(tr, "diarize", fake_diarize)
+
+    lang, segments = tr.transcribe_with_speakers("meeting.wav")
+    assert lang == "en"
+    assert [(s.text, s.speaker) for s in segments] == [("hi", "A"), ("there", "B")]
+    assert decoded == ["meeting.wav"]
+    assert seen[0] is seen[1]
+
+
+def test_asr_failure_propagates(monkeypatch):
+    tr = FasterWhisperTranscriber()
+
+    def boom(audio, language=None, vad=False, profile=None):
+        raise RuntimeError("asr failed")
+
+    monkeypatch.setattr(tr, "transcribe", boom)
+    monkeypatch.setattr(tr, "diarize", lambda audio, num_speakers=None: [])
+    with pytest.raises(RuntimeError):
+        tr.transcribe_with_speakers(DecodedAudio(np.zeros(10, dtype=np.float32)))
+
+
+def test_srt_speaker_prefixes():
+    table = SegmentTable.from_segments([Segment(0.0, 1.0, "hi", "A"), Segment(1.0, 2.0, "there")])
+    assert table.to_srt(speakers=True).split("\n\n") == [
+        "1\n00:00:00,000 --> 00:00:01,000\n[A] hi",
+        "2\n00:00:01,000 --> 00:00:02,000\nthere\n",
+    ]
@@ -0,0 +1,58 @@
+import faster_whisper
+import pytest
+
+from app.config import get_settings
+from app.services import model_registry, tuning
+from app.services.model_registry import ModelKey
+from app.services.transcription import FasterWhisperTranscriber
+from app.services.tuning import TunedProfile, save_tuned_profile
+
+
+@pytest.fixture
+def profile_path(tmp_path, monkeypatch):
+    path = tmp_path / "tuned.json"
+    monkeypatch.setattr(get_settings(), "asr_tuned_profile", str(path))
+    monkeypatch.setattr(tuning, "_profile_loaded", False)
+    monkeypatch.setattr(tuning, "_profile", None)
+    monkeypatch.delenv("WHISPER_DEVICE", raising=False)
+    monkeypatch.delenv("WHISPER_COMPUTE", raising=False)
+    return path
+
+
+def test_defaults_without_profile(profile_path):
+    assert tuning.get_tuned_profile() is None
+    assert tuning.model_kwargs("cpu") == {}
+    assert tuning.default_beam_size() == 5
+    assert model_registry.pick_device_and_compute()[1] in ("int8", "float16")
+
+
+def test_profile_is_applied_to_model_loads_and_decoding(profile_path, monkeypatch):
+    save_tuned_profile(
+        TunedProfile(compute_type="int8_float32", cpu_threads=6, num_workers=2, beam_size=1, cpu_count=1),
+        profile_path,
+    )
+    loaded = []
+    monkeypatch.setattr(faster_whisper, "WhisperModel", lambda *a, **kw: loaded.append((a, kw)) or object())
+
+    assert tuning.default_beam_size() == 1
+    assert tuning.model_kwargs("cuda") == {}
+    device, compute = model_registry.pick_device_and_compute()
+    if device == "cpu":
+        assert compute == "int8_float32"
+    # The transcriber builds the same key, so it shares the app's resident model.
+    assert FasterWhisperTranscriber("tiny")._model_key() == ModelKey("tiny", "cpu", "int8_float32")
+    assert FasterWhisperTranscriber("tiny", "int8").compute_type == "int8"
+    model_registry._load_whisper(ModelKey("tiny", "cpu", "int8_float32"))
+    assert loaded == [
+        (("tiny",), {"device": "cpu", "compute_type": "int8_float32", "cpu_threads": 6, "num_workers": 2})
+    ]
+    # An explicit WHISPER_COMPUTE still wins over the profile.
+    monkeypatch.setenv("WHISPER_DEVICE", "cpu")
+    monkeypatch.setenv("WHISPER_COMPUTE", "float32")
+    assert model_registry.pick_device_and_compute() == ("cpu", "float32")
+
+
+def test_unreadable_profile_is_ignored(profile_path):
+    profile_path.write_text("{not json", encoding="utf-8")
+    assert tuning.get_tuned_profile() is None
+    assert tuning.default_beam_size() == 5
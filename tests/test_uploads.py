@@ -0,0 +1,46 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.config import get_settings
+from app.utils.uploads import normalize_plan, spool_upload, upload_limit_bytes
+
+
+def _upload(data: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="clip.WAV", size=size)
+
+
+def test_spool_streams_to_disk_with_size_and_hash():
+    data = b"x" * (3 * 1024 * 1024 + 17)
+    with asyncio.run(spool_upload(_upload(data))) as up:
+        assert up.path.suffix == ".wav"
+        assert up.size == len(data)
+        assert up.sha256 == hashlib.sha256(data).hexdigest()
+        assert up.path.read_bytes() == data
+    assert not up.path.exists()
+
+
+def test_limit_is_enforced_before_and_while_streaming(tmp_path, monkeypatch):
+    monkeypatch.setitem(get_settings().upload_limits_mb, "free", 1)
+    limit = upload_limit_bytes("free")
+    dest = tmp_path / "big.bin"
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(spool_upload(_upload(b"", size=limit + 1), dest=dest))
+    assert exc.value.status_code == 413
+
+    # Size unknown up front: the copy stops once the limit is crossed.
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(spool_upload(_upload(b"\0" * (limit + 1)), dest=dest))
+    assert exc.value.status_code == 413
+    assert not dest.exists()
+
+
+def test_plan_names_map_to_limit_keys():
+    assert normalize_plan("Premium Monthly") == "premium"
+    assert normalize_plan("pro") == "pro"
+    assert normalize_plan(None) == "free"
+    assert normalize_plan("enterprise") == "free"
+    assert upload_limit_bytes("premium") > upload_limit_bytes("free")
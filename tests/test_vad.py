@@ -0,0 +1,129 @@
+import os
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import get_settings
+from app.services import transcription, vad
+from app.services.audio import DecodedAudio
+from app.services.transcription import FasterWhisperTranscriber
+
+SR = 16000
+
+
+def _tones(seconds=60, at=(10, 40), length=3):
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 0.001, SR * seconds).astype(np.float32)
+    t = np.arange(SR * length) / SR
+    for s in at:
+        x[SR * s : SR * (s + length)] += 0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32)
+    return x
+
+
+@pytest.fixture(autouse=True)
+def _energy(monkeypatch):
+    monkeypatch.setattr(get_settings(), "asr_vad_backend", "energy")
+    monkeypatch.setattr(get_settings(), "asr_vad_prepass", True)
+
+
+def test_energy_map_finds_speech():
+    smap = vad.compute_speech_map(_tones())
+    assert smap.backend == "energy"
+    spans = smap.spans()
+    assert len(spans) == 2
+    for (s, e), t in zip(spans, (10, 40)):
+        assert abs(s / SR - t) < 0.3 and abs(e / SR - (t + 3)) < 0.3
+    assert 6.0 <= smap.speech_s <= 7.5
+    start, end = smap.trim_bounds(pad_s=0.2)
+    assert start == spans[0][0] - int(0.2 * SR) and end == spans[1][1] + int(0.2 * SR)
+    assert all(e - s <= 30 * SR for s, e in smap.chunks(30))
+
+
+def test_flags_from_spans_matches_loop():
+    rng = np.random.default_rng(1)
+    total, frame = 50_000, 480
+    spans = sorted((int(a), int(a) + int(b)) for a, b in zip(rng.integers(0, 45_000, 20), rng.integers(1, 5000, 20)))
+    expected = np.zeros(-(-total // frame), dtype=bool)
+    for s, e in spans:
+        expected[s // frame : -(-min(e, total) // frame)] = True
+    assert np.array_equal(vad._flags_from_spans(spans, total, frame), expected)
+
+
+def test_smoothing_closes_short_gaps():
+    flags = np.zeros(100, dtype=bool)
+    flags[20:30] = flags[33:40] = True
+    out = vad._smooth(flags, pad_frames=0, gap_frames=10)
+    assert out[20:40].all() and not out[:20].any() and not out[40:].any()
+
+
+def test_cached_map_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "asr_vad_cache_dir", str(tmp_path / "vad"))
+    path = tmp_path / "a.wav"
+    path.write_bytes(b"x" * 10)
+    samples = _tones()
+    first = vad.speech_map_for(path, samples)
+    assert vad.map_path(path).exists()
+    assert not list(tmp_path.glob("*.npz"))  # nothing next to the upload
+
+    real_compute = vad.compute_speech_map
+    monkeypatch.setattr(vad, "compute_speech_map", lambda *a, **k: pytest.fail("recomputed"))
+    again = vad.speech_map_for(path)
+    assert np.array_equal(again.flags, first.flags) and again.total == first.total
+
+    monkeypatch.setattr(vad, "compute_speech_map", real_compute)
+    monkeypatch.setattr(get_settings(), "asr_vad_backend", "energy")
+    path.write_bytes(b"y" * 20)
+    os.utime(path, ns=(1, 1))
+    silent = vad.speech_map_for(path, np.zeros(SR, dtype=np.float32))
+    assert silent.total == SR and silent.is_silent()
+
+
+def test_map_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "asr_vad_cache_dir", str(tmp_path))
+    monkeypatch.setattr(get_settings(), "asr_vad_backend", "energy")
+    monkeypatch.setattr(get_settings(), "asr_vad_cache_max_mb", 1e-6)  # ~1 byte: keep only the newest
+    samples = _tones()
+    for i, key in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+        vad.speech_map_for("unused.wav", samples, sha256=key)
+        os.utime(vad.map_path(None, key), (i, i))
+    assert [p.name[:1] for p in tmp_path.glob("*/*.npz")] == ["c"]
+    vad.discard_speech_map(None, "c" * 64)
+    assert not list(tmp_path.glob("*/*.npz"))
+
+
+def test_prepass_trims_and_clips():
+    prep = vad.run_prepass(None, _tones())
+    assert not prep.silent
+    assert abs(prep.offset - 10) < 0.5
+    assert prep.samples.shape[0] < 35 * SR
+    assert all(0 <= s < e <= prep.samples.shape[0] for s, e in prep.clips)
+    assert len(prep.clip_seconds()) == 2 * len(prep.clips)
+
+
+def test_silent_audio_skips_the_model(monkeypatch):
+    monkeypatch.setattr(transcription, "get_model_registry", lambda: pytest.fail("model loaded"))
+    lang, segs = FasterWhisperTranscriber().transcribe(DecodedAudio(np.zeros(SR * 20, dtype=np.float32)))
+    assert (lang, segs) == ("unknown", [])
+
+
+def test_transcriber_decodes_trimmed_speech(monkeypatch):
+    calls = []
+
+    class _Model:
+        def transcribe(self, audio, **kw):
+            calls.append((audio, kw))
+            return iter([SimpleNamespace(start=0.5, end=2.0, text=" hi")]), SimpleNamespace(language="en")
+
+    class _Registry:
+        @contextmanager
+        def lease(self, key):
+            yield _Model()
+
+    monkeypatch.setattr(transcription, "get_model_registry", lambda: _Registry())
+    _lang, segs = FasterWhisperTranscriber().transcribe(DecodedAudio(_tones()), long_audio=False, vad=True)
+    audio, kw = calls[-1]
+    assert audio.shape[0] < 35 * SR
+    assert "vad_filter" not in kw and kw["clip_timestamps"]
+    assert 10.0 < segs[0].start < 10.5
@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+
+from app.services.model_registry import ModelKey, ModelRegistry
+from app.services.warmup import Warmup, warmup_clip
+
+SMALL = ModelKey("small", "cpu", "int8")
+TINY = ModelKey("tiny", "cpu", "int8")
+
+
+def test_background_warmup_loads_each_model_and_reports_timings():
+    gate = threading.Event()
+    reg = ModelRegistry(loader=lambda key: f"model-{key.model_size}")
+    warmed = []
+
+    def infer(model, samples):
+        gate.wait(5)
+        warmed.append((model, samples.shape[0]))
+
+    w = Warmup([SMALL, TINY, SMALL], np.zeros(800, dtype=np.float32), registry=reg, infer=infer)
+    w.start()
+    assert not w.ready and w.stats()["state"] in ("pending", "loading")
+    gate.set()
+    assert w.wait(5)
+    assert w.ready
+    assert warmed == [("model-small", 800), ("model-tiny", 800)]
+    assert reg.peek(SMALL) == "model-small"
+    stats = w.stats()
+    assert [m["model_size"] for m in stats["models"]] == ["small", "tiny"]
+    assert {"load_s", "warmup_s"} <= set(stats["models"][0]) and stats["total_s"] >= 0
+
+
+def test_failed_load_is_not_ready():
+    def loader(key):
+        raise RuntimeError("no weights")
+
+    w = Warmup([SMALL], np.zeros(10, dtype=np.float32), registry=ModelRegistry(loader=loader))
+    w.run()
+    assert w.state == "failed" and not w.ready
+    assert "no weights" in w.stats()["error"]
+
+
+def test_failed_warmup_retries_with_backoff():
+    attempts = []
+
+    def loader(key):
+        attempts.append(key)
+        if len(attempts) < 3:
+            raise RuntimeError("no network")
+        return "model"
+
+    w = Warmup([SMALL], np.zeros(10, dtype=np.float32), registry=ModelRegistry(loader=loader),
+               infer=lambda m, s: None, retry_s=0.01, retry_max_s=0.02)
+    w.run()
+    assert w.degraded and not w.ready  # readyz serves, transcription loads lazily
+    w.run_until_ready()
+    assert w.ready and not w.degraded and w.attempts == len(attempts) == 3
+    assert w.stats()["error"] is None and w.stats()["next_retry_s"] is None
+
+
+def test_missing_sample_falls_back_to_silence():
+    clip = warmup_clip("does-not-exist.mp3", 0.5)
+    assert clip.shape == (8000,) and not clip.any()